@@ -0,0 +1,163 @@
+#
+# Topology transformation API
+#
+# Transform topologies (Python dictionaries or topology files) in memory, without
+# writing topology files and running 'netlab create' for every topology variant.
+#
+# * Every transformation starts from a clean slate: module-level caches, global
+#   variables, ID sets, loaded modules and the error log are reset
+# * The parsed system defaults are kept in the YAML read cache and reused
+# * The results (transformed topology, topology snapshot, output files, errors
+#   and printouts) are returned in a dictionary
+# * Output modules are executed in a temporary directory; the files they create
+#   are read into the results
+#
+# transform_batch fans out many transformations across a pool of worker processes
+#
+import typing
+import os
+import io
+import contextlib
+import tempfile
+import concurrent.futures
+
+from box import Box
+
+from .. import data
+from ..utils import log,strings,read as _read
+
+"""
+load_topology: create topology data structure from a dictionary (or read it from a topology
+file) and merge it with the defaults.
+
+'path' is the directory used to find relative defaults and included files when the topology
+is specified as a dictionary
+"""
+def load_topology(
+      topology: typing.Union[dict,str],
+      path: str = '.',
+      user_defaults: typing.Optional[list] = None) -> Box:
+
+  if isinstance(topology,str):
+    return _read.load(topology,user_defaults)
+
+  fname = os.path.join(os.path.abspath(path),'topology.yml')  # Pseudo topology file name
+  topo = data.get_box(topology)                               # Copy the dictionary, the caller might reuse it
+  _read.include_yaml(topo,fname)
+  return _read.add_defaults(topo,fname,user_defaults)
+
+"""
+read_output_files: read the files created by output modules into a dictionary (relative file name: content)
+"""
+def read_output_files(work_dir: str) -> dict:
+  files = {}
+  for dir_path,_,file_list in os.walk(work_dir):
+    for fname in sorted(file_list):
+      full_name = os.path.join(dir_path,fname)
+      with open(full_name,'r',errors='replace') as output_file:
+        files[os.path.relpath(full_name,work_dir)] = output_file.read()
+
+  return files
+
+"""
+run_outputs: execute output modules in the current directory
+"""
+def run_outputs(topology: Box, outputs: list) -> None:
+  from ..outputs import _TopologyOutput
+
+  for output_format in outputs:
+    output_module = _TopologyOutput.load(output_format,topology.defaults.outputs[output_format.split(':')[0]])
+    if output_module:
+      output_module.write(topology)
+    else:
+      log.error('Unknown output format %s' % output_format,log.IncorrectValue,'api')
+
+"""
+transform_topology: transform a single topology in the current process
+
+Returns a dictionary with:
+
+* topology: transformed topology (None if the transformation failed)
+* snapshot: transformed topology snapshot in YAML format (netlab.snapshot.yml). Creating
+  the YAML text usually takes longer than the transformation; use snapshot=False to skip it
+* outputs: files created by the output modules (filename: content)
+* errors, warnings: error and warning messages
+* printout: text printed to stdout/stderr during the transformation
+"""
+def transform_topology(
+      topology: typing.Union[dict,str],
+      outputs: typing.Optional[list] = None,
+      path: str = '.',
+      user_defaults: typing.Optional[list] = None,
+      snapshot: bool = True) -> dict:
+
+  from ..augment import main as augment_main
+  from ..augment.topology import cleanup_topology
+
+  augment_main.reset_state()
+  log.init_log_system(header=False)
+  result: dict = { 'topology': None, 'snapshot': None, 'outputs': {} }
+
+  start_dir = os.getcwd()
+  printout = io.StringIO()
+  with tempfile.TemporaryDirectory(prefix='netlab-api-') as work_dir, \
+       contextlib.redirect_stdout(printout), contextlib.redirect_stderr(printout):
+    try:
+      topo = load_topology(topology,path,user_defaults)
+      log.exit_on_error()
+      augment_main.transform(topo)
+      log.exit_on_error()
+      result['topology'] = topo
+      if snapshot:
+        result['snapshot'] = strings.get_yaml_string(cleanup_topology(topo))
+
+      if outputs:
+        os.chdir(work_dir)
+        run_outputs(topo,outputs)
+        log.exit_on_error()
+        result['outputs'] = read_output_files(work_dir)
+    except (SystemExit,log.ErrorAbort):                       # Fatal errors are reported in the error log
+      pass
+    finally:
+      os.chdir(start_dir)
+
+  result['errors'] = list(log.get_error_log())
+  result['warnings'] = list(log.get_warning_log())
+  result['printout'] = printout.getvalue()
+  return result
+
+"""
+Worker process functions: load system defaults when the worker starts, and return the
+transformed topology as a dictionary (pickling plain dictionaries is much faster than
+pickling Box objects)
+"""
+def warm_up() -> None:
+  _read.system_defaults()
+
+def transform_worker(args: tuple) -> dict:
+  result = transform_topology(*args)
+  if result['topology'] is not None:
+    result['topology'] = result['topology'].to_dict()
+  return result
+
+"""
+transform_batch: transform many topologies using a pool of worker processes
+
+Returns the list of results (see transform_topology) in the order of input topologies,
+with transformed topologies converted into dictionaries. Set 'workers' to 1 to run the
+transformations in the current process.
+"""
+def transform_batch(
+      topologies: typing.Iterable[typing.Union[dict,str]],
+      outputs: typing.Optional[list] = None,
+      path: str = '.',
+      user_defaults: typing.Optional[list] = None,
+      snapshot: bool = True,
+      workers: typing.Optional[int] = None) -> typing.List[dict]:
+
+  jobs = [ (topology,outputs,path,user_defaults,snapshot) for topology in topologies ]
+  if workers == 1:                                            # No parallelism, run in the current process
+    return [ transform_worker(job) for job in jobs ]
+
+  with concurrent.futures.ProcessPoolExecutor(max_workers=workers,initializer=warm_up) as pool:
+    return list(pool.map(transform_worker,jobs))
@@ -1,13 +1,20 @@
-# Import the whole augmentation tree
-
-from . import nodes
-from . import groups
-from . import links
-from . import devices
-from . import plugin
-from . import topology
-from . import main
-from . import config
-from . import components
-from . import tools
-from . import validate
+#
+# The augmentation modules are imported on first use (PEP 562 module __getattr__).
+# Importing the whole augmentation tree takes a significant fraction of netlab
+# startup time, and most netlab CLI commands never need it.
+#
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:                                    # Make the submodules visible to type checkers
+  from . import addressing,nodes,groups,links,devices,plugin,topology,main,config,components,tools,validate
+
+SUBMODULES: typing.Final[list] = [
+  'addressing', 'nodes', 'groups', 'links', 'devices', 'plugin', 'topology', 'main',
+  'config', 'components', 'tools', 'validate' ]
+
+def __getattr__(name: str) -> typing.Any:
+  if name in SUBMODULES:
+    return importlib.import_module(f'.{name}',__name__)
+
+  raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -51,6 +51,7 @@ parameters when the corresponding addressing parameteres are missing:
 import sys
 import typing
 import types
+import functools
 
 import netaddr
 from box import Box
@@ -414,3 +415,11 @@ def get_addr_mask(pfx: netaddr.IPNetwork, host: int) -> str:
   host_ip = netaddr.IPNetwork(pfx[host])
   host_ip.prefixlen = pfx.prefixlen
   return str(host_ip)
+
+"""
+get_addr_ip: Get the IP address (without the prefix length) from an interface address in
+CIDR format. The results are cached, as the same addresses get parsed over and over again
+"""
+@functools.lru_cache(maxsize=16384)
+def get_addr_ip(addr: str) -> str:
+  return str(netaddr.IPNetwork(addr).ip)
@@ -11,10 +11,16 @@ import re
 from box import Box
 
 from ..utils import log
-from .. import data
 from . import nodes,links
 from ..data.types import must_be_dict,must_be_list,must_be_string,must_be_id
 
+"""
+Component templates: components are validated once, and then converted into plain data structures
+that are instantiated (with renamed nodes and links) whenever a component is included. Converting
+a plain data structure into a Box creates a new copy of it, so every instance gets its own data.
+"""
+COMPONENT_TEMPLATES: typing.Dict[str,dict] = {}
+
 '''
 Validate topology components:
 
@@ -43,6 +49,26 @@ def validate_components(topology: Box) -> None:
     if 'links' in cdata:
       cdata.links = links.adjust_link_list(cdata.links,cdata.nodes,linkname_format=f'components.{cname}.links[{{link_cnt}}]')
 
+"""
+get_component_template -- compile a validated component into a template
+
+* Regular nodes and links are stored as plain dictionaries
+* Group data (everything apart from nodes and links) is stored as Box
+"""
+def get_component_template(c_name: str, topology: Box) -> dict:
+  if c_name in COMPONENT_TEMPLATES:
+    return COMPONENT_TEMPLATES[c_name]
+
+  c_data = topology.components[c_name]
+  c_tpl = {
+    'nodes': { n_name: n_data if 'include' in n_data else n_data.to_dict()
+                 for n_name,n_data in c_data.get('nodes',{}).items() },
+    'links': [ l_data.to_dict() for l_data in c_data.get('links',[]) ],
+    'group': { k:v for k,v in c_data.items() if not k in ['nodes','links'] }
+  }
+  COMPONENT_TEMPLATES[c_name] = c_tpl
+  return c_tpl
+
 '''
 validate_include -- validate an include request
 
@@ -86,8 +112,8 @@ Iterate over all nodes in the component:
 
 Also: check that the total number of nodes does not exceed the maximum allowed
 '''
-def include_nodes(n_name: str, c_data: Box, topology: Box) -> None:
-  for inc_name,inc_data in c_data.nodes.items():
+def include_nodes(n_name: str, c_data: dict, topology: Box) -> None:
+  for inc_name,inc_data in c_data['nodes'].items():
     node_name = f'{n_name}_{inc_name}'
     must_be_id(
       parent=None,
@@ -106,24 +132,24 @@ def include_nodes(n_name: str, c_data: Box, topology: Box) -> None:
         continue                                            # ... no, move on
       expand_include(node_name,inc_data,topology)           # ... yes, do the include magic
     else:
-      topology.nodes[node_name] = data.get_box(inc_data)    # Regular included node, just copy it
+      topology.nodes[node_name] = inc_data                  # Regular included node, Box conversion creates a copy
+      topology.nodes[node_name].name = node_name            # ... and fix the node name (component node name is relative)
       if len(topology.nodes) > nodes.MAX_NODE_ID:
         log.fatal(
           'Exceeded maximum node limit while adding node {node_name}',
           module='components',
           header=True)
 
-def include_links(n_name: str, c_data: Box, topology: Box) -> None:
-  for l_data in c_data.links:
-    inc_link = data.get_box(l_data)                         # Create a copy of the link data structure
-    inc_link._linkname = f'{n_name}_{inc_link._linkname}'   # ... fill in linkname
-    inc_link.linkindex = links.get_next_linkindex(topology) # ... and link index
-    inc_link.interfaces = list(inc_link.interfaces)         # Create a copy of the interface list
-    for intf in inc_link.interfaces:                        # ... and adjust node names in interface list
-      intf.node = f'{n_name}_{intf.node}'
-    topology.links.append(inc_link)                         # Ready to add the new link to the global link list
-
-def create_included_group(n_name: str, n_data: Box, c_data: Box, topology: Box) -> None:
+def include_links(n_name: str, c_data: dict, topology: Box) -> None:
+  for l_data in c_data['links']:
+    inc_link = dict(l_data)                                 # Create a shallow copy of the link template
+    inc_link['_linkname'] = f'{n_name}_{l_data["_linkname"]}'   # ... fill in linkname
+    inc_link['linkindex'] = links.get_next_linkindex(topology)  # ... and link index
+    inc_link['interfaces'] = [                              # Adjust node names in interface list
+      dict(intf,node=f'{n_name}_{intf["node"]}') for intf in l_data['interfaces'] ]
+    topology.links.append(inc_link)                         # Box conversion creates a deep copy of the new link
+
+def create_included_group(n_name: str, n_data: Box, c_data: dict, topology: Box) -> None:
   g_name = f'inc_{n_name}'
   if g_name in topology.groups:
     log.error(
@@ -133,15 +159,13 @@ def create_included_group(n_name: str, n_data: Box, c_data: Box, topology: Box)
 
   g_data = topology.groups[g_name]
   g_data.members = []
-  for m_name,m_data in c_data.nodes.items():
+  for m_name,m_data in c_data['nodes'].items():
     if 'include' in m_data:
       g_data.members += [ f'inc_{n_name}_{m_name}' ]
     else:
       g_data.members += [ f'{n_name}_{m_name}' ]
 
-  for k,v in c_data.items():
-    if k in ['nodes','links']:
-      continue
+  for k,v in c_data['group'].items():
     topology.groups[g_name][k] = v
 
   for k,v in n_data.items():
@@ -149,13 +173,10 @@ def create_included_group(n_name: str, n_data: Box, c_data: Box, topology: Box)
       topology.groups[g_name][k] = v
 
 def expand_include(n_name: str, n_data: Box, topology: Box) -> None:
-  c_name = n_data.include
-  c_data = topology.components[c_name]
+  c_data = get_component_template(n_data.include,topology)
 
-  if 'nodes' in c_data:
-    include_nodes(n_name,c_data,topology)
-  if 'links' in c_data:
-    include_links(n_name,c_data,topology)
+  include_nodes(n_name,c_data,topology)
+  include_links(n_name,c_data,topology)
   create_included_group(n_name,n_data,c_data,topology)
 
 '''
@@ -169,6 +190,7 @@ def expand_components(topology: Box) -> None:
   if not 'components' in topology:
     return
 
+  COMPONENT_TEMPLATES.clear()
   validate_components(topology)
   log.exit_on_error()
 
@@ -182,6 +204,7 @@ def expand_components(topology: Box) -> None:
       continue                                              # ... no, move on, will abort before exit
     expand_include(n_name,n_data,topology)                  # ... yes, do the include magic
 
+  COMPONENT_TEMPLATES.clear()
   log.exit_on_error()
   topology.pop('components',None)
 
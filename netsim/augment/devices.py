@@ -9,6 +9,48 @@ from box import Box
 from .. import data
 from ..utils import log,strings
 
+"""
+Device data cache: merging generic and provider-specific device data creates a new Box every time
+get_device_attribute or get_consolidated_device_data is called (and they are called for every node,
+link and interface), so we memoize the merged results.
+
+The cache is keyed by (device, provider, attribute). Every entry stores references to the source
+objects it was built from and is used only when the current device data still contains the very same
+objects. In-place changes of device data (done by plugins) are handled by resetting the cache after
+every plugin hook.
+
+The merged results are shared between all callers and must be treated as read-only.
+"""
+DEVICE_CACHE: typing.Dict[tuple,tuple] = {}
+DEVICE_CACHE_STATS: typing.Dict[str,int] = { 'hit': 0, 'miss': 0 }
+
+def reset_device_cache(stats: bool = False) -> None:
+  DEVICE_CACHE.clear()
+  if stats:
+    for k in DEVICE_CACHE_STATS.keys():
+      DEVICE_CACHE_STATS[k] = 0
+
+"""
+get_cached_value: return the cached value if all the source objects are unchanged, None otherwise
+"""
+def get_cached_value(key: tuple, sources: tuple) -> typing.Optional[Box]:
+  entry = DEVICE_CACHE.get(key,None)
+  if entry is not None and len(entry[0]) == len(sources) and all(x is y for x,y in zip(entry[0],sources)):
+    DEVICE_CACHE_STATS['hit'] += 1
+    return entry[1]
+
+  DEVICE_CACHE_STATS['miss'] += 1
+  return None
+
+"""
+Print device cache statistics (--debug cache)
+"""
+def print_device_cache_stats() -> None:
+  hit  = DEVICE_CACHE_STATS['hit']
+  miss = DEVICE_CACHE_STATS['miss']
+  rate = 100 * hit / (hit + miss) if hit + miss else 0
+  print(f'device data cache: {hit} hits, {miss} misses, hit rate {rate:.1f}%, {len(DEVICE_CACHE)} entries')
+
 """
 Get generic device attribute:
 
@@ -39,7 +81,12 @@ def get_device_attribute(node: Box, attr: str, defaults: Box) -> typing.Optional
 
   value = devdata.get(attr,None)         # Non-specific device data
   if isinstance(value,Box) and isinstance(pvalue,Box):
-    return value+pvalue                  # Return merged dictionaries
+    c_key = (devtype,provider,attr)      # Merging dictionaries is expensive, try to use the cached result
+    merged = get_cached_value(c_key,(devdata,value,pvalue))
+    if merged is None:
+      merged = value+pvalue              # Cache miss, merge the dictionaries
+      DEVICE_CACHE[c_key] = ((devdata,value,pvalue),merged)
+    return merged                        # Return merged dictionaries
 
   if attr in devdata[provider]:          # Do we have a provider-specific value?
     return pvalue                        # Provider-specific dictionary overriding non-dictionary device value
@@ -83,7 +130,7 @@ def get_provider_data(node: Box, defaults: Box) -> Box:
   return defaults.devices[devtype].get(provider,{})
 
 """
-Get consolidated device data
+Get consolidated device data (cached, must not be modified by the caller)
 """
 def get_consolidated_device_data(node: Box, defaults: Box) -> Box:
   devtype  = node.device
@@ -92,10 +139,18 @@ def get_consolidated_device_data(node: Box, defaults: Box) -> Box:
   if not devtype in defaults.devices:
     log.fatal(f'Internal error: call to get_provider_data with unknown device {devtype}')
 
-  data = defaults.devices[devtype] + defaults.devices[devtype].get(provider,{})
+  devdata = defaults.devices[devtype]
+  pdata = devdata.get(provider,{})
+  c_key = (devtype,provider,None)
+  data = get_cached_value(c_key,(devdata,pdata,defaults.providers))
+  if data is not None:
+    return data
+
+  data = devdata + pdata
   for p in defaults.providers.keys():
     data.pop(p,None)
 
+  DEVICE_CACHE[c_key] = ((devdata,pdata,defaults.providers),data)
   return data
 
 """
@@ -208,6 +263,7 @@ def augment_device_settings(topology: Box) -> None:
     if not isinstance(devices[dname],Box):                  # ... validate device definition data type
       log.fatal(f'Internal error: definition of device {dname} is not a dictionary')
 
+  reset_device_cache(stats=True)
   merge_daemons(topology)
   process_device_inheritance(topology)
   build_module_support_lists(topology)
@@ -6,6 +6,7 @@ top-level element. That dictionary is merged from global- and node-level paramet
 
 import typing
 import re
+import heapq
 
 from box import Box
 
@@ -18,11 +19,67 @@ from ..data.validate import validate_attributes,get_object_attributes
 from ..data.types import must_be_dict,must_be_list,must_be_id,transform_asdot
 from . import nodes
 
+'''
+Group index: recursive group members and reverse topological order of groups
+
+The index is built on first use and kept until the groups or nodes change. The changes are
+detected by comparing the group and node dictionaries, the member lists of individual groups
+(and their lengths), and the number of nodes with the values saved in the index.
+
+* members: recursive (flattened) member lists, computed on demand and memoized
+* order: reverse topological sort of groups (child groups before their parents)
+'''
+GROUP_INDEX: dict = {}
+
+def reset_group_index() -> None:
+  GROUP_INDEX.clear()
+
+def get_member_signature(g_data: typing.Any) -> tuple:
+  g_members = g_data.get('members',None) if isinstance(g_data,dict) else None
+  return (g_members,len(g_members) if isinstance(g_members,list) else 0)
+
+def is_group_index_valid(topology: Box) -> bool:
+  if GROUP_INDEX.get('groups',None) is not topology.get('groups',None):
+    return False
+  if GROUP_INDEX['nodes'] is not topology.get('nodes',None) or GROUP_INDEX['node_count'] != len(topology.get('nodes',{})):
+    return False
+
+  signature = GROUP_INDEX['signature']
+  if len(signature) != len(topology.groups):
+    return False
+
+  for g_name,g_data in topology.groups.items():
+    if g_name not in signature:
+      return False
+    g_sig = get_member_signature(g_data)
+    if signature[g_name][0] is not g_sig[0] or signature[g_name][1] != g_sig[1]:
+      return False
+
+  return True
+
+def get_group_index(topology: Box) -> dict:
+  if not is_group_index_valid(topology):
+    GROUP_INDEX.clear()
+    GROUP_INDEX.update({
+      'groups': topology.groups,
+      'nodes': topology.get('nodes',None),
+      'node_count': len(topology.get('nodes',{})),
+      'signature': { g_name: get_member_signature(g_data) for g_name,g_data in topology.groups.items() },
+      'members': {} })
+
+  return GROUP_INDEX
+
 '''
 Return members of the specified group. Recurse through child groups if needed
 '''
 def group_members(topology: Box, group: str, count: int = 0) -> list:
-  members: typing.List[str] = []
+  g_index = get_group_index(topology)['members']
+  return list(get_group_members(topology,group,g_index,count))     # Return a copy in case the caller wants to modify it
+
+def get_group_members(topology: Box, group: str, g_index: dict, count: int) -> list:
+  if group in g_index:              # Have we already computed the group members?
+    return g_index[group]
+
   if not group in topology.groups:  # pragma: no cover (just-in case catch, impossible to get here)
     log.error(
       f'Internal error: unknown group {group}',
@@ -36,12 +93,14 @@ def group_members(topology: Box, group: str, count: int = 0) -> list:
       module='groups',
       header=True)
 
+  members: typing.List[str] = []
   for m in topology.groups[group].members:
     if m in topology.nodes:
-      members = members + [ m ]
+      members.append(m)
     if m in topology.groups:
-      members = members + group_members(topology,m,count + 1)
+      members.extend(get_group_members(topology,m,g_index,count + 1))
 
+  g_index[group] = members
   return members
 
 '''
@@ -274,12 +333,19 @@ def add_node_level_groups(topology: Box) -> None:
 Check recursive group definitions
 '''
 
-def check_recursive_chain(topology: Box, chain: list, group: str) -> typing.Optional[list]:
+def check_recursive_chain(
+      topology: Box,
+      chain: list,
+      group: str,
+      verified: typing.Optional[set] = None) -> typing.Optional[list]:
   if not group in topology.groups: # pragma: no cover (if we ever get here we're seriously messed up)
     log.fatal(
       'Internal error: unknown group in check_recursive_chain')
     return None
 
+  if verified is not None and group in verified:    # We already know there's no loop starting with this group
+    return None
+
   chain = chain + [ group ]
   for m in topology.groups[group].members:
     if m in chain:
@@ -287,35 +353,61 @@ def check_recursive_chain(topology: Box, chain: list, group: str) -> typing.Opti
       log.error(f'Recursive group definition chain {chain}', log.IncorrectValue, 'groups')
       return chain
     if m in topology.groups:
-      if check_recursive_chain(topology,chain,m):
+      if check_recursive_chain(topology,chain,m,verified):
         return chain
 
+  if verified is not None:
+    verified.add(group)
   return None
 
 def check_recursive_groups(topology : Box) -> None:
+  verified: set = set()
   for gname in topology.groups.keys():
     if gname.startswith('_'):                  # Skip settings starting with underscore
       continue
-    if check_recursive_chain(topology,[],gname):
+    if check_recursive_chain(topology,[],gname,verified):
       return
 
 def reverse_topsort(topology: Box) -> list:
-  group_copy = get_box(topology.groups)        # Make a copy of the group dictionary
-  sort_list: typing.List[str] = []
+  g_index = get_group_index(topology)
+  if 'order' not in g_index:
+    g_index['order'] = build_reverse_topsort(topology)
+
+  return list(g_index['order'])
+
+'''
+build_reverse_topsort: sort the groups so the child groups come before their parents
 
-  for g in list(group_copy.keys()):            # Clean up the group data structure
-    if g.startswith('_'):                      # Removing everything starting with underscore
-      group_copy.pop(g,None)                   # ... those are settings, not groups
+Kahn's algorithm that produces the same order as a fixpoint iteration over sorted group
+names: a group becoming ready while we're walking the sorted list of groups is processed
+within the same pass if its name comes later in the sorted list, and in the next pass
+otherwise.
+'''
+def build_reverse_topsort(topology: Box) -> list:
+  g_names = [ g for g in topology.groups.keys() if not g.startswith('_') ]
+  g_set = set(g_names)
+  pending = { g: 0 for g in g_names }                   # Number of child groups not yet in the sorted list
+  parents: typing.Dict[str,list] = { g: [] for g in g_names }
+
+  for g in g_names:
+    for m in topology.groups[g].get('members',[]):
+      if m in g_set:
+        pending[g] += 1
+        parents[m].append(g)
 
-  while group_copy:                            # Keep iterating until we got all groups in order
-    for g in sorted(group_copy.keys()):        # Iterate over remaining groups
-      OK_to_add = True                         # ... sort them by name to have consistent results
-      for m in group_copy[g].members:          # Now go check the group members
-        if m in group_copy:                    # ... if a member of this group is still in groups we're not yet ready
-          OK_to_add = False                    # ... to add it to sorted list
-      if OK_to_add:                            # Have all child groups already been removed from the group dictionary?
-        sort_list = sort_list + [ g ]          # ... if so, we're good to go, add current group to sorted list
-        group_copy.pop(g)                      # ... and remove it from dictionary of remaining groups
+  sort_list: typing.List[str] = []
+  this_pass = [ g for g in g_names if not pending[g] ]
+  heapq.heapify(this_pass)
+  while this_pass:
+    next_pass: typing.List[str] = []
+    while this_pass:
+      g = heapq.heappop(this_pass)
+      sort_list.append(g)
+      for p in parents[g]:                              # Remove the current group from the parent groups
+        pending[p] -= 1
+        if not pending[p]:                              # Parent group is ready, add it to the current pass if
+          heapq.heappush(this_pass if p > g else next_pass,p)  # ... it comes after current group, otherwise to the next pass
+    this_pass = next_pass
 
   return sort_list
 
@@ -567,16 +659,21 @@ def node_config_templates(topology: Box) -> None:
   with node templates.
   '''
 
+  node_chunks: typing.Dict[str,list] = {}          # Group config templates collected for individual nodes
   for group_name in reverse_topsort(topology):
     if not 'config' in topology.groups[group_name]:
       continue
 
     must_be_list(topology.groups[group_name],'config',f'groups.{group_name}')
-    g_members = group_members(topology,group_name)
-    for name,ndata in topology.nodes.items():
-      if name in g_members or group_name == 'all':
-        if not must_be_list(ndata,'config',f'nodes.{name}') is None:
-          ndata.config = topology.groups[group_name].config + ndata.config
+    g_config = topology.groups[group_name].config
+    g_members = topology.nodes.keys() if group_name == 'all' else dict.fromkeys(group_members(topology,group_name))
+    for name in g_members:                        # Iterate over group members (each node only once)
+      if not must_be_list(topology.nodes[name],'config',f'nodes.{name}') is None:
+        node_chunks.setdefault(name,[]).append(g_config)
+
+  for name,chunks in node_chunks.items():         # Now push the collected templates in front of node templates
+    ndata = topology.nodes[name]                  # ... building the final list in one go
+    ndata.config = [ c for g_config in reversed(chunks) for c in g_config ] + list(ndata.config)
 
   '''
   Phase 2 - cleanup
@@ -602,7 +699,7 @@ def node_config_templates(topology: Box) -> None:
       elif c[0] == '-':
         config_list = [ t for t in config_list if t != c [1:] ]
       else:
-        config_list = config_list + [ c ]
+        config_list.append(c)
 
     if config_list:
       node.config = config_list
@@ -615,6 +712,7 @@ so the templates don't have to guess whether they're dealing with groups
 or settings
 """
 def cleanup(topology: Box) -> None:
+  reset_group_index()                             # Drop the references to topology data
   if not 'groups' in topology:                    # No groups, no worries
     return
 
@@ -302,17 +302,71 @@ def add_node_interface(node: Box, ifdata: Box, defaults: Box) -> Box:
         ifdata.mtu = node.mtu                   # .... no, copy node MTU to interface MTU
 
   node.interfaces.append(ifdata)
+  index_node_interface(node,node.interfaces[-1])
 
   # Box modifies the dict in place, return a reference to be updated
   # return len(node.links)
   return node.interfaces[-1]
 
+"""
+Interface index: (node, ifindex) => interface lookups used by modules that have to find
+the node interface corresponding to a link interface or a neighbor.
+
+The index is maintained by add_node_interface. An index entry keeps a reference to the node
+interface list and its length; the entry is rebuilt if the interface list has been replaced
+or modified by someone else (for example, when VLAN module removes VLAN member interfaces)
+"""
+IFINDEX_INDEX: typing.Dict[str,dict] = {}
+
+def reset_interface_index() -> None:
+  IFINDEX_INDEX.clear()
+
+def build_interface_index(node: Box) -> dict:
+  intf_list = node.get('interfaces',[])
+  entry = {
+    'interfaces': intf_list,
+    'count': len(intf_list),
+    'map': {} }
+  for intf in intf_list:                                  # The first interface with an ifindex wins
+    entry['map'].setdefault(intf.get('ifindex',None),intf)  # ... just like it would in a list search
+  IFINDEX_INDEX[node.name] = entry
+  return entry
+
+def index_node_interface(node: Box, ifdata: Box) -> None:
+  entry = IFINDEX_INDEX.get(node.name,None)
+  if entry is None or entry['interfaces'] is not node.interfaces or entry['count'] != len(node.interfaces) - 1:
+    build_interface_index(node)                           # Stale or missing index entry, rebuild it
+    return
+
+  entry['map'].setdefault(ifdata.get('ifindex',None),ifdata)
+  entry['count'] = len(node.interfaces)
+
+"""
+get_node_interface: find the node interface with the specified ifindex, returns None if
+there is no such interface
+"""
+def get_node_interface(node: Box, ifindex: typing.Any) -> typing.Optional[Box]:
+  entry = IFINDEX_INDEX.get(node.name,None)
+  intf_list = node.get('interfaces',[])
+  if entry is None or entry['interfaces'] is not intf_list or entry['count'] != len(intf_list):
+    entry = build_interface_index(node)
+
+  intf = entry['map'].get(ifindex,None)
+  if intf is not None and intf.get('ifindex',None) == ifindex:
+    return intf
+
+  entry = build_interface_index(node)                     # Cache miss or a modified interface, retry with a fresh map
+  return entry['map'].get(ifindex,None)
+
 """
 Add link attributes (specified in link_attr set) to interface data structure
 
-Also used to merge interface data structure with neighbor data structure when building neighbor list
+Also used to merge interface data structure with neighbor data structure (compact record)
+when building neighbor list
 """
-def interface_data(link: Box, link_attr: set, ifdata: Box) -> Box:
+IfData = typing.TypeVar('IfData',Box,data.CompactData)
+
+def interface_data(link: Box, link_attr: set, ifdata: IfData) -> IfData:
   for k in link_attr:
     if k in link:
       if not k in ifdata:
@@ -344,7 +398,7 @@ def set_fhrp_gateway(link: Box, pfx_list: Box, nodes: Box, link_path: str) -> No
       continue
 
     try:                                                              # Now try to get N-th IP address on that link
-      link.gateway[af] = get_nth_ip_from_prefix(netaddr.IPNetwork(link.prefix[af]),link.gateway.id)
+      link.gateway[af] = get_nth_ip_from_prefix(parse_IPAM_prefix(link.prefix[af]),link.gateway.id)
       fhrp_assigned = True
     except Exception as ex:
       log.error(
@@ -409,7 +463,7 @@ def assign_link_prefix(
 
   pfx_list = addressing.get(addr_pools,pools)
   link.prefix = {
-      af: str(v) if af in log.AF_LIST and not isinstance(v,bool) else v for af,v in pfx_list.items()
+      af: add_IPAM_prefix(v) if af in log.AF_LIST and not isinstance(v,bool) else v for af,v in pfx_list.items()
     }
   if not link.prefix:
     link.pop('prefix',None)
@@ -427,7 +481,7 @@ Get IPAM policy for link/prefix
 
 Return 'error' if the prefix size is too small
 """
-def get_prefix_IPAM_policy(link: Box, pfx: typing.Union[netaddr.IPNetwork,bool], ndict: Box) -> str:
+def get_prefix_IPAM_policy(link: Box, pfx: typing.Union['IPAMPrefix',bool], ndict: Box) -> str:
   if isinstance(pfx,bool):
     return 'unnumbered'
 
@@ -458,23 +512,84 @@ def get_prefix_IPAM_policy(link: Box, pfx: typing.Union[netaddr.IPNetwork,bool],
 
   return 'error'
 
+"""
+Integer IPAM: link prefixes are parsed (once per prefix string) into IPAMPrefix tuples. Host addresses
+are computed with integer arithmetic and converted into strings only when they're written into
+interface data, saving the creation of netaddr objects for every interface address.
+"""
+class IPAMPrefix(typing.NamedTuple):
+  version: int                                  # IP address version (4 or 6)
+  ip: int                                       # IP address (might contain host bits)
+  first: int                                    # First IP address in the subnet
+  last: int                                     # Last IP address in the subnet
+  prefixlen: int
+
+  def __str__(self) -> str:
+    return format_IPAM_address(self.version,self.ip,self.prefixlen)
+
+def format_IPAM_address(version: int, addr: int, prefixlen: int) -> str:
+  a_str = netaddr.strategy.ipv4.int_to_str(addr) if version == 4 else netaddr.strategy.ipv6.int_to_str(addr)
+  return f'{a_str}/{prefixlen}'
+
+IPAM_PREFIX_CACHE: typing.Dict[str,IPAMPrefix] = {}
+
+def get_IPAM_prefix(net: netaddr.IPNetwork) -> IPAMPrefix:
+  return IPAMPrefix(net.version,net.value,net.first,net.last,net.prefixlen)
+
+"""
+Remember the prefixes allocated from address pools, so we don't have to parse them again
+when assigning interface addresses. Returns the prefix string saved in link data.
+"""
+def add_IPAM_prefix(net: netaddr.IPNetwork) -> str:
+  pfx_str = str(net)
+  if pfx_str not in IPAM_PREFIX_CACHE:
+    IPAM_PREFIX_CACHE[pfx_str] = get_IPAM_prefix(net)
+  return pfx_str
+
+"""
+Parse a link prefix into an IPAMPrefix tuple. Raises netaddr exceptions on invalid prefixes,
+the caller has to catch them
+"""
+def parse_IPAM_prefix(pfx: typing.Any) -> IPAMPrefix:
+  if not isinstance(pfx,str):
+    return get_IPAM_prefix(netaddr.IPNetwork(pfx))
+
+  i_pfx = IPAM_PREFIX_CACHE.get(pfx,None)
+  if i_pfx is None:
+    i_pfx = get_IPAM_prefix(netaddr.IPNetwork(pfx))
+    IPAM_PREFIX_CACHE[pfx] = i_pfx
+  return i_pfx
+
 """
 Get Nth IP address in a prefix returned as a nice string with a subnet mask
 
+Like netaddr IPNetwork indexing, negative indices count from the end of the subnet
+
 *** WARNING *** WARNING *** WARNING ***
 
 Parent must catch the exception as we don't know what error text to display
 """
 
-def get_nth_ip_from_prefix(pfx: netaddr.IPNetwork, n_id: int) -> str:
-  node_addr = netaddr.IPNetwork(pfx[n_id])
-  node_addr.prefixlen = pfx.prefixlen
-  return str(node_addr)
+def get_nth_ip_from_prefix(pfx: IPAMPrefix, n_id: typing.Any) -> str:
+  try:
+    index = int(n_id)
+  except ValueError:
+    raise TypeError(f'unsupported index type {n_id!r}!')
+
+  size = pfx.last - pfx.first + 1
+  if -size <= index < 0:                        # Negative index, count from the end of the subnet
+    addr = pfx.last + index + 1
+  elif 0 <= index < size:
+    addr = pfx.first + index
+  else:
+    raise IndexError('index out range for address range size!')
+
+  return format_IPAM_address(pfx.version,addr,pfx.prefixlen)
 
 """
 Set an interface address based on the link prefix and interface sequential number (could be node.id or counter)
 """
-def set_interface_address(intf: Box, af: str, pfx: netaddr.IPNetwork, node_id: int) -> bool:
+def set_interface_address(intf: Box, af: str, pfx: IPAMPrefix, node_id: int) -> bool:
   if af in intf:                                # Check static interface addresses
     if isinstance(intf[af],bool):               # unnumbered or unaddressed node, leave it alone
       return True
@@ -534,7 +649,7 @@ def IPAM_unnumbered(link: Box, af: str, pfx: typing.Optional[bool], ndict: Box)
         log.IncorrectValue,
         'links')
 
-def IPAM_sequential(link: Box, af: str, pfx: netaddr.IPNetwork, ndict: Box) -> None:
+def IPAM_sequential(link: Box, af: str, pfx: IPAMPrefix, ndict: Box) -> None:
   start = 1 if pfx.last != pfx.first + 1 else 0
   gwid = get_gateway_id(link)
   for count,intf in enumerate(link.interfaces):
@@ -542,19 +657,18 @@ def IPAM_sequential(link: Box, af: str, pfx: netaddr.IPNetwork, ndict: Box) -> N
       start = start + 1                                         # ... no big deal, just move the starting point ;)
     set_interface_address(intf,af,pfx,count+start)
 
-def IPAM_p2p(link: Box, af: str, pfx: netaddr.IPNetwork, ndict: Box) -> None:
+def IPAM_p2p(link: Box, af: str, pfx: IPAMPrefix, ndict: Box) -> None:
   start = 1 if pfx.last != pfx.first + 1 else 0
   for count,intf in enumerate(sorted(link.interfaces, key=lambda intf: intf.node)):
     set_interface_address(intf,af,pfx,count+start)
 
-def IPAM_id_based(link: Box, af: str, pfx: netaddr.IPNetwork, ndict: Box) -> None:
+def IPAM_id_based(link: Box, af: str, pfx: IPAMPrefix, ndict: Box) -> None:
   for intf in link.interfaces:
     set_interface_address(intf,af,pfx,ndict[intf.node].id)
 
-def IPAM_loopback(link: Box, af: str, pfx: netaddr.IPNetwork, ndict: Box) -> None:
+def IPAM_loopback(link: Box, af: str, pfx: IPAMPrefix, ndict: Box) -> None:
   for intf in link.interfaces:
-    pfx.prefixlen = 128 if ':' in str(pfx) else 32
-    intf[af] = str(pfx)
+    intf[af] = format_IPAM_address(pfx.version,pfx.ip,128 if pfx.version == 6 else 32)
 
 IPAM_dispatch: typing.Final[dict] = { 
     'unnumbered': IPAM_unnumbered,
@@ -590,12 +704,13 @@ def assign_interface_addresses(link: Box, addr_pools: Box, ndict: Box, defaults:
     if not af in pfx_list:                            # Skip address families not used on the link
       continue
 
+    pfx_net: typing.Union[IPAMPrefix,bool]
     if isinstance(pfx_list[af],bool):                 # Unnumbered AF
       allocation_policy = 'unnumbered'
       pfx_net = pfx_list[af]
     else:
       try:                                            # Parse the AF prefix
-        pfx_net = netaddr.IPNetwork(pfx_list[af])
+        pfx_net = parse_IPAM_prefix(pfx_list[af])
       except Exception as ex:                         # Report an error and move on if it cannot be parsed
         log.error(
           f'Cannot parse {af} prefix {pfx_list[af]} on {link._linkname}\n' + \
@@ -740,7 +855,7 @@ def create_node_interfaces(link: Box, addr_pools: Box, ndict: Box, defaults: Box
         continue
       remote_node = remote_if['node']                             # Remote node name in a handier format
       remote_ifdata = remote_if['data']                           # ... and a pointer to remote interface data
-      ngh_data = data.get_box({ 'ifname': remote_ifdata.ifname, 'node': remote_node })
+      ngh_data = data.CompactData(ifname=remote_ifdata.ifname,node=remote_node)
       #
       # Find relevant modules that have interface attributes
       mods_with_attr = set([ m for m in ndict[remote_node].get('module',[])
@@ -1028,6 +1143,7 @@ This function is called from init_links very early in the topology initializatio
 and must do its own data validation.
 '''
 def expand_groups(topology: Box) -> None:
+  member_links: list = []
   for link in list(topology.links):                 # Iterate over existing links (that's why we have to cast it as a list)
     if not 'group' in link:                         # Not a group link, move on
       if 'members' in link:
@@ -1054,19 +1170,23 @@ def expand_groups(topology: Box) -> None:
         'links')
       continue                                      # Report error and skip otherwise
 
-    copy_group_data = data.get_box(link)            # We'll copy all group data into member links
-    for key in ['group','members','_linkname']:     # Apart from the link name and 
-      copy_group_data.pop(key,None)
+    copy_group_data = { k: v for k,v in link.items() # We'll copy all group data into member links
+                          if not k in ['group','members','_linkname'] }   # ... apart from the link name and group attributes
 
     for idx,member in enumerate(link.members):
       member = adjust_link_object(member,f'{link._linkname}[{idx+1}]',topology.nodes)
-      member = copy_group_data + member             # Copy group data into member link
-      topology.links.append(member)
+      if member is None:                            # Invalid member link, error has already been reported
+        continue
+      data.merge_missing(member,copy_group_data)    # Copy group data missing in the member link into member link
+      member_links.append(member)
 
-  # Finally, remove group links from the link list
-  topology.links = [ link for link in topology.links if not 'group' in link ]
+  # Finally, remove group links from the link list and add member links (in a single step to avoid extra copies)
+  topology.links = [ link for link in topology.links if not 'group' in link ] + \
+                   [ link for link in member_links if not 'group' in link ]
 
 def links_init(topology: Box) -> None:
+  reset_interface_index()
+  IPAM_PREFIX_CACHE.clear()
   topology.links = adjust_link_list(topology.links,topology.nodes)
   set_linknames(topology)
   expand_groups(topology)
@@ -1096,6 +1216,7 @@ def transform(link_list: typing.Optional[Box], defaults: Box, nodes: Box, pools:
   return link_list
 
 def cleanup(topology: Box) -> None:
+  IPAM_PREFIX_CACHE.clear()
   if not 'links' in topology:
     return
 
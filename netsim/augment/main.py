@@ -5,7 +5,7 @@
 import sys
 from box import Box
 
-from ..utils import log,versioning
+from ..utils import log,versioning,memory
 from .. import __version__
 from .. import augment
 from .. import providers
@@ -14,6 +14,31 @@ from .. import devices as quirks
 from ..data import global_vars,validate
 from . import addressing
 
+"""
+reset_state -- reset the module-level caches and global state left behind by previous transformations
+
+Use it when running several transformations in the same process (test harness). The parsed system
+defaults (package files, including device, module and provider defaults read from the
+package directory) are kept in the YAML read cache, everything else is dropped.
+"""
+def reset_state() -> None:
+  from ..utils import read as _read, files as _files
+  from ..modules import vlan,routing
+
+  pkg_dir = str(_files.get_moddir())
+  for fname in [ f for f in _read.read_cache.keys() if not f.startswith(('package:',pkg_dir)) ]:
+    _read.read_cache.pop(fname,None)
+
+  modules.mod_load.clear()                        # Module and device quirks instances are bound to topology defaults
+  quirks.DEVICE_MODULE.clear()
+  global_vars.reset()
+  augment.devices.reset_device_cache(stats=True)
+  augment.links.reset_interface_index()
+  augment.links.IPAM_PREFIX_CACHE.clear()
+  augment.groups.reset_group_index()
+  vlan.reset_vlan_neighbor_index()
+  routing.reset_shared_objects()
+
 def topology_init(topology: Box) -> None:
   global_vars.init(topology)
   augment.config.attributes(topology)
@@ -104,6 +129,16 @@ def post_transform(topology: Box) -> None:
     topology.pop(remove_attr,None)
 
 def transform(topology: Box) -> None:
-  transform_setup(topology)
-  transform_data(topology)
-  post_transform(topology)
+  mem_debug = log.debug_flag_set('memory')
+  if mem_debug:
+    memory.PHASES.clear()                         # Drop the results of a failed transformation
+    memory.record_phase('load',topology)
+  for (phase,phase_function) in (('setup',transform_setup),('data',transform_data),('post',post_transform)):
+    phase_function(topology)
+    if mem_debug:
+      memory.record_phase(phase,topology)
+
+  if log.debug_flag_set('cache'):
+    augment.devices.print_device_cache_stats()
+  if mem_debug:
+    memory.print_report()
@@ -12,7 +12,7 @@ from box import Box
 from ..utils import log, read as _read, sort as _sort, strings
 from ..utils.files import get_moddir,get_search_path,load_python_module
 from .. import data
-from . import config
+from . import config, devices
 
 '''
 merge_plugin_defaults: Merge plugin defaults with topology defaults
@@ -264,3 +264,4 @@ def execute(action: str, topology: Box) -> None:
       if log.debug_active('plugin'):                          # ... do some logging to help the poor debugging souls
         print(f'plug {action}: {plugin}')
       func(topology)                                          # ... and execute the plugin function
+      devices.reset_device_cache()                            # Plugins might have changed device data
@@ -13,11 +13,10 @@ import typing
 
 from box import Box
 
-from . import usage
-from .. import augment
+from . import usage,daemon
+from .. import augment                                      # Augmentation modules are loaded on first use
 from .. import __version__
-from ..utils import status as _status, log, read as _read
-from ..data import global_vars
+from ..utils import log
 
 DRY_RUN: bool = False
 NETLAB_SCRIPT: str = ''
@@ -27,7 +26,7 @@ def parser_add_debug(parser: argparse.ArgumentParser) -> None:
                   choices=sorted([
                     'all','addr','cli','links','libvirt','clab','modules','plugin','template',
                     'vlan','vrf','quirks','validate','addressing','groups','status',
-                    'external','defaults']),
+                    'external','defaults','cache','memory']),
                   help=argparse.SUPPRESS)
   parser.add_argument('--test', dest='test', action='store',nargs='*',
                   choices=['errors'],
@@ -116,6 +115,8 @@ def fs_cleanup(filelist: typing.List[str], verbose: bool = False) -> None:
 # Common topology loader (used by create and down)
 
 def load_topology(args: typing.Union[argparse.Namespace,Box]) -> Box:
+  from ..utils import read as _read
+
   log.set_logging_flags(args)
   relative_name = 'test' in args and args.test and 'errors' in args.test
   topology = _read.load(args.topology.name,args.defaults,relative_topo_name=relative_name)
@@ -130,6 +131,9 @@ def load_topology(args: typing.Union[argparse.Namespace,Box]) -> Box:
 # Snapshot loading code -- loads the specified snapshot file and checks its modification date
 #
 def load_snapshot(args: typing.Union[argparse.Namespace,Box]) -> Box:
+  from ..utils import read as _read
+  from ..data import global_vars
+
   if not os.path.isfile(args.snapshot):
     print(f"The topology snapshot file {args.snapshot} does not exist.\n"+
           "Looks like no lab was started from this directory")
@@ -213,6 +217,8 @@ def lab_status_update(
       update: typing.Optional[dict] = None,
       cb: typing.Optional[typing.Callable] = None) -> None:
 
+  from ..utils import status as _status
+
   if DRY_RUN:                                               # Don't update status if we're in dry-run mode 
     return
   lab_id = _status.get_lab_id(topology)                     # Get the lab ID (or default)
@@ -258,6 +264,8 @@ lab_status_change -- change current lab status
 """
 def lab_status_change(topology: Box, new_status: str) -> None:
   global DRY_RUN
+  from ..utils import status as _status
+
   if DRY_RUN:                                              # Don't update status if we're in dry-run mode 
     return
 
@@ -271,6 +279,8 @@ def lab_status_change(topology: Box, new_status: str) -> None:
 lab_status_log -- change current lab status
 """
 def lab_status_log(topology: Box, log_line: str) -> None:
+  from ..utils import status as _status
+
   _status.change_status(
     topology,
     callback = lambda s,t:
@@ -295,7 +305,24 @@ quick_commands = {
   'alias': lambda x: usage.print_usage('alias.txt')
 }
 
+"""
+lab_commands: main netlab entry point
+
+Forward read-only commands to the netlab daemon if it's running (see daemon.py),
+execute everything else in the current process
+"""
 def lab_commands(script: str) -> None:
+  if daemon.is_forwarded(sys.argv):
+    status = daemon.forward_command(script)
+    if status is not None:
+      sys.exit(status)
+
+  run_command(script)
+
+"""
+run_command: execute the netlab command specified in sys.argv
+"""
+def run_command(script: str) -> None:
   global NETLAB_SCRIPT
   NETLAB_SCRIPT = script
 
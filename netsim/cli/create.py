@@ -9,11 +9,14 @@ import typing
 import textwrap
 import os
 import sys
+import glob
+import time
+import contextlib
 from box import Box
 
 from . import common_parse_args, topology_parse_args, load_topology, lab_status_log
 from .. import augment
-from ..utils import log, read as _read,strings
+from ..utils import log, read as _read,strings,files as _files,diff as _diff
 from ..outputs import _TopologyOutput
 
 #
@@ -58,6 +61,8 @@ def create_topology_parse(
   if cmd == 'create':
     parser.add_argument('-o','--output',dest='output', action='append',help='Output format(s): format:option=filename')
     parser.add_argument('--devices',dest='devices', action='store_true',help='Create provider configuration file and netlab-devices.yml')
+    parser.add_argument('--watch',dest='watch', action='store_true',
+                  help='Watch topology sources and recreate the changed output files')
 
   return parser.parse_args(args)
 
@@ -70,6 +75,8 @@ def run(cli_args: typing.List[str],
     args.output = None
   if not 'devices' in args:
     args.devices = None
+  if not 'watch' in args:
+    args.watch = False
 
   if not args.output:
     args.output = ['provider','yaml=netlab.snapshot.yml','tools']
@@ -87,6 +94,26 @@ def run(cli_args: typing.List[str],
     os.remove('netlab.lock')
     lab_status_log(topology,'Configuration files have been recreated')
 
+  old_snapshot = create_output_files(topology,args)
+  if args.watch:
+    watch_topology(topology,args,old_snapshot)
+
+  return topology
+
+"""
+create_output_files: create the output files and the topology diff (comparing the new topology
+with the snapshot that is about to be overwritten). Returns the previous snapshot
+"""
+def create_output_files(topology: Box, args: argparse.Namespace) -> typing.Optional[Box]:
+  old_snapshot = read_previous_snapshot(args)
+  write_output_files(topology,args,old_snapshot)
+  return old_snapshot
+
+"""
+write_output_files: run the output modules and create the topology diff if we have the
+snapshot to compare the new topology with
+"""
+def write_output_files(topology: Box, args: argparse.Namespace, old_snapshot: typing.Optional[Box]) -> None:
   for output_format in args.output:
     output_module = _TopologyOutput.load(output_format,topology.defaults.outputs[output_format.split(':')[0]])
     if output_module:
@@ -94,4 +121,152 @@ def run(cli_args: typing.List[str],
     else:
       log.error('Unknown output format %s' % output_format,log.IncorrectValue,'create')
 
-  return topology
+  if old_snapshot is not None and not log.pending_errors():
+    create_topology_diff(old_snapshot,topology)
+
+"""
+read_previous_snapshot: read the transformed topology snapshot that is about to be overwritten
+(used to create the topology diff). Removes the stale topology diff file if there's no snapshot
+"""
+def read_previous_snapshot(args: argparse.Namespace) -> typing.Optional[Box]:
+  snapshot = 'netlab.snapshot.yml'
+  if not f'yaml={snapshot}' in args.output:
+    return None
+
+  if not os.path.isfile(snapshot):
+    if os.path.exists(_diff.DIFF_FILE):
+      os.remove(_diff.DIFF_FILE)
+    return None
+
+  try:
+    with open(snapshot,'r',encoding='utf-8') as snapshot_file:
+      return _read.load_yaml_box(snapshot_file)
+  except Exception as ex:
+    log.error(
+      f'Cannot read the previous topology snapshot {snapshot}: {ex}',
+      category=Warning,
+      module='create',
+      more_hints='The topology diff (netlab.diff.yml) was not created')
+    return None
+
+"""
+create_topology_diff: compare the previous topology snapshot with the new transformed topology
+and save the changes in netlab.diff.yml (used by 'netlab diff' and 'netlab initial --changed')
+"""
+def create_topology_diff(old_snapshot: Box, topology: Box) -> None:
+  diff = _diff.topology_diff(old_snapshot,topology)
+  _files.create_file_from_text(_diff.DIFF_FILE,strings.get_yaml_string(diff))
+  log.status_created()
+  print(f'topology diff in {_diff.DIFF_FILE}: {_diff.diff_summary(diff)}')
+
+"""
+watch_files: get the list of files used to build the lab topology: topology file, local
+defaults, included files, plugins and custom configuration templates
+"""
+def watch_files(topology: Box) -> typing.List[str]:
+  pkg_dir = str(_files.get_moddir())
+  flist = list(topology.get('input',[])) + list(_read.read_cache.keys())
+  flist = [ fname for fname in flist if not fname.startswith(('package:',pkg_dir)) ]
+
+  plugins = [ mod for name,mod in sys.modules.items()       # Add plugin files (all files for directory plugins)
+                if name.startswith(('netlab.plugin.','netlab.extra.')) ]
+  for plugin in plugins:                                    # ... the list of plugins is removed from the topology
+    p_file = getattr(plugin,'__file__',None)
+    if not p_file or p_file.startswith(pkg_dir):            # ... skipping system plugins
+      continue
+    if os.path.basename(p_file) in ('plugin.py','__init__.py'):
+      flist.extend(glob.glob(os.path.join(os.path.dirname(p_file),'**','*'),recursive=True))
+    else:
+      flist.append(p_file)
+
+  cfg_names = { cfg for n_data in topology.nodes.values() for cfg in n_data.get('config',[]) if isinstance(cfg,str) }
+  for cfg_dir in topology.defaults.paths.custom.dirs:       # Add custom config templates used by lab nodes
+    if cfg_dir.startswith('package:') or not os.path.isdir(cfg_dir):
+      continue
+    for cfg in cfg_names:
+      for pattern in (cfg,cfg+'.*',cfg+'/**/*'):
+        flist.extend(glob.glob(os.path.join(cfg_dir,pattern),recursive=True))
+
+  return list(dict.fromkeys([ fname for fname in flist if not os.path.isdir(fname) ]))
+
+"""
+file_stamps: get modification time and size of watched files (None for missing files)
+"""
+def file_stamps(flist: typing.List[str]) -> dict:
+  stamps: dict = {}
+  for fname in flist:
+    try:
+      f_stat = os.stat(fname)
+      stamps[fname] = (f_stat.st_mtime_ns,f_stat.st_size)
+    except OSError:
+      stamps[fname] = None
+
+  return stamps
+
+"""
+recreate_topology: reload and transform the lab topology, and rewrite output files that
+have changed. The defaults, Python modules and compiled templates loaded by the previous
+run are kept in memory (see augment.main.reset_state). The topology diff is created against
+the base snapshot (the snapshot that existed when we started watching), not against the
+snapshot written by the previous run. Returns the transformed topology or None if the
+transformation failed.
+"""
+def recreate_topology(args: argparse.Namespace, base_snapshot: typing.Optional[Box]) -> typing.Optional[Box]:
+  augment.main.reset_state()
+  log.init_log_system()
+  _files.CHANGED_FILES.clear()
+  _files.WRITE_CHANGED_ONLY = True
+  try:
+    topology = load_topology(args)
+    augment.main.transform(topology)
+    log.exit_on_error()
+    with contextlib.redirect_stdout(None):                  # Output modules report every file they write
+      write_output_files(topology,args,base_snapshot)
+    log.exit_on_error()
+    return topology
+  except (SystemExit,log.ErrorAbort):                       # Errors have been reported, keep watching
+    return None
+  finally:
+    _files.WRITE_CHANGED_ONLY = False
+
+"""
+watch_topology: poll the lab topology sources and recreate the output files when they change
+
+The watched files are polled (modification time and size) once per second to avoid
+platform-specific file system notification dependencies
+"""
+def watch_topology(
+      topology: Box,
+      args: argparse.Namespace,
+      base_snapshot: typing.Optional[Box],
+      interval: float = 1.0) -> None:
+  snapshot = 'netlab.snapshot.yml'
+  flist = watch_files(topology)
+  stamps = file_stamps(flist)
+  print(f'Watching {len(flist)} topology source files, press Ctrl-C to stop')
+  try:
+    while True:
+      time.sleep(interval)
+      new_stamps = file_stamps(flist)
+      if new_stamps == stamps:
+        continue
+
+      start = time.perf_counter()
+      new_topology = recreate_topology(args,base_snapshot)
+      elapsed = time.perf_counter() - start
+      if new_topology is None:
+        strings.print_colored_text('[FAILED]  ','bright_red','Failed: ')
+        print(f'lab topology transformation failed after {elapsed:.2f}s, waiting for changes')
+        stamps = new_stamps
+        continue
+
+      if os.path.exists(snapshot) and not snapshot in _files.CHANGED_FILES:
+        os.utime(snapshot)                                  # Unchanged snapshot must not look older than its sources
+
+      changed = ', '.join(_files.CHANGED_FILES) if _files.CHANGED_FILES else 'no output files changed'
+      log.status_green('UPDATED','Updated: ')
+      print(f'lab topology transformed in {elapsed:.2f}s: {changed}')
+      flist = watch_files(new_topology)                     # Includes, plugins or templates might have changed
+      stamps = file_stamps(flist)
+  except KeyboardInterrupt:
+    print()
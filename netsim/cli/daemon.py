@@ -0,0 +1,487 @@
+#
+# netlab daemon command and netlab daemon client
+#
+# The netlab daemon is a long-lived process listening on a UNIX socket. It imports
+# the netlab modules, reads the system defaults and caches the transformed topology
+# snapshots. Every request is executed in a forked copy of the daemon that uses the
+# client's stdin/stdout/stderr (passed over the socket), current directory,
+# environment and command-line arguments, so the commands behave as if they were
+# executed in the client process without paying the Python startup and module
+# import costs.
+#
+# The daemon is single-threaded (forking a multi-threaded process could deadlock
+# the workers). The snapshots are parsed in forked loader processes that send the
+# parsed data back over a pipe; the accept loop (select) serves the requests while
+# the loaders are running, and stores the parsed snapshots in the snapshot cache.
+#
+# The daemon is detached from the terminal, and the forked workers have no
+# controlling tty. Only the read-only commands that never interact with the user
+# (FORWARD_COMMANDS) are thus forwarded to the daemon; the other commands (which
+# might use sudo or ssh prompts) are always executed in the client process.
+#
+# The client side (forward_command) is used by netlab CLI entry point, and returns
+# None if the daemon is not running (the command is then executed in-process).
+#
+import typing
+import os
+import sys
+import json
+import pickle
+import select
+import time
+import signal
+import socket
+import argparse
+import importlib
+import traceback
+
+SOCKET_PATH: typing.Final[str] = '~/.netlab/daemon.sock'
+SNAPSHOT_FILE: typing.Final[str] = 'netlab.snapshot.yml'
+
+FORWARD_COMMANDS: typing.Final[list] = [       # Read-only, non-interactive commands executed in the daemon
+  'status', 'inspect', 'report', 'graph', 'show', 'version', 'usage' ]
+LOCAL_OPTIONS: typing.Final[list] = [           # ... unless they use one of these options
+  '--cleanup' ]
+SNAPSHOT_COMMANDS: typing.Final[list] = [       # Commands that only read the transformed topology snapshot
+  'graph', 'inspect', 'report' ]
+
+SNAPSHOT_CACHE: typing.Dict[str,tuple] = {}     # Snapshot path => ((mtime,size),data)
+SNAPSHOT_LOADERS: typing.Dict[int,dict] = {}    # Loader pipe fd => path, snapshot key, data received so far
+SNAPSHOT_CACHE_SIZE: typing.Final[int] = 8
+MAX_FDS: typing.Final[int] = 3                  # stdin, stdout, stderr
+START_TIME: float = 0
+
+def get_socket_path() -> str:
+  return os.path.expanduser(SOCKET_PATH)
+
+def get_package_id() -> str:
+  import netsim
+  return f'{netsim.__version__}:{os.path.dirname(os.path.abspath(netsim.__file__))}'
+
+"""
+Send a JSON-encoded message (followed by a newline), optionally with a list of
+file descriptors (SCM_RIGHTS ancillary data)
+"""
+def send_message(conn: socket.socket, msg: dict, fds: typing.Optional[list] = None) -> None:
+  data = (json.dumps(msg) + '\n').encode()
+  if fds:
+    import array
+    conn.sendmsg([data],[(socket.SOL_SOCKET,socket.SCM_RIGHTS,array.array('i',fds))])
+  else:
+    conn.sendall(data)
+
+"""
+Receive a newline-terminated JSON message and the file descriptors passed with it
+"""
+def receive_message(conn: socket.socket) -> typing.Tuple[dict,list]:
+  import array
+
+  fds = array.array('i')
+  data = b''
+  while not data.endswith(b'\n'):
+    chunk,ancdata,_,_ = conn.recvmsg(65536,socket.CMSG_LEN(MAX_FDS * fds.itemsize))
+    if not chunk:
+      raise ConnectionError('connection closed while receiving a request')
+    data += chunk
+    for c_level,c_type,c_data in ancdata:
+      if c_level == socket.SOL_SOCKET and c_type == socket.SCM_RIGHTS:
+        fds.frombytes(c_data[:len(c_data) - (len(c_data) % fds.itemsize)])
+
+  return json.loads(data.decode()),list(fds)
+
+def connect_daemon() -> typing.Optional[socket.socket]:
+  path = get_socket_path()
+  if not os.path.exists(path):
+    return None
+
+  conn = socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+  try:
+    conn.connect(path)
+  except OSError:
+    conn.close()
+    return None
+
+  return conn
+
+"""
+is_forwarded: can the daemon execute the command specified in argv?
+"""
+def is_forwarded(argv: typing.List[str]) -> bool:
+  if len(argv) < 2 or argv[1] not in FORWARD_COMMANDS:
+    return False
+  return not [ arg for arg in argv[2:] if arg in LOCAL_OPTIONS ]
+
+"""
+forward_command: execute the current netlab command in the netlab daemon
+
+Returns the command exit status, or None if the command could not be forwarded
+to the daemon (daemon not running or running a different netlab package)
+"""
+def forward_command(script: str) -> typing.Optional[int]:
+  conn = connect_daemon()
+  if conn is None:
+    return None
+
+  umask = os.umask(0o022)                                       # The only way to get umask is to change it
+  os.umask(umask)
+  request = {
+    'argv': sys.argv,
+    'script': script,
+    'cwd': os.getcwd(),
+    'env': dict(os.environ),
+    'umask': umask,
+    'package': get_package_id() }
+
+  with conn:
+    try:
+      sys.stdout.flush()
+      sys.stderr.flush()
+      send_message(conn,request,[ sys.stdin.fileno(), sys.stdout.fileno(), sys.stderr.fileno() ])
+    except (OSError,ValueError,AttributeError):                 # Cannot pass stdio file descriptors, run in-process
+      return None
+
+    reader = conn.makefile('r')
+    pid = None
+    while True:
+      try:
+        line = reader.readline()
+        if not line:
+          if pid is None:                                       # Daemon refused the request before starting it
+            return None
+          print('netlab daemon worker terminated unexpectedly',file=sys.stderr)
+          return 1
+        msg = json.loads(line)
+        if 'fallback' in msg:                                   # Daemon cannot execute the command
+          return None
+        if 'pid' in msg:
+          pid = msg['pid']
+        if 'exit' in msg:
+          return msg['exit']
+      except KeyboardInterrupt:                                 # Ctrl/C goes to the client, pass it to the worker
+        if pid is None:
+          return 130
+        try:
+          os.killpg(pid,signal.SIGINT)
+        except OSError:
+          pass
+
+"""
+Daemon side: preload modules and defaults, so the forked workers don't have to
+"""
+def warm_up() -> None:
+  from ..utils import read as _read
+
+  for cmd in FORWARD_COMMANDS:
+    try:
+      importlib.import_module(f'netsim.cli.{cmd}')
+    except Exception:                                           # A command that cannot be imported will fail in
+      pass                                                      # ... the worker with a proper error message
+
+  try:
+    _read.system_defaults()                                     # Caches the package defaults files in read cache
+  except (Exception,SystemExit):
+    pass
+
+"""
+Start a loader process that parses a topology snapshot and sends the parsed data
+(pickled dictionary) back to the daemon over a pipe
+"""
+def start_loader(path: str, s_key: tuple) -> None:
+  from ..utils import read as _read
+
+  r_fd,w_fd = os.pipe()
+  if os.fork() == 0:                                            # Loader process
+    try:
+      os.closerange(3,w_fd)                                     # Close the server socket, the client connection,
+      os.closerange(w_fd + 1,os.sysconf('SC_OPEN_MAX'))         # ... client stdio and other loaders' pipes
+      signal.signal(signal.SIGTERM,signal.SIG_DFL)
+      with open(path,'r',encoding='utf-8') as snapshot_file:
+        data = _read.load_yaml_box(snapshot_file).to_dict()
+      with open(w_fd,'wb') as pipe:
+        pickle.dump(data,pipe,protocol=pickle.HIGHEST_PROTOCOL)
+    except BaseException:                                       # Nothing is sent back, the snapshot is not cached
+      pass
+    os._exit(0)
+
+  os.close(w_fd)
+  os.set_blocking(r_fd,False)
+  SNAPSHOT_LOADERS[r_fd] = { 'path': path, 'key': s_key, 'data': bytearray() }
+
+"""
+Read the data sent by a loader process. When the loader is done, store the parsed
+snapshot in the snapshot cache (dropping the oldest snapshot if needed)
+"""
+def read_loader(fd: int) -> None:
+  loader = SNAPSHOT_LOADERS[fd]
+  while True:
+    try:
+      chunk = os.read(fd,1 << 20)
+    except BlockingIOError:                                     # Loader is still running
+      return
+    if not chunk:
+      break
+    loader['data'] += chunk
+
+  os.close(fd)
+  SNAPSHOT_LOADERS.pop(fd)
+  try:
+    data = pickle.loads(loader['data'])
+  except Exception:                                             # Loader failed to parse the snapshot
+    return
+
+  path = loader['path']
+  if len(SNAPSHOT_CACHE) >= SNAPSHOT_CACHE_SIZE and path not in SNAPSHOT_CACHE:
+    SNAPSHOT_CACHE.pop(next(iter(SNAPSHOT_CACHE)),None)         # Drop the oldest snapshot
+  SNAPSHOT_CACHE[path] = (loader['key'],data)
+
+"""
+Get the cached transformed topology snapshot for commands that use it.
+
+The accept loop never parses the snapshot: when the cached copy is missing or stale,
+the worker reads the snapshot file itself, and a loader process refreshes the
+cache for the subsequent requests
+"""
+def get_snapshot(request: dict) -> typing.Optional[typing.Any]:
+  argv = request['argv']
+  if len(argv) < 2 or argv[1] not in SNAPSHOT_COMMANDS:
+    return None
+
+  path = os.path.join(request['cwd'],SNAPSHOT_FILE)
+  try:
+    stat = os.stat(path)
+  except OSError:
+    SNAPSHOT_CACHE.pop(path,None)
+    return None
+
+  s_key = (stat.st_mtime_ns,stat.st_size)
+  cached = SNAPSHOT_CACHE.get(path,None)
+  if cached is not None and cached[0] == s_key:
+    return cached[1]
+
+  if path not in [ loader['path'] for loader in SNAPSHOT_LOADERS.values() ]:
+    start_loader(path,s_key)
+  return None
+
+def exit_status(code: typing.Any) -> int:
+  if code is None:
+    return 0
+  if isinstance(code,int):
+    return code
+  print(code,file=sys.stderr)
+  return 1
+
+"""
+Worker process: take over the client's stdio, directory and environment, and
+execute the netlab command
+"""
+def execute_request(conn: socket.socket, request: dict, fds: list, snapshot: typing.Any) -> None:
+  from . import run_command
+  from ..utils import read as _read, strings
+
+  signal.signal(signal.SIGCHLD,signal.SIG_DFL)                  # Restore the signal handlers changed by the daemon
+  signal.signal(signal.SIGTERM,signal.SIG_DFL)
+  signal.signal(signal.SIGINT,signal.default_int_handler)
+  os.setpgid(0,0)                                               # Ctrl/C is sent to the whole worker process group
+
+  for std_fd,fd in enumerate(fds):
+    os.dup2(fd,std_fd)
+    os.close(fd)
+  sys.stdin  = open(0,'r',closefd=False)
+  sys.stdout = open(1,'w',buffering=1,closefd=False)
+  sys.stderr = open(2,'w',buffering=1,closefd=False)
+
+  os.chdir(request['cwd'])
+  os.environ.clear()
+  os.environ.update(request['env'])
+  os.umask(request['umask'])
+  sys.argv = request['argv']
+  strings.init_rich_consoles()                                  # Figure out the capabilities of the client terminal
+  if snapshot is not None:
+    _read.read_cache[SNAPSHOT_FILE] = snapshot
+
+  send_message(conn,{ 'pid': os.getpid() })
+  try:
+    run_command(request['script'])
+    status = 0
+  except SystemExit as ex:
+    status = exit_status(ex.code)
+  except KeyboardInterrupt:
+    status = 130
+  except Exception:
+    traceback.print_exc()
+    status = 1
+
+  for f in (sys.stdout,sys.stderr):
+    try:
+      f.flush()
+    except Exception:
+      pass
+
+  send_message(conn,{ 'exit': status })
+
+def handle_control(conn: socket.socket, request: dict) -> bool:
+  if request['control'] == 'status':
+    send_message(conn,{
+      'pid': os.getpid(),
+      'uptime': round(time.time() - START_TIME),
+      'package': get_package_id(),
+      'snapshots': list(SNAPSHOT_CACHE.keys()),
+      'loading': [ loader['path'] for loader in SNAPSHOT_LOADERS.values() ] })
+  elif request['control'] == 'stop':
+    send_message(conn,{ 'stopped': os.getpid() })
+    return False
+
+  return True
+
+def handle_connection(conn: socket.socket, server: socket.socket) -> bool:
+  try:
+    request,fds = receive_message(conn)
+  except (OSError,ValueError):
+    return True
+
+  if 'control' in request:
+    return handle_control(conn,request)
+
+  if request.get('package') != get_package_id():                # Client is using a different netlab package
+    for fd in fds:
+      os.close(fd)
+    send_message(conn,{ 'fallback': 'package mismatch' })
+    return True
+
+  snapshot = get_snapshot(request)
+  if os.fork() == 0:                                            # Worker process
+    status = 0
+    try:
+      server.close()
+      for fd in SNAPSHOT_LOADERS:
+        os.close(fd)
+      execute_request(conn,request,fds,snapshot)
+    except BaseException:
+      status = 1
+    os._exit(status)
+
+  for fd in fds:
+    os.close(fd)
+  return True
+
+"""
+Daemon main loop: accept requests and fork a worker for each one of them, and
+collect the snapshots parsed by the loader processes
+"""
+def serve(path: str) -> None:
+  global START_TIME
+
+  warm_up()
+  START_TIME = time.time()
+  signal.signal(signal.SIGCHLD,signal.SIG_IGN)                  # Workers report status to clients, reap them automatically
+  signal.signal(signal.SIGTERM,lambda signum,frame: sys.exit(0))
+
+  os.makedirs(os.path.dirname(path),exist_ok=True)
+  if os.path.exists(path):
+    os.unlink(path)
+
+  server = socket.socket(socket.AF_UNIX,socket.SOCK_STREAM)
+  old_umask = os.umask(0o077)                                   # Only the current user can use the daemon
+  server.bind(path)
+  os.umask(old_umask)
+  server.listen(16)
+
+  try:
+    running = True
+    while running:
+      ready,_,_ = select.select([ server.fileno(), *SNAPSHOT_LOADERS ],[],[])
+      for fd in ready:
+        if fd == server.fileno():
+          conn,_ = server.accept()
+          with conn:
+            running = handle_connection(conn,server) and running
+        else:
+          read_loader(fd)
+  finally:
+    server.close()
+    if os.path.exists(path):
+      os.unlink(path)
+
+"""
+Start the daemon in the background (double fork, detach from the terminal)
+"""
+def start_daemon(path: str) -> None:
+  pid = os.fork()
+  if pid:
+    os.waitpid(pid,0)
+    for _ in range(100):                                        # Wait up to 10 seconds for the daemon to start
+      conn = connect_daemon()
+      if conn is not None:
+        conn.close()
+        print(f'netlab daemon started, listening on {path}')
+        return
+      time.sleep(0.1)
+    print('netlab daemon did not start',file=sys.stderr)
+    sys.exit(1)
+
+  os.setsid()
+  if os.fork():
+    os._exit(0)
+
+  null_fd = os.open(os.devnull,os.O_RDWR)
+  for std_fd in range(3):
+    os.dup2(null_fd,std_fd)
+  os.chdir('/')
+  try:
+    serve(path)
+  finally:
+    os._exit(0)
+
+def control_request(control: str) -> typing.Optional[dict]:
+  conn = connect_daemon()
+  if conn is None:
+    return None
+
+  with conn:
+    send_message(conn,{ 'control': control })
+    msg,_ = receive_message(conn)
+    return msg
+
+def daemon_parse(args: typing.List[str]) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(
+    prog="netlab daemon",
+    description='Run netlab commands in a resident netlab process')
+  parser.add_argument(
+    dest='action', action='store',
+    choices=['start','stop','status'],
+    help='Start, stop or check the netlab daemon')
+  parser.add_argument(
+    '--foreground',
+    dest='foreground', action='store_true',
+    help='Run the daemon in the foreground')
+
+  return parser.parse_args(args)
+
+def run(cli_args: typing.List[str]) -> None:
+  args = daemon_parse(cli_args)
+  path = get_socket_path()
+  status = control_request('status')
+
+  if args.action == 'status':
+    if status is None:
+      print('netlab daemon is not running')
+      sys.exit(1)
+    print(f'netlab daemon is running (pid {status["pid"]}, uptime {status["uptime"]} seconds)')
+    for snapshot in status['snapshots']:
+      print(f'  cached snapshot: {snapshot}')
+    for snapshot in status.get('loading',[]):
+      print(f'  loading snapshot: {snapshot}')
+  elif args.action == 'stop':
+    if status is None:
+      print('netlab daemon is not running')
+      return
+    control_request('stop')
+    print(f'netlab daemon (pid {status["pid"]}) stopped')
+  elif args.action == 'start':
+    if status is not None:
+      print(f'netlab daemon is already running (pid {status["pid"]})')
+      return
+    if args.foreground:
+      serve(path)
+    else:
+      start_daemon(path)
@@ -0,0 +1,133 @@
+#
+# netlab diff command
+#
+# Display the changes between the previous and the current lab topology snapshot
+# (created by 'netlab create' in netlab.diff.yml), or compare two topology snapshots
+#
+import typing
+import os
+import sys
+import argparse
+
+from box import Box
+
+from . import parser_add_snapshot
+from .. import providers
+from ..data import get_box
+from ..utils import log,strings,read as _read,diff as _diff
+
+#
+# CLI parser for 'netlab diff' command
+#
+def diff_parse(args: typing.List[str]) -> argparse.Namespace:
+  parser = argparse.ArgumentParser(
+    prog="netlab diff",
+    description='Display lab topology changes',
+    epilog='Without arguments, display the changes recorded by the last "netlab create" command')
+  parser.add_argument(
+    '--format',
+    dest='format', action='store',
+    default='text',
+    choices=['text','yaml'],
+    help='Select data presentation format')
+  parser.add_argument(
+    dest='old', action='store', nargs='?',
+    help='Old topology snapshot')
+  parser.add_argument(
+    dest='new', action='store', nargs='?',
+    help='New topology snapshot (default: netlab.snapshot.yml)')
+  parser_add_snapshot(parser,hide=True)
+
+  return parser.parse_args(args)
+
+def read_yaml_file(fname: str) -> Box:
+  if not os.path.isfile(fname):
+    log.fatal(f'File {fname} does not exist','diff')
+
+  try:
+    with open(fname,'r',encoding='utf-8') as yaml_file:
+      return _read.load_yaml_box(yaml_file)
+  except Exception as ex:
+    log.fatal(f'Cannot read {fname}: {ex}','diff')
+
+"""
+get_provider_changes: ask the virtualization providers used in the lab which nodes they
+have to start, stop or restart to implement the changes
+"""
+def get_provider_changes(diff: Box, snapshot: typing.Optional[Box]) -> Box:
+  changes = get_box({})
+  if snapshot is None:
+    return changes
+
+  nodes = diff.get('nodes',{})
+  p_list = set(nodes.get('added',{}).values()) | set(nodes.get('removed',{}).values())
+  p_list |= { n_diff.provider for n_diff in nodes.get('changed',{}).values() }
+  for pname in sorted(p_list):
+    if not pname in snapshot.defaults.providers:
+      continue
+    p_module = providers._Provider.load(pname,snapshot.defaults.providers[pname])
+    p_changes = p_module.get_lab_changes(diff)
+    if p_changes.start or p_changes.stop or p_changes.restart:
+      changes[pname] = p_changes
+
+  return changes
+
+def print_list(label: str, values: typing.Iterable) -> None:
+  values = list(values)
+  if values:
+    print(f'{label}: {", ".join(values)}')
+
+def print_diff(diff: Box, p_changes: Box) -> None:
+  print(f'Lab topology changes: {_diff.diff_summary(diff)}')
+  if not diff:
+    return
+
+  nodes = diff.get('nodes',{})
+  print_list('Nodes added',[ f'{name} ({p_name})' for name,p_name in nodes.get('added',{}).items() ])
+  print_list('Nodes removed',[ f'{name} ({p_name})' for name,p_name in nodes.get('removed',{}).items() ])
+  for name,n_diff in nodes.get('changed',{}).items():
+    print(f'Node {name}:')
+    print_list('  attributes',n_diff.get('attributes',[]))
+    print_list('  modules',n_diff.get('modules',[]))
+    intf_diff = n_diff.get('interfaces',{})
+    print_list('  interfaces added',intf_diff.get('added',[]))
+    print_list('  interfaces removed',intf_diff.get('removed',[]))
+    print_list('  interfaces changed',
+      [ f'{ifname} ({", ".join(attr)})' for ifname,attr in intf_diff.get('changed',{}).items() ])
+
+  links = diff.get('links',{})
+  print_list('Links added',links.get('added',[]))
+  print_list('Links removed',links.get('removed',[]))
+  print_list('Links changed',[ f'{link} ({", ".join(attr)})' for link,attr in links.get('changed',{}).items() ])
+  print_list('Topology elements changed',diff.get('topology',[]))
+
+  for pname,changes in p_changes.items():
+    print(f'Provider {pname}:')
+    for action in ('start','stop','restart'):
+      print_list(f'  {action}',changes[action])
+
+def run(cli_args: typing.List[str]) -> None:
+  args = diff_parse(cli_args)
+  log.init_log_system(False)
+
+  snapshot_name = args.new or args.snapshot
+  snapshot = read_yaml_file(snapshot_name) if os.path.isfile(snapshot_name) else None
+  if args.old:
+    if snapshot is None:
+      log.fatal(f'Topology snapshot {snapshot_name} does not exist','diff')
+    diff = _diff.topology_diff(read_yaml_file(args.old),snapshot)
+  else:
+    c_diff = _diff.read_diff()
+    if c_diff is None:
+      print(f'The topology diff file {_diff.DIFF_FILE} does not exist.\n'+
+            'It is created when "netlab create" overwrites an existing topology snapshot')
+      sys.exit(1)
+    diff = c_diff
+
+  p_changes = get_provider_changes(diff,snapshot)
+  if args.format == 'yaml':
+    if p_changes:
+      diff.providers = p_changes
+    strings.pretty_print(strings.get_yaml_string(diff),'yaml')
+  else:
+    print_diff(diff,p_changes)
@@ -19,7 +19,7 @@ from .connect import quote_list, docker_connect, ssh_connect, connect_to_node,\
 
 from ..outputs import common as outputs_common
 from ..utils import strings, log
-from ..augment.groups import group_members
+from .. import augment
 
 #
 # CLI parser for 'netlab ' command
@@ -64,7 +64,7 @@ def run(cli_args: typing.List[str]) -> None:
   if selector in topology.nodes:
     connect_to_node(node=selector,args=args,rest=rest,topology=topology,log_level=log_level)
   elif selector in topology.groups:
-    node_list = group_members(topology,selector)
+    node_list = augment.groups.group_members(topology,selector)
     for node in node_list:           
         connect_to_node(node=node,args=args,rest=rest,topology=topology,log_level=log_level)   
   else:  
@@ -36,6 +36,10 @@ def initial_config_parse(args: typing.List[str]) -> typing.Tuple[argparse.Namesp
     '-c','--custom',
     dest='custom', action='store_true',
     help='Deploy custom configuration templates (specified in "config" group or node attribute)')
+  parser.add_argument(
+    '--changed',
+    dest='changed', action='store_true',
+    help='Deploy configuration only to nodes changed by the last "netlab create" (see "netlab diff")')
   parser.add_argument(
     '--ready',
     dest='ready', action='store_true',
@@ -56,12 +60,39 @@ def initial_config_parse(args: typing.List[str]) -> typing.Tuple[argparse.Namesp
 
   return parser.parse_known_args(args)
 
+"""
+get_changed_nodes: use the topology diff created by 'netlab create' to limit the configuration
+deployment to the changed nodes. If the changes are limited to module data, deploy just the
+configuration of the changed modules (unless the user specified what to deploy)
+"""
+def get_changed_nodes(args: argparse.Namespace) -> typing.List[str]:
+  from ..utils import diff as _diff
+
+  diff = _diff.read_diff()
+  if diff is None:
+    log.fatal(f'The topology diff file {_diff.DIFF_FILE} does not exist, cannot deploy changed configuration','initial')
+
+  node_list = _diff.affected_nodes(diff)
+  modules = _diff.changed_modules(diff)
+  if node_list and modules and not (args.initial or args.module or args.custom):
+    args.module = ','.join(modules)
+
+  return node_list
+
 def run_initial(cli_args: typing.List[str]) -> None:
   (args,rest) = initial_config_parse(cli_args)
 
   topology = load_snapshot(args)
 
   deploy_parts = []
+  if args.changed:
+    node_list = get_changed_nodes(args)
+    if not node_list:
+      print("The lab topology has not changed, there's no configuration to deploy")
+      return
+    deploy_parts.append("nodes: " + ','.join(node_list))
+    rest = ['--limit',','.join(node_list)] + rest
+
   if args.verbose:
     rest = ['-' + 'v' * args.verbose] + rest
 
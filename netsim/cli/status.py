@@ -98,17 +98,15 @@ def show_lab_instance(iid: Lab_Instance_ID, lab_state: Box) -> None:
   print(f'  provider(s): {",".join(lab_state.providers)}')
   print()
 
-def load_provider_status(p_status: dict, provider: str, topology: Box) -> None:
-  p_module = providers.get_provider_module(topology,provider)
-
-  if not provider in p_status:
-    p_status[provider] = p_module.call('get_lab_status') or get_empty_box()
-
 def show_lab_nodes(topology: Box) -> None:
-  p_status: dict = {}
   rows = []
   heading = [ 'node', 'device', 'image', 'mgmt IPv4', 'connection', 'provider', 'VM/container', 'status']
 
+  p_list = { n_data.get('provider',topology.defaults.provider) for n_data in topology.nodes.values() }
+  if topology.tools:
+    p_list.add('clab')
+  p_status = providers.get_lab_status(topology,sorted(p_list))     # Query all providers concurrently
+
   for n_name,n_data in topology.nodes.items():
     n_ext = outputs_common.adjust_inventory_host(
               node=topology.nodes[n_name],
@@ -117,7 +115,6 @@ def show_lab_nodes(topology: Box) -> None:
 
     n_provider = n_data.get('provider',topology.defaults.provider)
     p_module   = providers.get_provider_module(topology,n_provider)
-    load_provider_status(p_status,n_provider,topology)
 
     row = [ n_data.name, n_data.device, n_data.box, n_data.mgmt.ipv4, n_ext.ansible_connection, n_provider ]
     wk_name = p_module.call('get_node_name',n_name,topology)
@@ -129,7 +126,6 @@ def show_lab_nodes(topology: Box) -> None:
 
   for t_name,t_data in topology.tools.items():
     n_provider = 'clab'
-    load_provider_status(p_status,n_provider,topology)
 
     wk_name = f'{topology.name}_{t_name}'
     wk_state = p_status[n_provider].get(wk_name,get_empty_box())
@@ -227,7 +223,7 @@ command only when you're absolutely sure that the lab status shown by
   if not strings.confirm('Do you want to continue?'):
     return
   try:
-    os.remove(lab_status_file)
+    status.remove_status_file(topology)
     print('Lab status file removed')
   except Exception as ex:
     log.fatal(f'Cannot remove lab status file: {ex}')
@@ -248,7 +244,7 @@ def run(cli_args: typing.List[str]) -> None:
     reset_lab_status(topology)
     return
 
-  lab_states = status.read_status(topology)
+  lab_states = status.read_status(topology,include_log=not args.all)
   if not lab_states:
     print('No netlab-managed labs')
     sys.exit(1)
@@ -3,14 +3,17 @@
 #
 
 import typing,typing_extensions
+import copy
 from box import Box
 from . import types
+from .compact import CompactBox,CompactData
 
 #
 # I had enough -- here's a function that returns a box with proper default settings
 
 def get_box(init: dict) -> Box:
-  return Box(init,default_box=True,default_box_none_transform=False,box_dots=True)
+  return Box(init,default_box=True,default_box_none_transform=False,box_dots=True,
+             box_class=CompactBox,default_box_attr=CompactBox)
 
 def get_empty_box() -> Box:
   return get_box({})
@@ -68,6 +71,18 @@ def remove_null_values(d: Box) -> None:
     elif isinstance(d[k],Box):
       remove_null_values(d[k])                              # ... and recurse into child boxes
 
+#
+# Merge source dictionary into target dictionary in place, adding only the values missing in the target
+# (target values always win, nested dictionaries are merged recursively). Equivalent to 'target = source + target'
+# without building new Box objects, and a no-op if the target already has all the values
+#
+def merge_missing(target: Box, source: dict) -> None:
+  for k,v in source.items():
+    if not k in target:
+      target[k] = copy.deepcopy(v) if isinstance(v,(dict,list)) else v
+    elif isinstance(v,dict) and isinstance(target[k],dict):
+      merge_missing(target[k],v)
+
 #
 # Get a global setting or corresponding system default. Use for attributes that are not propagated or early in the
 # transformation logic when the module attributes haven't been propagated yet
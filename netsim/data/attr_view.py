@@ -0,0 +1,128 @@
+#
+# Attribute views used by the data validation code
+#
+# validate_attributes layers provider- or tool-specific attributes on top of the
+# global attribute definitions, and combines several attribute namespaces (for
+# example, link and interface attributes) into a list of valid attributes. Adding
+# the Box objects would create a deep copy of all of them, even though validation
+# only looks up a handful of keys. AttributeView is a read-mostly view of a stack
+# of attribute definitions (highest priority first) that resolves every key when
+# it's accessed:
+#
+# * A key present in a single layer (or with a non-dictionary value in the
+#   highest-priority layer) returns the layer value by reference, without
+#   copying it
+# * A dictionary present in more than one layer is merged into a new Box (the
+#   same way Box addition would merge it) when it's first accessed. The result
+#   is cached in the view
+# * Top-level changes (set/delete) are stored in the view and never modify the
+#   layers
+#
+# The view is thus copy-on-write only for the top-level keys: changing a nested
+# value (view.x.y = 1) changes the layer itself if 'x' is present in a single
+# layer. That's fine for the validation code (it never changes the attribute
+# definitions), but the view is not a general-purpose replacement for Box
+# addition -- don't use it for data that other code might modify.
+#
+# The cost of a lookup is proportional to the number of layers and the size
+# of the overridden values, not to the size of the whole data structure.
+#
+import typing
+from collections.abc import Mapping,MutableMapping
+
+from box import Box
+
+from . import get_box,get_empty_box
+
+_DELETED: typing.Final[object] = object()
+
+class AttributeView(MutableMapping):
+  __slots__ = ('_layers','_local')
+
+  def __init__(self, *layers: typing.Optional[Mapping]) -> None:
+    object.__setattr__(self,'_layers',[ layer for layer in layers if layer ])
+    object.__setattr__(self,'_local',{})                    # Merged, changed and deleted values
+
+  def __getitem__(self, key: typing.Any) -> typing.Any:
+    if key in self._local:
+      value = self._local[key]
+      if value is _DELETED:
+        raise KeyError(key)
+      return value
+
+    values = [ layer[key] for layer in self._layers if key in layer ]
+    if not values:
+      raise KeyError(key)
+
+    if not isinstance(values[0],dict):                      # Highest-priority value is not a dictionary, no merging
+      return values[0]
+
+    dicts = []                                              # Collect dictionaries down to the first non-dictionary
+    for value in values:                                    # ... value (which would be overwritten in Box addition)
+      if not isinstance(value,dict):
+        break
+      dicts.append(value)
+
+    if len(dicts) == 1:                                     # Single dictionary, returned by reference
+      return dicts[0]
+
+    merged = get_box(dicts[-1])                             # Merge the dictionaries into a new Box,
+    for value in reversed(dicts[:-1]):                      # ... lowest priority first
+      merged += value
+
+    self._local[key] = merged                               # Cache the merged value (copy-on-write)
+    return merged
+
+  def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+    self._local[key] = value
+
+  def __delitem__(self, key: typing.Any) -> None:
+    if not key in self:
+      raise KeyError(key)
+    self._local[key] = _DELETED
+
+  def __contains__(self, key: typing.Any) -> bool:
+    if key in self._local:
+      return self._local[key] is not _DELETED
+    return any(key in layer for layer in self._layers)
+
+  def __iter__(self) -> typing.Iterator:
+    keys: dict = {}                                         # Use dictionary to keep key order (lowest layer first
+    for layer in reversed(self._layers):                    # ... like Box addition would)
+      keys.update(dict.fromkeys(layer))
+    keys.update(dict.fromkeys(self._local))
+    return iter([ k for k in keys if self._local.get(k,None) is not _DELETED ])
+
+  def __len__(self) -> int:
+    return sum(1 for _ in self)
+
+  def __getattr__(self, name: str) -> typing.Any:
+    if name.startswith('__'):                               # Keep Python protocols (copy, pickle) working
+      raise AttributeError(name)
+    try:
+      return self[name]
+    except KeyError:                                        # Missing attributes return an empty Box (like default_box)
+      return get_empty_box()
+
+  def __setattr__(self, name: str, value: typing.Any) -> None:
+    self[name] = value
+
+  def __delattr__(self, name: str) -> None:
+    try:
+      del self[name]
+    except KeyError:
+      raise AttributeError(name)
+
+  def __repr__(self) -> str:
+    return f'AttributeView({self.to_dict()})'
+
+  def to_dict(self) -> dict:
+    return { k: v.to_dict() if isinstance(v,(Box,AttributeView)) else v for k,v in self.items() }
+
+"""
+has_key: recursively check whether a dictionary (or any of its child dictionaries) contains the key
+"""
+def has_key(data: Mapping, key: str) -> bool:
+  if key in data:
+    return True
+  return any(has_key(v,key) for v in data.values() if isinstance(v,Mapping))
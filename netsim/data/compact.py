@@ -0,0 +1,224 @@
+#
+# Compact data records
+#
+# Box objects are convenient, but expensive: every Box carries its own copy of
+# the Box configuration (~1.3KB per object), attribute access is ~40x slower than
+# dictionary lookup, and every Box inserted into another Box or BoxList is
+# recreated. That adds up for the most numerous objects in the transformed
+# topology -- interface neighbors (their number grows with the square of the
+# number of nodes attached to a LAN segment or a VLAN).
+#
+# CompactData is a plain dictionary (no per-object configuration) with a thin
+# compatibility layer covering the Box API used by netlab modules, plugins and
+# templates:
+#
+# * Attribute access (ngb.node, ngb.ifname = 'eth1')
+# * Missing attributes return an empty (falsy) Box, like default_box does. Reading
+#   a missing attribute does not change the record; the Box (and its missing
+#   parents) is inserted into the record when it's changed (ngb.ospf.cost = 10)
+# * Missing keys (ngb['ospf'], ngb['ospf.cost']) behave like missing attributes
+# * Dotted keys in 'get', [] and 'in' (ngb.get('dhcp.client.ipv4'), ngb['ospf.cost'] = 10)
+# * Nested dictionaries and lists (constructor arguments or assigned values) are
+#   converted into Box/BoxList objects
+# * Box addition (ngb + data, data + ngb) returns a new Box; the record is not changed
+# * to_dict and copy methods
+#
+# Known incompatibilities (also listed in docs/dev/plugins.md):
+#
+# * CompactData is not a Box: isinstance(ngb,Box) is False (use isinstance(ngb,dict))
+# * Box-only methods (to_yaml, to_json, merge_update, freeze...) are not available;
+#   use strings.get_yaml_string or convert the record with Box(ngb)
+# * Reading a missing key never creates it (default_box_create_on_get behavior)
+# * Dotted keys cannot be used with 'del' or 'pop'
+# * Box/BoxList values assigned to the record are stored as-is (not copied)
+#
+# The Box objects created by netlab (get_box, read_yaml) use CompactBox as their
+# box_class. Box calls box_class to copy every dictionary inserted into a Box or a
+# BoxList; CompactBox returns a (cheap) CompactData copy when given a CompactData
+# object, so the compact records stay compact while retaining the copy-on-insert
+# semantics the rest of the code relies on. Because CompactData is a dict
+# subclass, templates and JSON output treat it like any other dictionary; the
+# YAML representers are registered at the end of this module.
+#
+import typing
+
+import yaml
+from box import Box,BoxList
+
+BOX_SETTINGS: typing.Final[dict] = {                      # Settings of the Box objects created by netlab
+  'default_box': True, 'default_box_none_transform': False, 'box_dots': True }
+
+class CompactData(dict):
+  __slots__ = ()
+
+  def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+    super().__init__()
+    for k,v in dict(*args,**kwargs).items():              # Copy nested dictionaries and lists into Box objects,
+      dict.__setitem__(self,k,box_value(k,v))               # ... the same thing Box would do
+
+  def __getattr__(self, name: str) -> typing.Any:
+    if name in self:
+      return self[name]
+    if name.startswith('__'):                               # Keep Python protocols (copy, pickle) working
+      raise AttributeError(name)
+    return missing_box(key=name,box_instance=self)
+
+  def __setattr__(self, name: str, value: typing.Any) -> None:
+    self[name] = value
+
+  def __delattr__(self, name: str) -> None:
+    try:
+      del self[name]
+    except KeyError:
+      raise AttributeError(name)
+
+  def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+    if isinstance(key,str) and '.' in key:                  # Dotted key: set the value in a child Box
+      (first,rest) = key.split('.',1)                       # ... creating it if needed
+      self[first][rest] = value
+      return
+
+    if isinstance(value,(dict,list)) and not isinstance(value,(Box,BoxList,CompactData)):
+      value = box_value(key,value)                          # Plain dictionaries and lists become Box objects
+    dict.__setitem__(self,key,value)
+
+  def __missing__(self, key: typing.Any) -> typing.Any:
+    if not isinstance(key,str):
+      raise KeyError(key)
+
+    value: typing.Any = self                                # Walk down the dictionary hierarchy (dotted keys)
+    k_list = key.split('.')
+    for idx,k in enumerate(k_list):
+      if not isinstance(value,dict):
+        raise KeyError(key)
+      if not dict.__contains__(value,k):                    # Missing key: return an empty Box that is inserted
+        value = missing_box(key=k,box_instance=value)       # ... into the record when it's changed
+        for k_child in k_list[idx+1:]:
+          value = missing_box(key=k_child,box_instance=value)
+        return value
+      value = dict.__getitem__(value,k)
+
+    return value
+
+  def __contains__(self, key: typing.Any) -> bool:
+    if dict.__contains__(self,key):
+      return True
+    if not isinstance(key,str) or not '.' in key:
+      return False
+
+    return dotted_lookup(self,key) is not MISSING
+
+  def get(self, key: typing.Any, default: typing.Any = None) -> typing.Any:
+    if dict.__contains__(self,key):
+      return dict.__getitem__(self,key)
+    if not isinstance(key,str) or not '.' in key:
+      return default
+
+    value = dotted_lookup(self,key)
+    return default if value is MISSING else value
+
+  def __add__(self, other: typing.Any) -> Box:
+    return CompactBox(dict(self),box_class=CompactBox,default_box_attr=CompactBox,**BOX_SETTINGS) + other
+
+  def __radd__(self, other: typing.Any) -> Box:
+    return CompactBox(dict(other),box_class=CompactBox,default_box_attr=CompactBox,**BOX_SETTINGS) + self
+
+  def copy(self) -> 'CompactData':
+    result = CompactData()                                  # Shallow copy, like dict.copy
+    dict.update(result,self)
+    return result
+
+  def to_dict(self) -> dict:
+    return { k: v.to_dict() if isinstance(v,(Box,CompactData)) else v.to_list() if hasattr(v,'to_list') else v
+               for k,v in self.items() }
+
+MISSING: typing.Final[object] = object()
+
+"""
+dotted_lookup: get the value of a dotted key without creating the missing entries
+"""
+def dotted_lookup(data: dict, key: str) -> typing.Any:
+  value: typing.Any = data
+  for k in key.split('.'):
+    if not isinstance(value,dict) or not dict.__contains__(value,k):
+      return MISSING
+    value = dict.__getitem__(value,k)
+
+  return value
+
+"""
+CompactBox: Box class used for all boxes created by netlab. Copies CompactData objects into
+CompactData objects instead of converting them into Box objects
+"""
+class CompactBox(Box):
+  def __new__(cls, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+    if args and type(args[0]) is CompactData:
+      return compact_copy(args[0])
+    return super().__new__(cls,*args,**kwargs)
+
+"""
+MissingBox: empty Box returned for a missing CompactData attribute (or a missing attribute
+of another MissingBox). The Box remembers its parent and inserts itself (and its missing
+parents) into the parent when it's changed.
+"""
+class MissingBox(CompactBox):
+  def attach(self) -> None:
+    parent = self._box_config.pop('__missing_parent',None)
+    if parent is None:
+      return
+
+    p_box,key = parent
+    if isinstance(p_box,MissingBox):
+      p_box.attach()
+    dict.__setitem__(p_box,key,self)                        # Insert this object, don't let Box copy it
+
+  def __setitem__(self, key: typing.Any, value: typing.Any) -> None:
+    self.attach()
+    super().__setitem__(key,value)
+
+  def setdefault(self, key: typing.Any, default: typing.Any = None) -> typing.Any:
+    self.attach()
+    return super().setdefault(key,default)
+
+  def update(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+    self.attach()
+    super().update(*args,**kwargs)
+
+def missing_box(key: str, box_instance: typing.Any) -> MissingBox:
+  value = MissingBox(box_class=CompactBox,default_box_attr=missing_box,default_box_create_on_get=False,**BOX_SETTINGS)
+  value._box_config['__missing_parent'] = (box_instance,key)
+  return value
+
+"""
+box_value: copy a nested dictionary or list into a new Box or BoxList object -- the same
+thing Box would do when inserting the data into another Box. CompactData values are
+inserted as-is
+"""
+def box_value(key: typing.Any, value: typing.Any) -> typing.Any:
+  if not isinstance(value,(dict,list)) or isinstance(value,CompactData):
+    return value
+
+  return CompactBox({ key: value },box_class=CompactBox,default_box_attr=CompactBox,**BOX_SETTINGS)[key]
+
+"""
+compact_copy: create a compact record from a Box or dictionary.
+
+Top-level values are copied, nested dictionaries and lists are copied into new Box
+objects (see box_value)
+"""
+def compact_copy(data: dict) -> CompactData:
+  return CompactData(data)
+
+"""
+Represent CompactData as a regular YAML mapping (Box uses the full PyYAML dumper).
+
+Box.to_dict converts every Box into a new dictionary, so the same Box referenced from two
+places appears twice in the YAML output. CompactData objects are not converted and would be
+dumped as YAML anchors and aliases; clearing the alias key keeps the Box-like printout
+"""
+def represent_compact_data(dumper: typing.Any, value: CompactData) -> typing.Any:
+  dumper.alias_key = None
+  return dumper.represent_dict(value.to_dict())
+
+for _dumper in (yaml.Dumper,yaml.SafeDumper):
+  yaml.add_representer(CompactData,represent_compact_data,Dumper=_dumper)
@@ -25,6 +25,16 @@ def init(topology: Box) -> None:
   _globals  = topology.defaults._globals
 
 
+'''
+reset -- forget the topology and the global variables of the previous transformation
+'''
+def reset() -> None:
+  global _topology,_globals,_glob_dict
+
+  _topology = None
+  _globals  = None
+  _glob_dict = {}
+
 '''
 get -- get a pointer to a global Box (referenced by name) hidden in topology
 '''
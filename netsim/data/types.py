@@ -4,11 +4,12 @@
 
 import typing,typing_extensions,types
 import functools
-import netaddr
 import re
 import textwrap
 
 from box import Box
+# netaddr is imported within IP/MAC validation functions: it takes a while to import
+# and most netlab CLI commands never need it
 from ..utils import log
 from . import global_vars
 
@@ -612,6 +613,7 @@ def check_named_prefix(value: str) -> typing.Optional[dict]:
 #
 @type_test()
 def must_be_ipv4(value: typing.Any, use: str, named: bool = False) -> dict:
+  import netaddr
 
   def transform_to_ipaddr(value: int) -> str:
     return str(netaddr.IPAddress(value))
@@ -671,6 +673,8 @@ def must_be_ipv4(value: typing.Any, use: str, named: bool = False) -> dict:
 
 @type_test()
 def must_be_ipv6(value: typing.Any, use: str) -> dict:
+  import netaddr
+
   if isinstance(value,bool):                                          # bool values are valid only on interfaces
     if use not in ('interface','prefix'):
       return { '_value': 'an IPv6 address (boolean value is valid only on an interface)' }
@@ -707,6 +711,7 @@ def must_be_ipv6(value: typing.Any, use: str) -> dict:
 
 @type_test()
 def must_be_prefix_str(value: typing.Any) -> dict:
+  import netaddr
 
   def transform_to_ipv4(value: typing.Any) -> dict:
     return { 'ipv4': value }
@@ -759,6 +764,8 @@ def must_be_addr_pool(value: typing.Any) -> dict:
 
 @type_test()
 def must_be_mac(value: typing.Any) -> dict:
+  import netaddr
+
   if not isinstance(value,str):
     return {'_type': 'MAC address' }
 
@@ -784,6 +791,8 @@ def must_be_net(value: typing.Any) -> dict:
 
 @type_test()
 def must_be_rd(value: typing.Any) -> dict:
+  import netaddr
+
   if isinstance(value,int) or value is None:                          # Accept RD/RT offets and trust the modules to do the right thing
     return { '_valid': True }                                         # Also: RD set to None can be used to prevent global-to-node RD inheritance
 
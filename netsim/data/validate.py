@@ -13,7 +13,8 @@ from .types import must_be_list,must_be_dict,must_be_string,must_be_int,must_be_
 
 # We also need to import the whole data.types module to be able to do validation function lookup
 from . import types as _tv
-from . import get_empty_box,get_a_list
+from . import get_box,get_empty_box,get_a_list
+from .attr_view import AttributeView,has_key
 
 # It's easier to have a few global functions than to pass topology parameter
 # around
@@ -39,7 +40,7 @@ def remove_required_flag(a: Box) -> None:                   # Utility function:
       remove_required_flag(v)
 
 def get_attribute_namespaces(
-      attributes: Box,                                      # Where to get valid attributes from
+      attributes: typing.Mapping,                           # Where to get valid attributes from
       attr_list: typing.List[str]                           # List of attribute namespaces
         ) -> list:
 
@@ -71,15 +72,16 @@ def get_attribute_namespaces(
 get_valid_attributes
 
 Given an attribute dictionary, list of valid attribute categories, and extra attributes, return a list
-of valid attributes, or a string (type name) if the first attribute source in the list is a string
+of valid attributes (a layered view of attribute namespaces), or a string (type name) if the first
+attribute source in the list is a string
 """
 
 def get_valid_attributes(
-      attributes: Box,                                      # Where to get valid attributes from
+      attributes: typing.Mapping,                           # Where to get valid attributes from
       attr_list: typing.List[str]                           # List of valid attributes (example: ['node'] or ['link','interface'])
-        ) -> typing.Union[str,Box]:
+        ) -> typing.Union[str,AttributeView]:
 
-  valid = get_empty_box()
+  layers: list = []                                         # Attribute namespaces, lowest priority first
 
   for idx,atlist in enumerate(attr_list):                   # Build a list of all valid (global) attributes for the object
     if not atlist in attributes:
@@ -87,14 +89,14 @@ def get_valid_attributes(
     add_attr = attributes[atlist]                           # Attributes to add to the list
 
     if isinstance(add_attr,str):                            # Got a specific data type?
-      if valid:                                             # Have we already collected something?
+      if layers:                                            # Have we already collected something?
         log.fatal(                                          # ... bad karma, inconsistent validation requirements
           f'Internal error trying to build list of attributes for {attr_list} -- unexpected value at {atlist}\n' +
           f'... attributes: {attributes}')
 
       return add_attr
 
-    if not isinstance(add_attr,Box):
+    if not isinstance(add_attr,(Box,AttributeView)):
       log.fatal(                                            # ... dang, someone messed up. Abort, abort, abort...
         f'Internal error: Expected dictionary for {atlist} attributes\n' +
         f'... attributes: {attributes}')
@@ -103,38 +105,38 @@ def get_valid_attributes(
     if idx:                                                 # Special handling for secondary namespaces
       if no_propagate in attributes:                        # Build a reduced dictionary if the secondary namespace has no_propagate list
         add_attr = { k:v for k,v in add_attr.items() if not k in attributes[no_propagate] }
-      else:                                                 # Other create a copy of the secondary attributes
-        add_attr = add_attr + {}
 
-      remove_required_flag(add_attr)                        # Remove required flags from the secondary namespace attributes
+      if has_key(add_attr,'_required'):                     # Remove required flags from the secondary namespace attributes
+        add_attr = get_box(add_attr)                        # ... working on a copy of the attributes (copy-on-write)
+        remove_required_flag(add_attr)
 
-    valid += add_attr                                       # ... nope, add to list of attributes and move on
+    layers.append(add_attr)                                 # ... add to list of attributes and move on
 
     internal_atlist = f'{atlist}_internal'                  # Internal object attributes (used by links)
     if internal_atlist in attributes:                       # Add internal attributes if they exist
-      valid += attributes[internal_atlist]
+      layers.append(attributes[internal_atlist])
 
-  return valid
+  return AttributeView(*reversed(layers))
 
 """
 validate_module_can_be_false: Check whether module attributes for an object can be 'false'
 """
 def validate_module_can_be_false(
-      attributes: Box,                                  # Attribute definition
+      attributes: typing.Mapping,                       # Attribute definition
       attr_list: typing.List[str]                       # List of valid attributes (example: ['node'] or ['link','interface'])
         ) -> bool:
 
   if not 'can_be_false' in attributes:
     return False
 
-  intersect = set(attr_list) & set(attributes.can_be_false)
+  intersect = set(attr_list) & set(attributes['can_be_false'])
   return bool(intersect)
 
 """
 check_required_keys -- checks that the required keys are present in the data structure
 """
 
-def check_required_keys(data: Box, attributes: Box, path: str,module: str) -> bool:
+def check_required_keys(data: Box, attributes: typing.Mapping, path: str,module: str) -> bool:
   result = True
   for k,v in attributes.items():
     if isinstance(v,Box) and '_required' in v and v._required:
@@ -163,7 +165,7 @@ def validate_dictionary(
       module_source: str,
       topology: Box,
       attr_list: list,
-      attributes: Box,
+      attributes: typing.Mapping,
       enabled_modules: list) -> bool:
 
   # Assume everything is OK
@@ -255,7 +257,7 @@ def validate_list(
       module_source: str,
       topology: Box,
       attr_list: list,
-      attributes: Box,
+      attributes: typing.Mapping,
       enabled_modules: list) -> bool:
 
   # Assume everything is OK
@@ -409,7 +411,7 @@ def validate_item(
       module_source: str,
       topology: Box,
       attr_list: list,
-      attributes: Box,
+      attributes: typing.Mapping,
       enabled_modules: list) -> typing.Any:
 
   global _bi,_tv,subtype_validation,PASS_ATTRIBUTES
@@ -525,7 +527,7 @@ def validate_attributes(
       modules: list = [],                               # List of relevant modules
       module: str = 'attributes',                       # Module generating the error message (default: 'attributes')
       module_source: str = '',                          # Where did we get the list of modules?
-      attributes: typing.Optional[Box] = None,          # Where to get valid attributes from
+      attributes: typing.Optional[typing.Mapping] = None, # Where to get valid attributes from
       extra_attributes: typing.Optional[Box] = None,    # Dynamic attributes (needed to validate provider and tool settings)
       ignored: typing.Optional[list] = ['_']            # Ignored prefixes
         ) -> typing.Any: 
@@ -539,13 +541,13 @@ def validate_attributes(
   if attributes is None:
     attributes = topology.defaults.attributes
 
-  if extra_attributes:
-    attributes = attributes + extra_attributes
+  if extra_attributes:                                    # Layer extra attributes on top of the regular ones
+    attributes = AttributeView(extra_attributes,attributes) # ... without copying either of them
 
   if not ignored:
     ignored = ['_']
 
-  if not isinstance(attributes,Box):
+  if not isinstance(attributes,(Box,AttributeView)):
     log.fatal('Internal error in validate_attributes: attributes is not a Box')
     return None
 
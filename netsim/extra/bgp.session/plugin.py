@@ -2,7 +2,7 @@ import typing
 from box import Box
 from netsim.utils import log,bgp as _bgp
 from netsim import api,data
-from netsim.augment import devices
+from netsim.augment import devices,links
 
 _config_name = 'bgp.session'
 _requires    = [ 'bgp' ]
@@ -139,8 +139,8 @@ Get link index from an interface index to check whether the BGP neighbor
 is attached to the same link
 '''
 def get_intf_linkindex(ndata: Box, ifindex: int) -> int:
-  t_intf = [ intf for intf in ndata.interfaces if intf.ifindex == ifindex ]
-  return t_intf[0].linkindex if t_intf else 0
+  t_intf = links.get_node_interface(ndata,ifindex)
+  return t_intf.linkindex if t_intf is not None else 0
 
 '''
 Given a neighbor (ngb) of a route server (ndata), set the rs_client flag on the
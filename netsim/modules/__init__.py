@@ -379,23 +379,29 @@ def copy_node_data_into_interfaces(topology: Box) -> None:
       if not mod_attr.node_copy:                                 # Any copyable attributes for this module?
         continue                                                 # ... nope, get out of here
 
-      copy_attr = data.get_box({ k: v
+      copy_attr = { k: v
         for k,v in n.get(m,{}).items()
-          if k in mod_attr.node_copy })                          # Build a Box of node attributes that could be copied to interfaces
+          if k in mod_attr.node_copy }                           # Build a dict of node attributes that could be copied to interfaces
 
+      vrf_cache: typing.Dict[str,dict] = {}                      # VRF attributes are the same for all interfaces in a VRF
       for intf in n.get('interfaces',[]):                        # We might have some work to do, iterate over all interfaces
         if not isinstance(intf.get(m,{}),dict):                  # ... if the interface module data is not a dict, we can't merge
           continue
-        vrf_attr = data.get_empty_box()                          # Assume we have no VRF attributes
+        vrf_attr: dict = {}                                      # Assume we have no VRF attributes
         if 'vrf' in intf and mod_attr.vrf_aware:                 # Do we have to deal with VRF-aware attributes?
-          vrf_mod_data = n.vrfs[intf.vrf].get(m,{})
-          if not vrf_mod_data is False:                          # Deal with things like 'ospf: False' on VRF level
-            vrf_attr = data.get_box({ k: v
+          if not intf.vrf in vrf_cache:
+            vrf_mod_data = n.vrfs[intf.vrf].get(m,{})
+            vrf_cache[intf.vrf] = {} if vrf_mod_data is False else { k: v
               for k,v in vrf_mod_data.items()
-                if k in mod_attr.vrf_aware })                    # Build a Box of VRF attributes that could be copied to interfaces
+                if k in mod_attr.vrf_aware }                     # Build a dict of VRF attributes that could be copied to interfaces
+                                                                 # ... dealing with things like 'ospf: False' on VRF level
+          vrf_attr = vrf_cache[intf.vrf]
 
         if copy_attr or vrf_attr:                                # ... modify interface data only if we have something to merge
-          intf[m] = copy_attr + vrf_attr + intf[m]
+          if not m in intf:
+            intf[m] = {}
+          data.merge_missing(intf[m],vrf_attr)                   # Interface attributes take precedence over VRF attributes
+          data.merge_missing(intf[m],copy_attr)                  # ... which take precedence over node attributes
 
 """
 get_effective_module_attribute:
@@ -2,6 +2,7 @@
 # Generic data plane routines
 #
 import typing
+import yaml
 from box import Box
 
 from ..utils import log
@@ -13,7 +14,7 @@ The ID Set routines provide a common interface to identifiers that can be auto-a
 
 Creating and updating the ID set:
 * build_id_set -- create the set of static identifiers
-* get_id_set -- get a set of already-allocated identifiers
+* get_id_set -- get a set (IdSet) of already-allocated identifiers
 * create_id_set -- create a global variable storing the identifier set and auto-assign sequence number
 * extend_id_set -- extend an existing ID set with a set of static identifiers
 
@@ -53,51 +54,155 @@ def build_id_set(obj: Box, dsname: str, attr: str, objname: str) -> set:
 
   return set()
 
-def get_id_set(name: str) -> set:
-	idvar = global_vars.get(f'{name}_id')
-	if not 'value' in idvar:
-		idvar.value = set()
-	
-	return idvar.value
+"""
+IdSet: a set of identifiers used by the ID set routines
+
+Small non-negative integers (node IDs, VLAN IDs, VNIs, VRF IDs) are stored in a bitmap that
+is extended as needed, all other values (for example, route distinguishers) are stored in
+a regular Python set. The object implements the set methods used by the consumers of this
+library (add, update, in, iteration, len) plus next_free (find the first unused identifier
+starting with the specified value)
+"""
+class IdSet:
+  MAX_BITMAP: typing.Final[int] = 1 << 24       # Largest bitmap we're willing to build (2MB, covers all VNIs)
+
+  __slots__ = ('bitmap','extra','count')
+
+  def __init__(self, values: typing.Optional[typing.Iterable] = None) -> None:
+    self.bitmap = bytearray()
+    self.extra: set = set()
+    self.count = 0
+    if values is not None:
+      self.update(values)
+
+  @staticmethod
+  def in_bitmap(value: typing.Any) -> bool:
+    return isinstance(value,int) and 0 <= value < IdSet.MAX_BITMAP
+
+  def grow(self, byte: int) -> None:
+    if byte >= len(self.bitmap):                                  # Extend the bitmap, doubling its size to get
+      new_size = min(max(byte + 1,2 * len(self.bitmap)),self.MAX_BITMAP >> 3)  # ... amortized O(1) growth
+      self.bitmap.extend(bytes(new_size - len(self.bitmap)))
+
+  def add(self, value: typing.Any) -> None:
+    if not self.in_bitmap(value):
+      self.extra.add(value)
+      return
+
+    byte = value >> 3
+    self.grow(byte)
+    mask = 1 << (value & 7)
+    if not self.bitmap[byte] & mask:
+      self.bitmap[byte] |= mask
+      self.count += 1
+
+  def update(self, values: typing.Iterable) -> None:
+    for value in values:
+      self.add(value)
+
+  def __contains__(self, value: typing.Any) -> bool:
+    if not self.in_bitmap(value):
+      return value in self.extra
+
+    byte = value >> 3
+    return byte < len(self.bitmap) and bool(self.bitmap[byte] & (1 << (value & 7)))
+
+  def __iter__(self) -> typing.Iterator:
+    for byte,bits in enumerate(self.bitmap):
+      if not bits:
+        continue
+      for bit in range(8):
+        if bits & (1 << bit):
+          yield (byte << 3) + bit
+
+    yield from self.extra
+
+  def __len__(self) -> int:
+    return self.count + len(self.extra)
 
-def create_id_set(name: str) -> set:
-	idvar = global_vars.get(f'{name}_id')
-	idvar.value = set()
-	return idvar.value
+  def __repr__(self) -> str:
+    return f'IdSet({set(self)})'
 
-def extend_id_set(name: str, add_set: set) -> set:
-	idset = get_id_set(name)
-	idset.update(add_set)
-	return idset
+  """
+  next_free: find the first unused value starting with 'start'. Skips fully-used bitmap bytes,
+  returns None if there's no free value between 'start' and 'max_value'
+  """
+  def next_free(self, start: int, max_value: int) -> typing.Optional[int]:
+    value = start
+    while value <= max_value:
+      if not self.in_bitmap(value):                               # Outside of bitmap range, do it the hard way
+        if not value in self.extra:
+          return value
+        value = value + 1
+        continue
+
+      byte = value >> 3
+      if byte >= len(self.bitmap):                                # Beyond the end of bitmap, must be free
+        return value
+      bits = self.bitmap[byte]
+      if bits == 0xFF:                                            # Skip fully-used bytes
+        value = (byte + 1) << 3
+        continue
+      if not bits & (1 << (value & 7)):
+        return value
+      value = value + 1
+
+    return None
+
+"""
+Represent IdSet as a YAML set, so it looks just like a set of identifiers in the topology snapshot
+"""
+def represent_id_set(dumper: typing.Any, value: IdSet) -> typing.Any:
+  return dumper.represent_set(set(value))
+
+for _dumper in (yaml.Dumper,yaml.SafeDumper):
+  yaml.add_representer(IdSet,represent_id_set,Dumper=_dumper)
+
+def get_id_set(name: str) -> IdSet:
+  idvar = global_vars.get(f'{name}_id')
+  if not 'value' in idvar:
+    idvar.value = IdSet()
+
+  return idvar.value
+
+def create_id_set(name: str) -> IdSet:
+  idvar = global_vars.get(f'{name}_id')
+  idvar.value = IdSet()
+  return idvar.value
+
+def extend_id_set(name: str, add_set: typing.Iterable) -> IdSet:
+  idset = get_id_set(name)
+  idset.update(add_set)
+  return idset
 
 def is_id_used(name: str, value: typing.Any) -> bool:
-	idset = get_id_set(name)
-	return value in idset
+  idset = get_id_set(name)
+  return value in idset
 
 def set_id_counter(name: str, start: int, max_value: int = 4096) -> int:
-	idvar = global_vars.get(f'{name}_id')
-	idvar.next = start
-	idvar.max = max_value
-	if not idvar.value:
-		idvar.value = set()
+  idvar = global_vars.get(f'{name}_id')
+  idvar.next = start
+  idvar.max = max_value
+  if not 'value' in idvar:
+    idvar.value = IdSet()
 
-	return start
+  return start
 
 def get_next_id(name: str) -> int:
   idvar = global_vars.get(f'{name}_id')
   if not 'next' in idvar:
     log.fatal(f'Initial {name} value is not set, get_next_id failed')
-  while True:
-    if not idvar.next in idvar.value:
-      idvar.value.add(idvar.next)
-      return idvar.next
-
-    idvar.next = idvar.next + 1
-    if idvar.next > idvar.max:
-      log.fatal(
-        f'Ran out of {name} values, next value would be greater than {idvar.max}',
-        module='dataplane',
-        header=True)
+
+  next_id = idvar.value.next_free(idvar.next,idvar.max)
+  if next_id is None:
+    log.fatal(
+      f'Ran out of {name} values, next value would be greater than {idvar.max}',
+      module='dataplane',
+      header=True)
+
+  idvar.value.add(next_id)
+  idvar.next = next_id
+  return next_id
 
 """
 validate_object_reference_list
@@ -3,12 +3,11 @@
 #
 import typing
 from box import Box
-import netaddr
 
 from . import _Module,_routing
 from ..utils import log, strings
 from .. import data
-from ..augment import devices
+from ..augment import devices,links,addressing
 
 '''
 Do sanity checks on DHCP data:
@@ -160,7 +159,7 @@ def build_topology_dhcp_pools(topology: Box) -> None:
       #
       for af in log.AF_LIST:
         if af in intf and isinstance(intf[af],str):
-          data.append_to_list(pools[pid].excluded,af,str(netaddr.IPNetwork(intf[af]).ip))
+          data.append_to_list(pools[pid].excluded,af,addressing.get_addr_ip(intf[af]))
 
   for link in topology.get('links',[]):                     # Iterate over lab topology links
     if not link.get('dhcp.subnet'):                         # dhcp.subnet is set if there's at least one DHCP client on the link
@@ -195,7 +194,7 @@ def build_topology_dhcp_pools(topology: Box) -> None:
         pools[pid][af] = af_pfx                             # New pool, add prefix
 
       if af in link.get('gateway',{}):                      # Save default gateway if present
-        pools[pid].gateway[af] = str(netaddr.IPNetwork(link.gateway[af]).ip)
+        pools[pid].gateway[af] = addressing.get_addr_ip(link.gateway[af])
 
       for intf in link.get('interfaces',[]):                # Now iterate over the interfaces attached to the link
         if af not in intf:                                  # Irrelevant interface, move on
@@ -205,14 +204,14 @@ def build_topology_dhcp_pools(topology: Box) -> None:
 
         #
         # Find the true (node) interface -- it might have a different DHCP.client setting
-        node_intf = [ nif for nif in topology.nodes[intf.node].interfaces if intf.ifindex == nif.ifindex ]
-        if not node_intf:                                   # Failed to find the interface
+        node_intf = links.get_node_interface(topology.nodes[intf.node],intf.ifindex)
+        if node_intf is None:                               # Failed to find the interface
           continue                                          # ... weird, but it's better than crashing
-        if node_intf[0].get(f'dhcp.client.{af}',False):
+        if node_intf.get(f'dhcp.client.{af}',False):
           continue                                          # Ignore IP addresses of DHCP clients
 
         # Append non-DHCP addresses to the excluded list
-        data.append_to_list(pools[pid].excluded,af,str(netaddr.IPNetwork(intf[af]).ip))        
+        data.append_to_list(pools[pid].excluded,af,addressing.get_addr_ip(intf[af]))
 
   topology.dhcp.pools = []                                  # Finally, convert pool data into a list of pools
   for pname,pdata in pools.items():                         # Iterate over collected pools
@@ -276,7 +275,7 @@ def set_dhcp_relay(intf: Box, n_name: str, topology: Box) -> None:
       # We have a usable address on the DHCP server control-plane interface.
       # Add it to the DHCP relay targets
       #
-      intf.dhcp.relay[af].append(str(netaddr.IPNetwork(cp_intf[af]).ip))
+      intf.dhcp.relay[af].append(addressing.get_addr_ip(cp_intf[af]))
 
 '''
 check_dynamic_routing -- check whether a node uses routing protocols on a DHCP interface
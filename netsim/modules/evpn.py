@@ -193,19 +193,20 @@ def register_static_transit_vni(topology: Box) -> None:
           'evpn')
 
 """
-Set transit VNI values for symmetrical IRB VRFs (REFACTOR to use _dataplane)
+Set transit VNI values for symmetrical IRB VRFs
 """
-def get_next_vni(start_vni: int, used_vni_list: typing.List[int]) -> int:
-  while True:
-    start_vni = start_vni + 1
-    if not start_vni in used_vni_list:
-      return start_vni
+def get_next_vni(start_vni: int, used_vni_set: _dataplane.IdSet) -> int:
+  next_vni = used_vni_set.next_free(start_vni + 1,16777215)
+  if next_vni is None:
+    log.fatal('Ran out of transit VNI values','evpn')
+
+  return next_vni
 
 def vrf_transit_vni(topology: Box) -> None:
   if not 'vrfs' in topology:
     return
 
-  vni_list: typing.List[int] = []                               # List of static transit VNIs
+  vni_set = _dataplane.IdSet()                                  # Set of static transit VNIs
   vni_error = False                                             # "A horrible error" flag that causes abort after the first loop
   vni_count = 0                                                 # Number of VRFs with evpn.transit_vni
   evpn_transport = topology.get('evpn.transport','vxlan')       # Default to VXLAN transport
@@ -224,13 +225,13 @@ def vrf_transit_vni(topology: Box) -> None:
       vni_count = vni_count + 1                                 # Count number of VRFs with evpn.transit_vni attribute
     if not data.is_true_int(vni):                               # Skip non-integer values, no need to check them at this time
       continue
-    if vni in vni_list:
+    if vni in vni_set:
       log.error(
         f'VRF {vrf_name} is using the same EVPN transit VNI as another VRF',
         log.IncorrectValue,
         'evpn')
       continue  
-    vni_list.append( vni )                                      # Insert it to detect duplicates elsewhere
+    vni_set.add(vni)                                            # Insert it to detect duplicates elsewhere
 
   if vni_error:                                                 # Found serious errors, makes no sense to continue
     return
@@ -250,7 +251,7 @@ def vrf_transit_vni(topology: Box) -> None:
                     max_value=16777215,
                     true_value=vni_start)                       # Make sure evpn.transit_vni is an integer
     if transit_vni == vni_start:                                # If we had to assign the default value, increment the default transit VNI
-      vni_start = get_next_vni(vni_start,vni_list)
+      vni_start = get_next_vni(vni_start,vni_set)
 
   for vrf_name,vrf_data in topology.vrfs.items():               # Third pass: set shared VNI values across VRFs
     if vrf_data is None:                                        # Skip empty VRF definitions
@@ -213,6 +213,156 @@ def check_routing_policy(p_name: str,o_type: str, node: Box,topology: Box) -> bo
 
   return OK                                                 # Return cumulative error status
 
+"""
+Shared routing objects
+
+Global routing objects imported into nodes without any local entries are not copied; the
+nodes reference the global object. These shared objects are:
+
+* normalized once (SHARED_NORMALIZED)
+* checked once per device/provider combination (SHARED_CHECKS, only successful checks are cached)
+* transformed once (SHARED_TRANSFORMS). The first node using a shared object transforms a private
+  copy of the global object, other nodes get references to the transformation results.
+
+A node that has to modify a shared object (merge local entries) gets a private copy of the
+imported entries (copy-on-write).
+
+All cache entries are keyed on object type and name and keep a reference to the global object
+(source), so they can't be used with another object or in another topology.
+"""
+SHARED_NORMALIZED: typing.Dict[tuple,typing.Any] = {}
+SHARED_CHECKS: typing.Dict[tuple,typing.Any] = {}
+SHARED_TRANSFORMS: typing.Dict[tuple,dict] = {}
+
+def reset_shared_objects() -> None:
+  SHARED_NORMALIZED.clear()
+  SHARED_CHECKS.clear()
+  SHARED_TRANSFORMS.clear()
+
+"""
+get_global_object: return the global routing object or None if it does not exist
+"""
+def get_global_object(pname: str, o_name: str, topology: Box) -> typing.Any:
+  t_routing = topology.get('routing',None)                  # Avoid the (slow) dotted Box lookups
+  if not t_routing or o_name not in t_routing:
+    return None
+
+  return t_routing[o_name].get(pname,None)
+
+"""
+is_shared_object: check whether the node object is the global routing object
+"""
+def is_shared_object(pname: str, o_name: str, node: Box, topology: Box) -> bool:
+  t_obj = get_global_object(pname,o_name,topology)
+  return t_obj is not None and node.routing[o_name].get(pname,None) is t_obj
+
+"""
+get_shared_transform: return the transformation results for a global routing object
+(or None if the global object has not been transformed yet)
+"""
+def get_shared_transform(pname: str, o_name: str, topology: Box) -> typing.Optional[dict]:
+  entry = SHARED_TRANSFORMS.get((o_name,pname),None)
+  if entry is None or entry['source'] is not get_global_object(pname,o_name,topology):
+    return None
+
+  return entry
+
+"""
+is_transformed_shared_object: check whether the node uses the results of a shared object transformation
+
+We can't use object identity checks as Box makes a copy of a dictionary assigned to a Box key,
+so we have to track the nodes that received the transformation results
+"""
+def is_transformed_shared_object(pname: str, o_name: str, node: Box, topology: Box) -> bool:
+  entry = get_shared_transform(pname,o_name,topology)
+  return entry is not None and node.name in entry['nodes']
+
+"""
+copy_routing_object: create a private copy of routing object entries
+"""
+def copy_routing_object(o_data: list) -> list:
+  return [ get_box(pe) if isinstance(pe,Box) else pe for pe in o_data ]
+
+"""
+normalize_imported_object: normalize an imported routing object (once for shared objects)
+"""
+def normalize_imported_object(pname: str, o_name: str, o_data: list, node: Box, topology: Box) -> None:
+  global normalize_dispatch
+
+  if o_name not in normalize_dispatch:
+    return
+
+  if is_shared_object(pname,o_name,node,topology):
+    if SHARED_NORMALIZED.get((o_name,pname),None) is o_data:
+      return
+    SHARED_NORMALIZED[(o_name,pname)] = o_data
+
+  normalize_routing_object(o_data,normalize_dispatch[o_name]['callback'])
+
+"""
+check_imported_object: execute the device check for an imported routing object. Cache the
+successful results for shared objects (errors have to be reported for every node)
+"""
+def check_imported_object(check: typing.Callable, pname: str, o_name: str, node: Box, topology: Box) -> bool:
+  if not is_shared_object(pname,o_name,node,topology) and \
+     not is_transformed_shared_object(pname,o_name,node,topology):
+    return check(pname,o_name,node,topology)
+
+  t_obj = get_global_object(pname,o_name,topology)
+  c_key = (o_name,pname,node.device,devices.get_provider(node,topology.defaults))
+  if SHARED_CHECKS.get(c_key,None) is t_obj:
+    return True
+
+  OK = check(pname,o_name,node,topology)
+  if OK:
+    SHARED_CHECKS[c_key] = t_obj
+
+  return OK
+
+"""
+transform_imported_object: transform a node routing object, reusing the transformation results
+for shared objects that have no node-specific transformation results
+"""
+def transform_imported_object(pname: str, o_name: str, node: Box, topology: Box) -> typing.Optional[list]:
+  global transform_dispatch
+
+  t_data = transform_dispatch[o_name]
+  if is_transformed_shared_object(pname,o_name,node,topology):
+    return None                                             # Already done, nothing to do
+
+  if not 'shared' in t_data or not is_shared_object(pname,o_name,node,topology):
+    return t_data['import'](pname,o_name,node,topology)     # Node-specific transformation or private object
+
+  entry = get_shared_transform(pname,o_name,topology)
+  if entry is not None:                                     # Someone already did the hard work
+    for r_path,r_value in entry['results'].items():         # ... copy the references to the results
+      r_parent = node.routing
+      for k in r_path:
+        r_parent = r_parent[k]
+      r_parent[pname] = r_value
+    entry['nodes'].add(node.name)
+    return None
+
+  t_obj = get_global_object(pname,o_name,topology)
+  node.routing[o_name][pname] = copy_routing_object(t_obj)  # Transform a private copy of the global object
+  err_count = log.get_error_count()
+  t_data['import'](pname,o_name,node,topology)
+  if log.get_error_count() != err_count:                    # Don't cache transformations that generated errors
+    return None
+
+  results = {}
+  for r_path in t_data['shared']:                           # Collect the transformation results
+    r_parent = node.routing
+    for k in r_path:
+      r_parent = r_parent[k]
+    results[r_path] = r_parent[pname]
+
+  SHARED_TRANSFORMS[(o_name,pname)] = {
+    'source': t_obj,
+    'nodes': { node.name },
+    'results': results }
+  return None
+
 """
 Import/merge a single global routing object into node routing object table
 
@@ -238,6 +388,10 @@ def import_routing_object(pname: str,o_name: str,node: Box,topology: Box) -> typ
   if pname not in topo_pdata:                               # Is there anything to merge?
     return None                                             # Nope, exit
 
+  if node.routing[o_name][pname] is topo_pdata[pname] or \
+     is_transformed_shared_object(pname,o_name,node,topology):
+    return None                                             # Global object has already been imported
+
   np_data = node.routing[o_name][pname]                     # Prepare for merge: get node- and global entries
   tp_data = topo_pdata[pname]
   sqlist  = [ pe.sequence for pe in np_data ]               # Get the list of sequence numbers from the local policy
@@ -249,6 +403,8 @@ def import_routing_object(pname: str,o_name: str,node: Box,topology: Box) -> typ
   if not tp_add:                                            # Nothing to add, get out
     return None
 
+  tp_add  = copy_routing_object(tp_add)                     # Merged entries become private node data
+
   np_data = sorted(np_data + tp_add, key= lambda x: x.sequence)
   node.routing[o_name][pname] = np_data
   return np_data
@@ -273,14 +429,14 @@ def import_policy_filters(pname: str, o_name: str, node: Box, topology: Box) ->
     for kw in match_object_map.keys():                      # Iterate over match keywords
       if kw in p_entry.match:                               # A filter is used in the route-map ==> import it
         r_object = match_object_map[kw]
-        f_import = import_routing_object(p_entry.match[kw],r_object,node,topology)
+        f_name = p_entry.match[kw]
+        f_import = import_routing_object(f_name,r_object,node,topology)
         if f_import:                                        # If we imported any new data...
-          if r_object in normalize_dispatch:                # ... normalize the filter entries
-            normalize_routing_object(f_import,normalize_dispatch[r_object]['callback'])
+          normalize_imported_object(f_name,r_object,f_import,node,topology)
           if r_object in import_dispatch and 'check' in import_dispatch[r_object]:
-            import_dispatch[r_object]['check'](p_entry.match[kw],r_object,node,topology)
+            check_imported_object(import_dispatch[r_object]['check'],f_name,r_object,node,topology)
           if r_object in transform_dispatch:                # ... and transform the filter into its final form
-            transform_dispatch[r_object]['import'](p_entry.match[kw],r_object,node,topology)
+            transform_imported_object(f_name,r_object,node,topology)
 
 """
 Import/merge a single global routing policy into node routing policy table
@@ -328,10 +484,13 @@ def process_routing_data(node: Box,o_type: str, topology: Box, dispatch: dict, a
     return
 
   for p_name in list(node_pdata.keys()):
-    o_import = dispatch[o_type]['import'](p_name,o_type,node,topology)
+    if dispatch is transform_dispatch:                # Transformations of shared objects are done only once
+      o_import = transform_imported_object(p_name,o_type,node,topology)
+    else:
+      o_import = dispatch[o_type]['import'](p_name,o_type,node,topology)
     if o_import is not None or always_check:
       if 'check' in dispatch[o_type]:
-        dispatch[o_type]['check'](p_name,o_type,node,topology)
+        check_imported_object(dispatch[o_type]['check'],p_name,o_type,node,topology)
     if 'related' in dispatch[o_type]:
       dispatch[o_type]['related'](p_name,o_type,node,topology)
 
@@ -537,22 +696,29 @@ def expand_community_list(p_name: str,o_name: str,node: Box,topology: Box) -> ty
 """
 Dispatch table for post-transform processing. Currently used only to
 expand the prefixes/pools in prefix list.
+
+The 'shared' element lists the node.routing paths (within which the object name is used as
+the key) that contain the results of a transformation that does not depend on node data. The
+results of such transformations are shared between nodes using the same global object.
 """
 transform_dispatch: typing.Dict[str,dict] = {
   'prefix': {
-    'import': expand_prefix_list
+    'import': expand_prefix_list,
+    'shared': [ ('prefix',), ('_prefix','ipv4'), ('_prefix','ipv6') ]
   },
   'aspath': {
     'import': number_aspath_acl
   },
   'community': {
-    'import': expand_community_list
+    'import': expand_community_list,
+    'shared': [ ('community',) ]
   }
 }
 
 class Routing(_Module):
 
   def module_pre_default(self, topology: Box) -> None:
+    reset_shared_objects()
     topology.prefix = topology.defaults.prefix + topology.prefix
     normalize_routing_data(topology,topo_object=True)
 
@@ -646,6 +646,44 @@ get_vlan_mode: Get VLAN mode attribute (node or topology), default 'irb'
 def get_vlan_mode(node: Box, topology: Box) -> str:
   return node.get('vlan.mode',None) or topology.get('vlan.mode',None) or 'irb'
 
+"""
+VLAN neighbor index: maps VLAN data (global or node VLAN) into a 'node name -> neighbor
+entry' dictionary, so we don't have to rebuild the map from the VLAN neighbor list for
+every access interface attached to the VLAN.
+
+The index entries keep a reference to the VLAN data (so the id() of VLAN data cannot
+be reused) and the neighbor list length. The map is rebuilt if someone else modified
+the VLAN neighbor list.
+"""
+VLAN_NEIGHBOR_INDEX: typing.Dict[int,dict] = {}
+
+def reset_vlan_neighbor_index() -> None:
+  VLAN_NEIGHBOR_INDEX.clear()
+
+def get_vlan_neighbor_map(vlan_data: Box) -> dict:
+  neighbors = vlan_data.neighbors
+  entry = VLAN_NEIGHBOR_INDEX.get(id(vlan_data),None)
+  if entry is None or entry['vlan'] is not vlan_data or \
+      entry['neighbors'] is not neighbors or entry['count'] != len(neighbors):
+    entry = {
+      'vlan': vlan_data,
+      'neighbors': neighbors,
+      'count': len(neighbors),
+      'map': { n_data.node: n_data for n_data in neighbors } }
+    VLAN_NEIGHBOR_INDEX[id(vlan_data)] = entry
+
+  return entry['map']
+
+def add_vlan_neighbors(vlan_data: Box, n_list: list) -> None:
+  if not n_list:
+    return
+
+  n_map = get_vlan_neighbor_map(vlan_data)
+  vlan_data.neighbors.extend(n_list)
+  for n_data in vlan_data.neighbors[-len(n_list):]:                     # Use list elements (BoxList might have converted them)
+    n_map[n_data.node] = n_data                                         # ... later entries override earlier ones
+  VLAN_NEIGHBOR_INDEX[id(vlan_data)]['count'] = len(vlan_data.neighbors)
+
 """
 update_vlan_neighbor_list: Build a VLAN-wide list of neighbors
 """
@@ -657,11 +695,12 @@ def update_vlan_neighbor_list(vlan: str, phy_if: Box, svi_if: Box, node: Box,top
   if not 'neighbors' in vlan_data:
     vlan_data.neighbors = []
 
-  n_map = { data.node: data for data in vlan_data.neighbors }           # Build a list of known VLAN neighbors
+  n_map = get_vlan_neighbor_map(vlan_data)                              # Get the map of known VLAN neighbors
+  node_known = node.name in n_map                                       # ... check whether we know the current node
   phy_n_list = phy_if.get('neighbors',[])                               # ... add interface neighbors not yet in the list
-  vlan_data.neighbors.extend([n_data for n_data in phy_n_list if n_data.node not in n_map])
+  add_vlan_neighbors(vlan_data,[n_data for n_data in phy_n_list if n_data.node not in n_map])
 
-  if node.name in n_map:                                                # Is the current node in the list?
+  if node_known:                                                        # Is the current node in the list?
     n_map[node.name].ifname = svi_if.ifname                             # ... it is, fix the interface name
     for af in ('ipv4','ipv6'):
       if af in svi_if:
@@ -669,25 +708,20 @@ def update_vlan_neighbor_list(vlan: str, phy_if: Box, svi_if: Box, node: Box,top
       else:
         n_map[node.name].pop(af,None)
   else:
-    n_data = data.get_box({
-               'ifname': svi_if.ifname,
-               'node': node.name })                                     # ... not yet, create neighbor data
+    n_data = data.CompactData(
+               ifname=svi_if.ifname,
+               node=node.name)                                          # ... not yet, create neighbor data
     for af in ('ipv4','ipv6'):
       if af in svi_if:                                                  # ... copy SVI interface addresses to neighbor data
         n_data[af] = svi_if[af]
-    vlan_data.neighbors.append(n_data)                                  # Add current node as a neighbor to VLAN neighbor list
+    add_vlan_neighbors(vlan_data,[n_data])                              # Add current node as a neighbor to VLAN neighbor list
 
 """
 create_node_vlan: Create a local (node) copy of a VLAN used on an interface
 """
 def create_node_vlan(node: Box, vlan: str, topology: Box) -> typing.Optional[Box]:
-  if vlan in topology.get('vlans',{}):
-    vlan_data = data.get_box(topology.vlans[vlan])                  # Get a copy of global VLAN definition
-  else:
-    vlan_data = data.get_empty_box()
-
   if not vlan in node.vlans:                                        # Do we have VLAN defined in the node?
-    if not vlan_data:                                               # pragma: no cover -- we don't have a global definition?
+    if not topology.get('vlans',{}).get(vlan,None):                 # pragma: no cover -- we don't have a global definition?
       log.fatal(                                                    # ... this should have been detected way earlier
         f'Unknown VLAN {vlan} used on node {node.name}','vlan')
       return None
@@ -1014,14 +1048,12 @@ def check_mixed_trunks(node: Box, topology: Box) -> None:
     if not intf.get('parent_ifindex') or intf.type != 'vlan_member':  # Skip everything that is not a VLAN subinterface
       continue
 
-    parent_intf_list = [ x for x in node.interfaces if x.ifindex == intf.parent_ifindex ]
-    if not parent_intf_list:
+    parent_intf = links.get_node_interface(node,intf.parent_ifindex)
+    if parent_intf is None:
       log.fatal(f'Internal error: cannot find parent interface for {intf} in node {node.name}')
       return
 
-    parent_intf = parent_intf_list[0]
-    if parent_intf is None \
-         or parent_intf.get('vlan.trunk_id',None) is None:            # No VLAN trunk left on the parent interface?
+    if parent_intf.get('vlan.trunk_id',None) is None:                 # No VLAN trunk left on the parent interface?
       continue                                                        # ... cool, we're done
 
     if not parent_intf.ifindex in err_ifmap:                          # We have a problem. Do we have to generate an error?
@@ -1068,8 +1100,9 @@ We have to do a two-step process because the first-hop gateway is not applied co
 VLAN (because a VLAN is modeled as a number of link).
 """
 def fix_vlan_gateways(topology: Box) -> None:
-  for node in topology.nodes.values():
-    if node.get('role') != 'host':                                    # Fix first-hop gateways only for hosts
+  host_nodes = { name for name,ndata in topology.nodes.items() if ndata.get('role') == 'host' }
+  for name,node in topology.nodes.items():
+    if name not in host_nodes:                                        # Fix first-hop gateways only for hosts
       continue
     for intf in node.get('interfaces',[]):                            # Iterate over all interfaces
       if intf.get('gateway.ipv4',None):                               # ... that don't have an IPv4 gateway
@@ -1077,13 +1110,11 @@ def fix_vlan_gateways(topology: Box) -> None:
 
       gw_found = False
       for neighbor in intf.get('neighbors',[]):                       # Iterate over all neighbors trying to find first-hop gateway
+        if neighbor.node in host_nodes:                               # Check whether the neighbor is a host
+          continue                                                    # ... don't trust gateway information coming from another host
         if not neighbor.get('gateway.ipv4',None):                     # ... does the neighbor have first-hop gateway set?
           continue                                                    # ... nope, keep going
 
-        n_node = topology.nodes[neighbor.node]
-        if n_node.get('role') == 'host':                              # Check whether the neighbor is a host
-          continue                                                    # ... don't trust gateway information coming from another host
-
         gw_found = True                                               # Found a first-hop gateway on a non-host. Mission Accomplished
         intf.gateway.ipv4 = neighbor.gateway.ipv4                     # ... copy it and get out of here
         break
@@ -1095,8 +1126,7 @@ def fix_vlan_gateways(topology: Box) -> None:
         if not neighbor.get('ipv4',False):                            # Does the neighbor have a usable IPv4 address?
           continue                                                    # ... nope, move on
 
-        n_node = topology.nodes[neighbor.node]
-        if n_node.get('role') != 'host':                              # Use the neighbor IPv4 address only if it's not another host
+        if neighbor.node not in host_nodes:                           # Use the neighbor IPv4 address only if it's not another host
           intf.gateway.ipv4 = neighbor.ipv4                           # Set that address as our gateway
           break                                                       # ... and get out of here
 
@@ -1303,6 +1333,7 @@ class VLAN(_Module):
           intf[attr] = vdata[attr]
 
   def module_post_link_transform(self, topology: Box) -> None:
+    reset_vlan_neighbor_index()
     for n in topology.nodes.values():
       if 'vlan' in n.get('module',[]):
         populate_node_vlan_data(n,topology)
@@ -1318,5 +1349,6 @@ class VLAN(_Module):
 
     topology.links = [ link for link in topology.links if link.type != 'vlan_member' ]
 
+    reset_vlan_neighbor_index()
     cleanup_vlan_flags(topology)
     fix_vlan_gateways(topology)
@@ -82,15 +82,13 @@ def parse_rdrt_value(value: str) -> typing.Optional[typing.List[typing.Union[int
 
 def get_next_vrf_id(asn: str) -> typing.Tuple[int,str]:
   rd_set = _dataplane.get_id_set('vrf_rd')
-  id_set = _dataplane.get_id_set('vrf_rd')
   while True:
-    vrf_id = _dataplane.get_next_id('vrf_id')
+    vrf_id = _dataplane.get_next_id('vrf_id')                 # get_next_id also marks the VRF ID as used
     if not f'{asn}:{vrf_id}' in rd_set:
       break
 
   rd = f'{asn}:{vrf_id}'
   rd_set.add(rd)
-  id_set.add(vrf_id)
   return (vrf_id,rd)
 
 #
@@ -136,19 +136,29 @@ def node_set_vtep(node: Box, topology: Box) -> bool:
   return True
 
 #
-# Build VLAN-specific VTEP list
+# Build VNI-to-VTEP index for a VXLAN flooding domain
+#
+# The index maps every VNI used in the flooding domain into the list of nodes
+# using that VNI (in the order of nodes in the flooding domain), allowing us to
+# build VLAN-specific VTEP lists without scanning all VLANs on all other nodes.
 #
-def build_vtep_list(vlan: Box, node: str, nodes: typing.List[str], topology: Box) -> list:
-  vlan.vtep_list = []                                               # Start with an emtpy VTEP list
+def build_vni_index(nodes: typing.List[str], topology: Box) -> typing.Dict[typing.Any,typing.List[str]]:
+  vni_index: typing.Dict[typing.Any,typing.List[str]] = {}
   for n in nodes:
-    if n == node:                                                   # Skip own node
-      continue
     ndata = topology.nodes[n]
-    if not 'vlans' in ndata:                                        # No VLANs on remote node, skip it
+    if not 'vlans' in ndata:                                        # No VLANs on this node, skip it
       continue
-    vni_match = filter(lambda x: x.vni == vlan.vni,ndata.vlans.values())
-    if list(vni_match):                                             # Is there a VLAN with matching VNI on remote node?
-      vlan.vtep_list.append(ndata.vxlan.vtep)                       # ... if so, add remote VTEP to VLAN flood list
+    for vni in { vdata.vni for vdata in ndata.vlans.values() if 'vni' in vdata }:
+      vni_index.setdefault(vni,[]).append(n)                        # Add node to the list of nodes using this VNI
+
+  return vni_index
+
+#
+# Build VLAN-specific VTEP list
+#
+def build_vtep_list(vlan: Box, node: str, vni_index: typing.Dict[typing.Any,typing.List[str]], topology: Box) -> list:
+  vlan.vtep_list = [                                                # Remote VTEPs using the same VNI
+    topology.nodes[n].vxlan.vtep for n in vni_index.get(vlan.vni,[]) if n != node ]
 
   return_value = vlan.vtep_list                                     # We'll return whatever we built
   if not vlan.vtep_list:                                            # ... but will remove empty VTEP list from VLAN data
@@ -227,6 +237,7 @@ class VXLAN(_Module):
       vxlan_domain_list[vxlan_domain].append(name)                  # Add current node to VXLAN domain list
 
     for domain,nodes in vxlan_domain_list.items():                  # Iterate over VXLAN flooding domains
+      vni_index = build_vni_index(nodes,topology)                   # Build the VNI-to-VTEP index for the domain
       for node in nodes:                                            # ... and over all nodes in each domain
         ndata = topology.nodes[node]
         if ndata.vxlan.get('flooding') != 'static':                 # Skip nodes that are not using static replication lists
@@ -235,7 +246,7 @@ class VXLAN(_Module):
         vtep_set = set()
         for vlan in ndata.vlans.values():                           # Iterate over all VLANs defined in current node
           if 'vni' in vlan:                                         # Are we dealing with VXLAN-enabled VLAN?
-            vtep_list = build_vtep_list(vlan,node,nodes,topology)   # Build VLAN-specific VTEP list
+            vtep_list = build_vtep_list(vlan,node,vni_index,topology)   # Build VLAN-specific VTEP list
             vtep_set.update(vtep_list)                              # ... and add it to node-level VTEP set
 
         ndata.vxlan.vtep_list = sorted(list(vtep_set))              # Convert node-level VTEP set into a list
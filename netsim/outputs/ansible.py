@@ -5,6 +5,10 @@ import typing
 
 import yaml
 import os
+import sys
+import stat
+import hashlib
+import concurrent.futures
 from box import Box
 import netaddr
 
@@ -14,7 +18,7 @@ from ..augment import devices
 from ..augment import plugin
 from ..utils import templates,strings,log
 from ..utils import files as _files
-from ..data import global_vars,append_to_list
+from ..data import global_vars,append_to_list,get_empty_box
 
 forwarded_port_name = { 'ssh': 'ansible_port', }
 
@@ -207,17 +211,62 @@ def dump(data: Box) -> None:
   inventory = create(data)
   print(strings.get_yaml_string(inventory))
 
-def write_yaml(data: Box, fname: str, header: str) -> None:
+def write_yaml(data: Box, fname: str, header: str) -> bool:
   dirname = os.path.dirname(fname)
   if dirname and not os.path.exists(dirname):
     os.makedirs(dirname)
 
-  _files.create_file_from_text(fname,header+"\n"+strings.get_yaml_string(data))
+  return _files.create_file_if_changed(fname,header+"\n"+strings.get_yaml_string(data))
+
+"""
+Create YAML text from a (picklable) dictionary. Used by worker processes
+"""
+def get_inventory_yaml(data: dict) -> str:
+  return strings.get_yaml_string(data)
+
+"""
+Write host_vars and group_vars files
+
+* Serialize the data into YAML text in a pool of worker processes when there are
+  enough files to make it worthwhile (serialization is CPU-bound, threads wouldn't help)
+* Don't touch the files that would not change
+"""
+def write_inventory_files(file_list: typing.List[typing.Tuple[str,str,Box]], topology: Box, header: str) -> None:
+  settings = topology.defaults.automation.ansible.inventory
+  workers = min(settings.get('workers',1) or 1,os.cpu_count() or 1)
+  yaml_text: typing.Optional[typing.List[str]] = None
+
+  if workers > 1 and len(file_list) >= (settings.get('parallel',0) or 0):
+    try:
+      with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        yaml_text = list(executor.map(
+                      get_inventory_yaml,
+                      [ data.to_dict() for (_,_,data) in file_list ],
+                      chunksize=max(1,len(file_list) // (workers * 4))))
+    except Exception as ex:                                 # Cannot use worker processes, do it the slow way
+      if log.VERBOSE:
+        print(f'Cannot use worker processes to create Ansible inventory: {ex}')
+      yaml_text = None
+
+  if yaml_text is None:
+    yaml_text = [ strings.get_yaml_string(data) for (_,_,data) in file_list ]
+
+  for (kind,name,_),text in zip(file_list,yaml_text):
+    fname = f'{kind}/{name}/topology.yml'
+    dirname = os.path.dirname(fname)
+    if not os.path.exists(dirname):
+      os.makedirs(dirname)
+
+    changed = _files.create_file_if_changed(fname,header+"\n"+text)
+    if not log.QUIET:
+      strings.print_colored_text(
+        '[GROUPS]  ' if kind == 'group_vars' else '[HOSTS]   ','bright_cyan','Created ' if changed else 'Kept ')
+      print(f"{kind} for {name}{'' if changed else ' (unchanged)'}")
 
 min_inventory_data = [ 'id','ansible_host','ansible_port','ansible_connection','ansible_user','ansible_ssh_pass' ]
 
 def ansible_inventory(topology: Box, fname: typing.Optional[str] = 'hosts.yml', hostvars: typing.Optional[str] = 'dirs') -> None:
-  inventory = create(topology)
+  inventory = create(topology) if hostvars != 'dynamic' else get_empty_box()
 
 #  import ipdb; ipdb.set_trace()
   header = "# Ansible inventory created from %s\n#\n" % topology.get('input','<unknown>')
@@ -227,19 +276,21 @@ def ansible_inventory(topology: Box, fname: typing.Optional[str] = 'hosts.yml',
   if not hostvars:
     hostvars = "dirs"
 
+  if hostvars == "dynamic":
+    write_dynamic_inventory(topology,fname)
+    return
+
   if hostvars == "min":
     write_yaml(inventory,fname,header)
     log.status_created()
     print(f"single-file Ansible inventory {fname}")
     return
 
+  file_list: typing.List[typing.Tuple[str,str,Box]] = []
   for g in inventory.keys():
     gvars = inventory[g].pop('vars',None)
     if gvars:
-      write_yaml(gvars,'group_vars/%s/topology.yml' % g,header)
-      if not log.QUIET:
-        strings.print_colored_text('[GROUPS]  ','bright_cyan','Created ')
-        print(f"group_vars for {g}")
+      file_list.append(('group_vars',g,gvars))
 
     if 'hosts' in inventory[g]:
       hosts = inventory[g]['hosts']
@@ -254,16 +305,86 @@ def ansible_inventory(topology: Box, fname: typing.Optional[str] = 'hosts.yml',
           else:
             vars_host[item] = hosts[h][item]
 
-        write_yaml(vars_host,'host_vars/%s/topology.yml' % h,header)
-        if not log.QUIET:
-          strings.print_colored_text('[HOSTS]   ','bright_cyan','Created ')
-          print(f"host_vars for {h}")
+        file_list.append(('host_vars',h,vars_host))
         hosts[h] = min_host
 
+  write_inventory_files(file_list,topology,header)
   write_yaml(inventory,fname,header)
   log.status_created()
   print(f"minimized Ansible inventory {fname}")
 
+"""
+Convert the netlab inventory into the JSON data structure expected from an Ansible
+dynamic inventory. The host variables are returned in _meta.hostvars, so Ansible
+does not have to call the inventory script once per host.
+"""
+def get_dynamic_inventory(inventory: Box) -> dict:
+  hostvars: dict = {}
+  result: dict = { '_meta': { 'hostvars': hostvars }}
+
+  for gname,gdata in inventory.items():
+    group: dict = {}
+    if gdata.get('hosts',None):
+      group['hosts'] = list(gdata.hosts.keys())
+      for hname,hdata in gdata.hosts.items():
+        if hdata:
+          hostvars[hname] = hdata.to_dict()
+    if gdata.get('vars',None):
+      group['vars'] = gdata.vars.to_dict()
+    if gdata.get('children',None):
+      group['children'] = list(gdata.children.keys())
+    result[gname] = group
+
+  return result
+
+"""
+Build the dynamic inventory data from a netlab snapshot. Called from the
+dynamic inventory script when its cache is stale.
+"""
+def dynamic_inventory(snapshot: str) -> dict:
+  from ..utils import read as _read
+
+  topology = _read.read_yaml(filename=snapshot)
+  if topology is None:
+    log.fatal(f'Cannot read netlab snapshot {snapshot}','ansible')
+    return {}
+
+  global_vars.init(topology)
+  return get_dynamic_inventory(create(nodes.ghost_buster(topology)))
+
+"""
+Create the dynamic inventory script. The script uses the current Python interpreter
+and netlab package, and caches the inventory data in the netlab cache directory
+"""
+def write_dynamic_inventory(topology: Box, fname: str, snapshot: str = 'netlab.snapshot.yml') -> None:
+  cache_dir = _files.get_cachedir()
+  cache_file = ''
+  if cache_dir:
+    lab_dir = os.path.dirname(os.path.abspath(fname))
+    cache_file = str(cache_dir / f'inventory-{hashlib.sha1(lab_dir.encode()).hexdigest()[:16]}.json')
+
+  try:
+    inv_text = templates.render_template(
+                j2_file='ansible-inventory.py.j2',
+                data={
+                  'python': sys.executable,
+                  'input': (topology.get('input',None) or ['<unknown>'])[0],
+                  'snapshot': snapshot,
+                  'cache_file': cache_file,
+                  'package_path': str(_files.get_moddir().parent) },
+                path='templates',
+                extra_path=_files.get_search_path('ansible'))
+  except Exception as ex:
+    log.fatal(
+      text=f"Error rendering dynamic Ansible inventory\n{strings.extra_data_printout(str(ex))}",
+      module='ansible')
+
+  _files.create_file_if_changed(fname,inv_text)
+  if fname != '-':
+    os.chmod(fname,os.stat(fname).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+  log.status_created()
+  print(f"dynamic Ansible inventory {fname}")
+
 def ansible_config(config_file: typing.Union[str,None] = 'ansible.cfg', inventory_file: typing.Union[str,None] = 'hosts.yml') -> None:
   if not config_file:
     config_file = 'ansible.cfg'
@@ -305,6 +426,8 @@ class AnsibleInventory(_TopologyOutput):
 
     if self.format:
       output_format = self.format[0]
+      if output_format == 'dynamic' and not hasattr(self,'filenames'):
+        hostfile = self.settings.dynamic_hostfile or 'hosts.py'
     
     # Creates a "ghost clean" topology
     # (AKA, remove unmanaged devices)
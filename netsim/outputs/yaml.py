@@ -58,6 +58,10 @@ class YAML(_TopologyOutput):
       r_fmt = 'json'
       r_txt = cleantopo.to_json(indent=2,sort_keys=True)
 
+    if r_fmt == 'yaml' and log.debug_flag_set('memory'):
+      from ..utils import memory
+      memory.print_snapshot_breakdown(r_txt,outfile if outfile != '-' else 'YAML printout')
+
     if outfile != '-':
       output.write(r_txt)
       _files.close_output_file(output)
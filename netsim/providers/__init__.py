@@ -10,16 +10,18 @@ import subprocess
 import os
 import typing
 import pathlib
+import json
+import time
+import concurrent.futures
 
 # Related modules
 from box import Box
 
 from ..utils.callback import Callback
-from ..augment import devices,links
+from ..augment import devices
 from ..data import get_box,get_empty_box,filemaps
 from ..utils import files as _files
-from ..utils import templates,log,strings
-from ..outputs.ansible import get_host_addresses
+from ..utils import log,strings
 
 """
 The generic provider class. Used as a super class of all other providers
@@ -156,6 +158,9 @@ class _Provider(Callback):
     sys_folder = str(_files.get_moddir())+"/"
     out_folder = f"{self.provider}_files/{node.name}"
 
+    from ..utils import templates
+    from ..outputs.ansible import get_host_addresses
+
     bind_dict = filemaps.mapping_to_dict(binds)
     for file,mapping in bind_dict.items():
       if not out_folder in file:                  # Skip files that are not mapped into the temporary provider folder
@@ -185,6 +190,8 @@ class _Provider(Callback):
         log.error(f"Cannot find template for {file_name} on node {node.name}",log.MissingValue,'provider')
 
   def create(self, topology: Box, fname: typing.Optional[str]) -> None:
+    from ..utils import templates
+
     self.transform(topology)
     fname = self.get_output_name(fname,topology)
     tname = self.get_root_template()
@@ -222,12 +229,43 @@ class _Provider(Callback):
   def post_configuration_create(self, topology: Box) -> None:
     pass
 
+  """
+  get_lab_status: return the status of the provider workloads (VMs, containers) running on
+  the current host. Set status_cacheable to False if the status depends on the current
+  directory and thus cannot be shared between lab instances.
+  """
+  status_cacheable: bool = True
+
   def get_lab_status(self) -> Box:
     return get_empty_box()
   
   def get_node_name(self, node: str, topology: Box) -> str:
     return node
 
+  """
+  get_lab_changes: use the lab topology diff (see utils.diff) to find the provider nodes that
+  have to be started (new nodes), stopped (removed nodes) or restarted (nodes with added or
+  removed interfaces, or changed VM/container attributes) to implement the topology changes
+  """
+  restart_attributes: typing.List[str] = [ 'box', 'cpu', 'memory', 'mgmt' ]
+
+  def get_lab_changes(self, diff: Box) -> Box:
+    nodes = diff.get('nodes',{})
+    changes = get_empty_box()
+    changes.start = [ name for name,p_name in nodes.get('added',{}).items() if p_name == self.provider ]
+    changes.stop  = [ name for name,p_name in nodes.get('removed',{}).items() if p_name == self.provider ]
+    changes.restart = []
+    for name,n_diff in nodes.get('changed',{}).items():
+      if n_diff.get('provider',None) != self.provider:
+        continue
+      intf_diff = n_diff.get('interfaces',{})
+      restart_attr = self.restart_attributes + [ self.provider ]
+      if intf_diff.get('added',None) or intf_diff.get('removed',None) or \
+         [ attr for attr in n_diff.get('attributes',[]) if attr in restart_attr ]:
+        changes.restart.append(name)
+
+    return changes
+
   """
   Generic provider pre-transform processing: Mark multi-provider links
   """
@@ -252,6 +290,8 @@ class _Provider(Callback):
   Generic provider pre-output transform: remove loopback links
   """
   def pre_output_transform(self, topology: Box) -> None:
+    from ..augment import links
+
     if not 'links' in topology:
       return
 
@@ -299,6 +339,68 @@ def get_provider_module(topology: Box, pname: str) -> _Provider:
 
   return topology._Providers[pname]
 
+"""
+Get the workload status of a list of providers
+
+* Use the cached status if it's younger than defaults.netlab.status.cache_ttl
+* Query the remaining providers concurrently (get_lab_status is mostly waiting
+  for 'docker ps' or 'virsh list' to complete)
+* Cache the results in the netlab cache directory
+"""
+def get_status_cache_file(pname: str) -> typing.Optional[pathlib.Path]:
+  cache_dir = _files.get_cachedir()
+  return cache_dir / f'status-{pname}.json' if cache_dir else None
+
+def read_cached_status(pname: str, ttl: typing.Union[int,float]) -> typing.Optional[Box]:
+  cache_file = get_status_cache_file(pname)
+  if not ttl or cache_file is None or not cache_file.exists():
+    return None
+
+  try:
+    if time.time() - cache_file.stat().st_mtime > ttl:
+      return None
+    return get_box(json.loads(cache_file.read_text()))
+  except Exception:
+    return None
+
+def write_cached_status(pname: str, status: Box) -> None:
+  cache_file = get_status_cache_file(pname)
+  if cache_file is None:
+    return
+
+  try:
+    tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+    tmp_file.write_text(json.dumps(status.to_dict()))
+    os.replace(tmp_file,cache_file)                 # Atomic replace, concurrent readers see old or new file
+  except Exception:
+    pass
+
+def get_lab_status(topology: Box, p_list: typing.Iterable[str]) -> Box:
+  ttl = topology.defaults.netlab.status.get('cache_ttl',0)
+  p_status = get_empty_box()
+  p_query = []
+
+  for pname in p_list:
+    cached = read_cached_status(pname,ttl)
+    if cached is not None:
+      p_status[pname] = cached
+    elif pname not in p_query:
+      p_query.append(pname)
+
+  if not p_query:
+    return p_status
+
+  p_modules = { pname: get_provider_module(topology,pname) for pname in p_query }
+  workers = topology.defaults.netlab.status.get('workers',1) or 1
+  with concurrent.futures.ThreadPoolExecutor(max_workers=min(workers,len(p_query))) as executor:
+    futures = { pname: executor.submit(p_module.call,'get_lab_status') for pname,p_module in p_modules.items() }
+    for pname,future in futures.items():
+      p_status[pname] = future.result() or get_empty_box()
+      if ttl and p_modules[pname].status_cacheable:
+        write_cached_status(pname,p_status[pname])
+
+  return p_status
+
 """
 Execute a topology-wide provider hook
 """
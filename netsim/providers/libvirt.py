@@ -334,7 +334,39 @@ class Libvirt(_Provider):
 
       log.print_verbose(f"... setting LLDP enabled flag on {linux_bridge}")
 
+  """
+  get_lab_status: get the state of libvirt domains with 'virsh list', which is much
+  faster than 'vagrant status' and does not depend on the current directory. Fall back
+  to 'vagrant status' if we cannot run virsh.
+  """
   def get_lab_status(self) -> Box:
+    stat_box = self.get_virsh_status()
+    if stat_box is not None:
+      self.status_cacheable = True
+      return stat_box
+
+    self.status_cacheable = False
+    return self.get_vagrant_status()
+
+  def get_virsh_status(self) -> typing.Optional[Box]:
+    status = external_commands.run_command(
+                ['virsh','--connect','qemu:///system','list','--all'],
+                check_result=True,
+                ignore_errors=True,
+                return_stdout=True,
+                run_always=True)
+    if not isinstance(status,str):
+      return None
+
+    stat_box = get_empty_box()
+    for line in status.split('\n')[2:]:                     # Skip the heading and the separator line
+      items = line.split(None,2)                            # Id, Name, State (state could contain spaces)
+      if len(items) == 3:
+        stat_box[items[1]].status = items[2]
+
+    return stat_box
+
+  def get_vagrant_status(self) -> Box:
     try:
       status = external_commands.run_command(
                   'vagrant status --machine-readable',
@@ -0,0 +1,236 @@
+#
+# Structural diff of transformed lab topologies
+#
+# Compares the previous transformed topology (netlab.snapshot.yml) with the new one,
+# and reports the changes per node (node attributes, modules, interfaces), per link,
+# and in the other top-level topology elements. The diff is used to reconfigure only
+# the affected nodes and modules (netlab initial --changed) and to find the nodes a
+# virtualization provider would have to start, stop or restart.
+#
+# The diff is a dictionary with these (optional) elements:
+#
+# nodes:
+#   added: { node: provider }
+#   removed: { node: provider }
+#   changed:
+#     node:
+#       provider: provider
+#       attributes: [ changed node attributes ]
+#       modules: [ modules with changed node- or interface data ]
+#       interfaces:
+#         added: [ ifname ]
+#         removed: [ ifname ]
+#         changed: { ifname: [ changed interface attributes ] }
+# links:
+#   added: [ link ]
+#   removed: [ link ]
+#   changed: { link: [ changed link attributes ] }
+# topology: [ changed top-level topology elements ]
+#
+# Links are identified by the sorted list of node:ifname link endpoints
+#
+import typing
+import os
+
+from box import Box
+
+from .. import data
+from . import log
+
+DIFF_FILE: typing.Final[str] = 'netlab.diff.yml'
+
+NODE_SKIP_ATTR: typing.Final[list] = [ 'interfaces' ]
+TOPOLOGY_SKIP_ATTR: typing.Final[list] = [ 'nodes', 'links', 'addressing', 'input', 'Plugin', 'defaults' ]
+DEFAULTS_SKIP_ATTR: typing.Final[list] = [ 'outputs' ]
+
+"""
+same_data: compare two data structures, ignoring internal (underscore) dictionary keys.
+
+The new topology is compared with a snapshot read from a YAML file; internal data
+structures (for example, ID sets in _globals) don't survive the YAML round trip, but
+they are not relevant for the lab configuration anyway.
+"""
+def same_data(old: typing.Any, new: typing.Any) -> bool:
+  if old == new:                                            # Fast path: identical data
+    return True
+
+  if isinstance(old,dict) and isinstance(new,dict):
+    keys = [ k for k in dict.fromkeys(list(old.keys()) + list(new.keys())) if not str(k).startswith('_') ]
+    return all(same_data(old.get(k,None),new.get(k,None)) for k in keys)
+
+  if isinstance(old,list) and isinstance(new,list):
+    return len(old) == len(new) and all(same_data(o_value,n_value) for o_value,n_value in zip(old,new))
+
+  return False
+
+"""
+changed_keys: return the keys of two dictionaries that have different values (or
+are present in just one of them), keeping the key order of the new dictionary
+"""
+def changed_keys(old: dict, new: dict, skip: typing.Collection = ()) -> list:
+  keys = list(new.keys()) + [ k for k in old.keys() if k not in new ]
+  return [ k for k in keys
+             if k not in skip and not str(k).startswith('_') and not same_data(old.get(k,None),new.get(k,None)) ]
+
+def node_provider(node: dict, topology: dict) -> str:
+  return node.get('provider',None) or topology.get('provider','')
+
+def link_key(link: dict) -> str:
+  ends = sorted(f'{intf.get("node","")}:{intf.get("ifname","")}' for intf in link.get('interfaces',[]))
+  return '-'.join(ends)
+
+def interface_diff(old: list, new: list) -> Box:
+  old_intf = { intf.get('ifname',''): intf for intf in old }
+  new_intf = { intf.get('ifname',''): intf for intf in new }
+  result = data.get_empty_box()
+
+  added = [ ifname for ifname in new_intf if ifname not in old_intf ]
+  removed = [ ifname for ifname in old_intf if ifname not in new_intf ]
+  if added:
+    result.added = added
+  if removed:
+    result.removed = removed
+
+  for ifname,intf in new_intf.items():
+    if ifname in old_intf and not same_data(old_intf[ifname],intf):
+      result.changed[ifname] = changed_keys(old_intf[ifname],intf)
+
+  return result
+
+"""
+node_diff: compare old and new node data. Module data is compared separately from
+the other node attributes; interface attributes named after node modules (for example,
+ospf.cost) are reported as module changes, too.
+"""
+def node_diff(old: dict, new: dict, provider: str) -> Box:
+  result = data.get_empty_box()
+  modules = list(new.get('module',[])) + [ m for m in old.get('module',[]) if m not in new.get('module',[]) ]
+
+  attributes = changed_keys(old,new,skip=NODE_SKIP_ATTR + modules)
+  if attributes:
+    result.attributes = attributes
+
+  chg_modules = [ m for m in modules if not same_data(old.get(m,None),new.get(m,None)) ]
+  if not same_data(old.get('interfaces',[]),new.get('interfaces',[])):
+    intf_diff = interface_diff(old.get('interfaces',[]),new.get('interfaces',[]))
+    result.interfaces = intf_diff
+    for intf_attr in intf_diff.get('changed',{}).values():
+      chg_modules.extend([ m for m in intf_attr if m in modules and m not in chg_modules ])
+
+  if chg_modules:
+    result.modules = chg_modules
+
+  if result:
+    result.provider = provider
+
+  return result
+
+"""
+topology_diff: compare two transformed topologies (usually the previous snapshot and
+the new transformed topology). Returns an empty Box if the topologies are equivalent.
+
+Output module settings (defaults.outputs) are ignored: they don't change the lab configuration,
+and the output modules executed after the snapshot has been written add their settings to them.
+"""
+def topology_diff(old: dict, new: dict) -> Box:
+  result = data.get_empty_box()
+
+  old_nodes = old.get('nodes',{})
+  new_nodes = new.get('nodes',{})
+  for name,node in new_nodes.items():
+    provider = node_provider(node,new)
+    if not name in old_nodes:
+      result.nodes.added[name] = provider
+    elif not same_data(old_nodes[name],node):
+      n_diff = node_diff(old_nodes[name],node,provider)
+      if n_diff:
+        result.nodes.changed[name] = n_diff
+
+  for name,node in old_nodes.items():
+    if not name in new_nodes:
+      result.nodes.removed[name] = node_provider(node,old)
+
+  old_links = { link_key(link): link for link in old.get('links',[]) }
+  new_links = { link_key(link): link for link in new.get('links',[]) }
+  added = [ key for key in new_links if key not in old_links ]
+  removed = [ key for key in old_links if key not in new_links ]
+  if added:
+    result.links.added = added
+  if removed:
+    result.links.removed = removed
+  for key,link in new_links.items():
+    if key in old_links and not same_data(old_links[key],link):
+      result.links.changed[key] = changed_keys(old_links[key],link)
+
+  topo_changes = changed_keys(old,new,skip=TOPOLOGY_SKIP_ATTR)
+  if changed_keys(old.get('defaults',{}),new.get('defaults',{}),skip=DEFAULTS_SKIP_ATTR):
+    topo_changes.append('defaults')
+  if topo_changes:
+    result.topology = topo_changes
+
+  return result
+
+"""
+read_diff: read the topology diff created by 'netlab create'. Returns None if the diff file
+does not exist
+"""
+def read_diff(fname: str = DIFF_FILE) -> typing.Optional[Box]:
+  from . import read as _read
+
+  if not os.path.isfile(fname):
+    return None
+
+  try:
+    with open(fname,'r',encoding='utf-8') as diff_file:
+      return _read.load_yaml_box(diff_file)
+  except Exception as ex:
+    log.fatal(f'Cannot read topology diff from {fname}: {ex}','diff')
+
+"""
+affected_nodes: nodes that have to be (re)configured to implement the changes: new nodes
+and nodes with changed node data
+"""
+def affected_nodes(diff: Box) -> typing.List[str]:
+  nodes = diff.get('nodes',{})
+  return list(nodes.get('added',{}).keys()) + list(nodes.get('changed',{}).keys())
+
+"""
+changed_modules: modules that have to be reconfigured on the changed nodes. Returns None
+if the changes are not limited to module data (initial configuration has to be redeployed)
+"""
+def changed_modules(diff: Box) -> typing.Optional[typing.List[str]]:
+  nodes = diff.get('nodes',{})
+  if nodes.get('added',None) or diff.get('topology',None):
+    return None
+
+  modules: typing.List[str] = []
+  for n_diff in nodes.get('changed',{}).values():
+    intf_diff = n_diff.get('interfaces',{})
+    if n_diff.get('attributes',None) or intf_diff.get('added',None) or intf_diff.get('removed',None):
+      return None
+
+    n_modules = n_diff.get('modules',[])
+    for intf_attr in intf_diff.get('changed',{}).values():
+      if [ attr for attr in intf_attr if attr not in n_modules ]:
+        return None                                         # Non-module interface attribute has changed
+
+    modules.extend([ m for m in n_modules if m not in modules ])
+
+  return modules
+
+"""
+diff_summary: one-line summary of the topology changes
+"""
+def diff_summary(diff: Box) -> str:
+  nodes = diff.get('nodes',{})
+  links = diff.get('links',{})
+  counters = [
+    (len(nodes.get('added',{})),'node(s) added'),
+    (len(nodes.get('removed',{})),'node(s) removed'),
+    (len(nodes.get('changed',{})),'node(s) changed'),
+    (len(links.get('added',[])),'link(s) added'),
+    (len(links.get('removed',[])),'link(s) removed'),
+    (len(links.get('changed',{})),'link(s) changed'),
+    (len(diff.get('topology',[])),'topology element(s) changed') ]
+
+  return ', '.join([ f'{cnt} {text}' for cnt,text in counters if cnt ]) or 'no changes'
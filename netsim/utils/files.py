@@ -3,8 +3,10 @@
 #
 
 import pathlib
+import hashlib
 import importlib
 import importlib.util
+import io
 import os
 import sys
 import typing
@@ -34,6 +36,19 @@ def get_sysdir() -> pathlib.Path:
 def get_curdir() -> pathlib.Path:
   return pathlib.Path(os.path.expanduser(".")).resolve()
 
+#
+# Get the netlab cache directory (creating it if needed). Returns None if the
+# cache directory cannot be created; the callers should work without a cache.
+#
+def get_cachedir() -> typing.Optional[pathlib.Path]:
+  cache_dir = get_userdir() / 'cache'
+  try:
+    cache_dir.mkdir(parents=True,exist_ok=True)
+  except Exception:
+    return None
+
+  return cache_dir
+
 #
 # Get the usual search path (current directory, user home directory, system-wide settings, package settings)
 #
@@ -161,10 +176,31 @@ def get_traversable_path(dir_name : str) -> typing.Any:
 # Open, close, and write to file (or STDOUT)
 #
 
+#
+# Output files can be written only when their content changes (used by 'netlab create --watch').
+# In that mode, the output files are collected in memory and compared with the existing files
+# when they're closed, and the names of the changed files are collected in CHANGED_FILES
+#
+WRITE_CHANGED_ONLY: bool = False
+CHANGED_FILES: typing.List[str] = []
+
+class ChangedOnlyFile(io.StringIO):
+  def __init__(self, fname: str) -> None:
+    super().__init__()
+    self.name = fname
+
+  def close(self) -> None:
+    if not self.closed:
+      create_file_if_changed(self.name,self.getvalue())
+    super().close()
+
 def open_output_file(fname: str) -> typing.TextIO:
   if fname == '-':
     return sys.stdout
 
+  if WRITE_CHANGED_ONLY:
+    return ChangedOnlyFile(fname)
+
   try:
     return open(fname,mode='w')
   except Exception as ex:
@@ -179,14 +215,44 @@ def close_output_file(f: typing.TextIO) -> None:
     log.fatal(f'Cannot close file {f.name}: {ex}')
 
 def create_file_from_text(fname: str, txt: str) -> None:
-  fh = open_output_file(fname)
+  if WRITE_CHANGED_ONLY and fname != '-':
+    create_file_if_changed(fname,txt)
+    return
+
+  write_text_file(fname,txt)
+
+def write_text_file(fname: str, txt: str) -> None:
+  try:
+    fh = open(fname,mode='w') if fname != '-' else sys.stdout
+  except Exception as ex:
+    log.fatal(f'Cannot open file {fname} for writing: {ex}')
   try:
     fh.write(txt)
   except Exception as ex:
-    log.fatal('Cannot write to {fname}: {ex}')
-    return
+    log.fatal(f'Cannot write to {fname}: {ex}')
   close_output_file(fh)
 
+#
+# Write text to a file only if the file content would change. The modification time of
+# unchanged files is not modified, so the downstream tools (Ansible, make, editors, file
+# watchers) don't see a change. Returns True if the file has been written.
+#
+def create_file_if_changed(fname: str, txt: str) -> bool:
+  if fname != '-' and os.path.isfile(fname):
+    try:
+      new_data = txt.encode('utf-8')
+      if os.path.getsize(fname) == len(new_data):           # No need to read the file if the size is different
+        with open(fname,'rb') as f:
+          if hashlib.sha256(f.read()).digest() == hashlib.sha256(new_data).digest():
+            return False
+    except Exception:                                       # Something went wrong, rewrite the file
+      pass
+
+  write_text_file(fname,txt)
+  if WRITE_CHANGED_ONLY:
+    CHANGED_FILES.append(fname)
+  return True
+
 def load_python_module(module_name: str, module_path: str) -> typing.Any:
   try:
     modspec  = importlib.util.spec_from_file_location(module_name,module_path)
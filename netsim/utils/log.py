@@ -8,11 +8,8 @@ import warnings
 import typing
 import argparse
 from box import Box
-from ..data import types as _types
 from . import strings
 
-import rich.table
-
 LOGGING : bool = False
 VERBOSE : int = 0
 DEBUG : typing.Optional[typing.List[str]] = None
@@ -326,6 +323,8 @@ def section_header(label: str, text: str, color: str = 'green') -> None:
     print(f'{label} {text}')
   else:
     print()
+    import rich.table
+
     table = rich.table.Table(show_header=False)
     l_width = min(strings.rich_width-2,80)
     table.add_column(width=l_width)
@@ -368,6 +367,9 @@ def set_logging_flags(args: typing.Union[argparse.Namespace,Box]) -> None:
     else:
       DEBUG = args.debug if args.debug else ['all']
       print(f'Debugging flags set: {DEBUG}')
+      if 'memory' in DEBUG:                       # Start memory tracing as early as possible (it slows down
+        from . import memory                      # ... everything, so it's not started with 'all' flag)
+        memory.start_tracing()
 
   if 'test' in args and args.test and 'errors' in args.test:
     _error_header_printed = True
@@ -417,18 +419,36 @@ def debug_active(flag: str) -> bool:
 
   return 'all' in DEBUG or flag in DEBUG
 
+"""
+debug_flag_set: check the debugging flags that are not included in 'all' (for example,
+the expensive memory tracing)
+"""
+def debug_flag_set(flag: str) -> bool:
+  if not DEBUG:
+    return False
+
+  return flag in DEBUG
+
 """
 init_log_system: initialize the logging system (used to run test cases)
 """
 def init_log_system(header: bool = True) -> None:
-  global _ERROR_LOG,_error_header_printed
+  global _ERROR_LOG,_WARNING_LOG,_error_header_printed
 
   _ERROR_LOG = []                                 # Clear the error log
+  _WARNING_LOG = []                               # ... and the warnings log
   _error_header_printed = not header              # Mark header as printed if we don't want to have one
 
+  from ..data import types as _types
+
   _types.init_wrong_type()
 
 def get_error_log() -> list:
   global _ERROR_LOG
 
   return _ERROR_LOG
+
+def get_warning_log() -> list:
+  global _WARNING_LOG
+
+  return _WARNING_LOG
@@ -0,0 +1,184 @@
+#
+# Memory usage accounting (--debug memory)
+#
+# * Python heap usage (current and peak, measured with tracemalloc) after every
+#   transformation phase. tracemalloc is started when the 'memory' debugging flag
+#   is set (see log.set_logging_flags), so the report includes the memory used
+#   by the topology defaults
+# * Size of the transformed topology data structures attributed to defaults, nodes,
+#   interfaces, neighbor lists, links, VLANs/VRFs and module data (object-size walk)
+# * Per-key size breakdown of the YAML topology snapshot
+#
+import typing
+import sys
+import re
+import tracemalloc
+
+from box import Box
+
+from . import log,strings
+
+PHASES: typing.List[dict] = []                  # Memory usage recorded after transformation phases
+
+def start_tracing() -> None:
+  if not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+"""
+object_size: recursively compute the size of a data structure. Objects already in the
+'seen' set are skipped, so the data shared between several data structures is counted
+only once (in the first data structure that contains it). Box objects include their
+per-object configuration.
+"""
+def object_size(obj: typing.Any, seen: set) -> int:
+  size = 0
+  stack = [ obj ]
+  while stack:
+    item = stack.pop()
+    if id(item) in seen:
+      continue
+    seen.add(id(item))
+    size += sys.getsizeof(item)
+
+    if isinstance(item,dict):
+      stack.extend(item.keys())
+      stack.extend(item.values())
+    elif isinstance(item,(list,tuple,set,frozenset)):
+      stack.extend(item)
+    else:
+      continue
+
+    obj_dict = getattr(item,'__dict__',None)                # Box and BoxList objects store their configuration
+    if obj_dict:                                            # ... in instance attributes
+      stack.append(obj_dict)
+
+  return size
+
+"""
+topology_sizes: attribute the memory used by the topology data structures to categories.
+
+The more specific categories are walked first; the objects they contain (for example,
+neighbor lists) are thus not counted again in the generic categories (for example, nodes)
+"""
+def topology_sizes(topology: Box) -> typing.Dict[str,int]:
+  seen: set = set()
+  sizes: typing.Dict[str,int] = {}
+  nodes = topology.get('nodes',{})
+  node_data = [ n for n in nodes.values() if isinstance(n,dict) ] if isinstance(nodes,dict) else []
+  modules = list(topology.get('module',[]))
+
+  def add(category: str, data: typing.Any) -> None:
+    sizes[category] = sizes.get(category,0) + object_size(data,seen)
+
+  sizes['neighbor lists'] = 0
+  for n_data in node_data:
+    for intf in n_data.get('interfaces',[]):
+      if 'neighbors' in intf:
+        add('neighbor lists',intf['neighbors'])
+
+  sizes['interfaces'] = 0
+  for n_data in node_data:
+    if 'interfaces' in n_data:
+      add('interfaces',n_data['interfaces'])
+
+  sizes['VLANs/VRFs'] = 0
+  for parent in [ topology ] + node_data:
+    for kw in ('vlans','vrfs'):
+      if kw in parent:
+        add('VLANs/VRFs',parent[kw])
+
+  sizes['module data'] = 0
+  for parent in [ topology ] + node_data:
+    for m in modules:
+      if m in parent:
+        add('module data',parent[m])
+
+  add('nodes',nodes)
+  add('links',topology.get('links',[]))
+  add('defaults',topology.get('defaults',{}))
+  add('other',topology)
+  return sizes
+
+"""
+record_phase: record the memory usage after a transformation phase
+"""
+def record_phase(phase: str, topology: Box) -> None:
+  current,peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0,0)
+  PHASES.append({ 'phase': phase, 'current': current, 'peak': peak, 'sizes': topology_sizes(topology) })
+
+def mb(value: int) -> str:
+  return f'{value / (1024 * 1024):.2f}'
+
+"""
+print_report: print the memory usage recorded after transformation phases (in MB)
+"""
+def print_report() -> None:
+  if not PHASES:
+    return
+
+  categories = list(PHASES[-1]['sizes'].keys())
+  heading = [ 'MB' ] + [ p['phase'] for p in PHASES ]
+  rows = [ [ 'Python heap' ] + [ mb(p['current']) if p['peak'] else 'n/a' for p in PHASES ],
+           [ 'Peak heap' ] + [ mb(p['peak']) if p['peak'] else 'n/a' for p in PHASES ] ]
+  rows.extend([ [ c ] + [ mb(p['sizes'].get(c,0)) for p in PHASES ] for c in categories ])
+  rows.append([ 'Topology total' ] + [ mb(sum(p['sizes'].values())) for p in PHASES ])
+
+  print('Memory usage after transformation phases')
+  strings.print_table(heading,rows,inter_row_line=False)
+  PHASES.clear()
+
+"""
+snapshot_breakdown: compute the size of YAML text belonging to the individual keys.
+
+Returns the sizes of top-level keys, node attributes (summed across all nodes), interface
+attributes (summed across all interfaces), link attributes and default settings. The YAML text is parsed
+based on its indentation; every line is attributed to the innermost key containing it.
+"""
+YAML_KEY_RE: typing.Final[re.Pattern] = re.compile(r"""^('[^']*'|"[^"]*"|[^:'"]+):(\s|$)""")
+
+def snapshot_breakdown(text: str) -> typing.Dict[str,int]:
+  sizes: typing.Dict[str,int] = {}
+  stack: typing.List[typing.Tuple[int,str]] = []
+
+  for line in text.splitlines():
+    content = line.lstrip(' ')
+    indent = len(line) - len(content)
+    while content.startswith('- '):                        # List item: the item keys are indented by two more spaces
+      content = content[2:]
+      indent += 2
+
+    if content:                                             # Empty lines (within multi-line strings) belong to current key
+      while stack and stack[-1][0] >= indent:
+        stack.pop()
+      match = YAML_KEY_RE.match(content)
+      if match:
+        stack.append((indent,match.group(1).strip('\'"')))
+
+    path = [ k for _,k in stack ]
+    if not path:
+      continue
+
+    keys = [ path[0] ]
+    if path[0] == 'nodes' and len(path) > 2:
+      keys.append(f'nodes.*.{path[2]}')
+      if path[2] == 'interfaces' and len(path) > 3:
+        keys.append(f'nodes.*.interfaces.{path[3]}')
+    elif path[0] in ('links','defaults') and len(path) > 1:
+      keys.append(f'{path[0]}.{path[1]}')
+
+    for k in keys:
+      sizes[k] = sizes.get(k,0) + len(line) + 1
+
+  return sizes
+
+"""
+print_snapshot_breakdown: print the snapshot size breakdown, largest elements first
+"""
+def print_snapshot_breakdown(text: str, fname: str, limit: int = 40) -> None:
+  total = len(text)
+  sizes = snapshot_breakdown(text)
+  rows = [ [ k, f'{v / 1024:.1f}', f'{v * 100 / total:.1f}' if total else '0' ]
+             for k,v in sorted(sizes.items(),key=lambda x: x[1],reverse=True)[:limit] ]
+
+  print(f'Size breakdown of {fname} ({total / 1024:.1f} KB)')
+  strings.print_table([ 'element', 'KB', '%' ],rows,inter_row_line=False)
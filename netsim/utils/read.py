@@ -93,12 +93,21 @@ class UniqueKeyLoader(yaml.SafeLoader):
       mapping.append(key)
     return super().construct_mapping(node, deep)
 
+"""
+Parse YAML data (string or open file) into a Box with netlab Box settings (see data.get_box)
+"""
+def load_yaml_box(stream: typing.Union[str,typing.IO]) -> Box:
+  yaml_data = yaml.load(stream,Loader=UniqueKeyLoader)
+  if not isinstance(yaml_data,dict):
+    raise ValueError(f'YAML data is not a dictionary but {type(yaml_data).__name__}')
+  return data.get_box(yaml_data)
+
 def read_yaml(filename: typing.Optional[str] = None, string: typing.Optional[str] = None) -> typing.Optional[Box]:
   global read_cache
 
   if string is not None:
     try:
-      yaml_data = Box().from_yaml(yaml_string=string,default_box=True,box_dots=True,default_box_none_transform=False,Loader=UniqueKeyLoader)
+      yaml_data = load_yaml_box(string)
       return yaml_data
     except:                                                                    # pragma: no cover -- can't get here unless there's a package error
       log.fatal("Cannot parse YAML string: %s " % (str(sys.exc_info()[1])))
@@ -111,7 +120,7 @@ def read_yaml(filename: typing.Optional[str] = None, string: typing.Optional[str
     print(f"Reading {filename}")
 
   if filename in read_cache:
-    return Box(read_cache[filename],default_box=True,box_dots=True,default_box_none_transform=False)
+    return data.get_box(read_cache[filename])
 
   if "package:" in filename:
     pkg_files = _files.get_traversable_path('package:')
@@ -127,7 +136,8 @@ def read_yaml(filename: typing.Optional[str] = None, string: typing.Optional[str
         print("YAML file %s does not exist" % filename) # pragma: no cover -- too hard to test to bother
       return None
     try:
-      yaml_data = Box().from_yaml(filename=filename,default_box=True,box_dots=True,default_box_none_transform=False,Loader=UniqueKeyLoader)
+      with open(filename,'r',encoding='utf-8') as yaml_file:
+        yaml_data = load_yaml_box(yaml_file)
       include_yaml(yaml_data,filename)
       read_cache[filename] = Box(yaml_data)
     except:
@@ -250,6 +260,18 @@ def load(
   if topology is None:
     log.fatal('Cannot read topology file: %s' % sys.exc_info()[0]) # pragma: no cover -- sanity check, getting here would be hard
 
+  return add_defaults(topology,fname,user_defaults,system_defaults)
+
+#
+# Merge defaults with topology data that has already been read from a file (or created
+# by the caller). The topology file name is used to find the relative defaults files
+#
+def add_defaults(
+      topology: Box,
+      fname: str,
+      user_defaults: typing.Optional[list] = None,
+      system_defaults: typing.Optional[list] = None) -> Box:
+
   topology.input = [ fname ]
   if 'includes' in topology:                                # includes topology element SHOULD NOT BE USED
     if log.RAISE_ON_ERROR:                                  # ... and if we're under test harness
@@ -5,45 +5,281 @@
 import typing
 import os
 import sys
+import json
+import datetime
+import sqlite3
 import traceback
 from box import Box
-from filelock import Timeout, FileLock
 
 from ..utils import log,strings
 from ..data import get_empty_box
 
+'''
+The lab status can be stored in two formats:
+
+* A SQLite database (default) with one row per lab instance and an append-only
+  table of lab log lines. Lab status changes update (or append) only the rows
+  belonging to the current lab instance, and SQLite takes care of the locking.
+* A YAML file (legacy format, used when the status file name ends with .yml or
+  .yaml, or when an existing status file is not a SQLite database). The whole
+  file is locked, read, and rewritten on every change.
+'''
+DEFAULT_STATUS_FILE: typing.Final[str] = '~/.netlab/status.db'
+LEGACY_STATUS_FILE:  typing.Final[str] = '~/.netlab/status.yaml'
+SQLITE_HEADER:       typing.Final[bytes] = b'SQLite format 3\0'
+
 '''
 get_status_filename -- get the name of the netlab status file
 '''
 def get_status_filename(topology: Box) -> str:
-  status_file = topology.defaults.lab_status_file or '~/.netlab/status.yaml'
+  status_file = topology.defaults.lab_status_file or DEFAULT_STATUS_FILE
   return os.path.expanduser(status_file)
 
+'''
+is_yaml_status -- is the status file a (legacy) YAML file?
+
+New status files are SQLite databases unless their name ends with .yml or .yaml;
+the format of an existing status file is detected from its content
+'''
+def is_yaml_status(status_file: str) -> bool:
+  if os.path.splitext(status_file)[1] in ('.yml','.yaml'):
+    return True
+
+  try:
+    with open(status_file,'rb') as f:
+      header = f.read(len(SQLITE_HEADER))
+  except OSError:                                           # Status file does not exist (yet)
+    return False
+
+  return bool(header) and header != SQLITE_HEADER          # Empty files are turned into databases
+
 '''
 Get lab ID for multilab deployments (moved here to be used by more than just CLI routines)
 '''
 def get_lab_id(topology: Box) -> str:
   return topology.get('defaults.multilab.id','default') or 'default'    # id could be set to {} due to tool f-string evals
 
+'''
+create_status_directory -- make sure the directory containing the status file exists
+'''
+def create_status_directory(status_file: str) -> None:
+  try:
+    status_dir = os.path.dirname(status_file)
+    if not os.path.exists(status_dir):
+      os.makedirs(status_dir)
+  except:
+    log.fatal(f'Cannot create lab status directory {status_dir}')
+
+'''
+SQLite status store
+
+* The 'labs' table contains a JSON-encoded lab instance status (without the log)
+* The 'log' table is an append-only journal of lab log lines
+* The 'meta' table contains database-wide flags (for example, 'legacy_import'
+  is set once the legacy YAML status file has been imported)
+
+The 'id' columns have no type affinity, allowing us to use integer (multilab)
+and string lab IDs just like we could in the YAML status file.
+'''
+def status_db_connect(status_file: str) -> sqlite3.Connection:
+  new_db = not os.path.exists(status_file)
+  if new_db:
+    create_status_directory(status_file)
+
+  try:
+    db = sqlite3.connect(status_file,timeout=30,isolation_level=None)
+    if new_db:
+      db.execute('PRAGMA auto_vacuum = INCREMENTAL')
+    db.execute('PRAGMA journal_mode = WAL')
+    db.execute('CREATE TABLE IF NOT EXISTS labs (id PRIMARY KEY, state TEXT NOT NULL)')
+    db.execute('CREATE TABLE IF NOT EXISTS log (seq INTEGER PRIMARY KEY AUTOINCREMENT, id NOT NULL, line TEXT NOT NULL)')
+    db.execute('CREATE INDEX IF NOT EXISTS log_id ON log (id)')
+    db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+  except Exception as ex:
+    log.fatal(f'Cannot open lab status database {status_file}: {ex}')
+
+  if is_legacy_default(status_file):
+    import_legacy_status(db,os.path.expanduser(LEGACY_STATUS_FILE))
+
+  return db
+
+'''
+import_legacy_status -- copy the lab instances from the legacy YAML status file
+                        into the status database
+
+The import runs in a write transaction and sets the 'legacy_import' flag, so
+concurrent netlab processes opening a new status database import the legacy
+status file only once.
+'''
+def import_legacy_status(db: sqlite3.Connection, legacy_file: str) -> None:
+  try:
+    db.execute('BEGIN IMMEDIATE')                           # Serialize concurrent imports
+    if db.execute("SELECT value FROM meta WHERE key = 'legacy_import'").fetchone() is not None:
+      db.execute('ROLLBACK')                                # Another process has already imported the file
+      return
+
+    try:
+      legacy = Box().from_yaml(filename=legacy_file,default_box=True,box_dots=True)
+    except:
+      db.execute('ROLLBACK')
+      log.error(
+        f'Cannot read legacy lab status file {legacy_file}',
+        category=Warning,
+        module='status')
+      return
+
+    for lab_id,lab_state in legacy.items():
+      write_lab_state(db,lab_id,lab_state,[])
+    db.execute("INSERT INTO meta (key,value) VALUES ('legacy_import',?)",(legacy_file,))
+    db.execute('COMMIT')
+  except Exception as ex:
+    if db.in_transaction:
+      db.execute('ROLLBACK')
+    log.fatal(f'Cannot import legacy lab status file {legacy_file}: {ex}')
+
+  try:                                                      # Rename the legacy status file to ensure
+    os.rename(legacy_file,f'{legacy_file}.migrated')        # ... we won't try to import it again
+  except:
+    pass
+
+def encode_state_value(value: typing.Any) -> typing.Any:
+  if isinstance(value,datetime.datetime):
+    return value.isoformat()
+  raise TypeError(f'Cannot encode {type(value)} in lab status')
+
+def read_lab_log(db: sqlite3.Connection, lab_id: typing.Any) -> list:
+  return [ line for (line,) in db.execute('SELECT line FROM log WHERE id = ? ORDER BY seq',(lab_id,)) ]
+
+def decode_lab_state(state: str) -> Box:
+  lab_state = get_empty_box() + json.loads(state)
+  if isinstance(lab_state.get('timestamp',None),str):
+    try:
+      lab_state.timestamp = datetime.datetime.fromisoformat(lab_state.timestamp)
+    except:
+      pass
+
+  return lab_state
+
+'''
+write_lab_state -- write the lab instance status into the database
+
+The lab log is an append-only journal: when the log in the lab state starts with
+the lines already stored in the database, we only append the new lines; otherwise
+we replace the whole log.
+'''
+def write_lab_state(db: sqlite3.Connection, lab_id: typing.Any, lab_state: Box, old_log: list) -> None:
+  lab_log = list(lab_state.get('log',None) or [])
+  state = { k:v for k,v in lab_state.to_dict().items() if k != 'log' }
+  db.execute(
+    'INSERT OR REPLACE INTO labs (id,state) VALUES (?,?)',
+    (lab_id,json.dumps(state,default=encode_state_value)))
+
+  if lab_log[:len(old_log)] != old_log:
+    db.execute('DELETE FROM log WHERE id = ?',(lab_id,))
+    old_log = []
+
+  db.executemany(
+    'INSERT INTO log (id,line) VALUES (?,?)',
+    [ (lab_id,line) for line in lab_log[len(old_log):] ])
+
+def delete_lab_state(db: sqlite3.Connection, lab_id: typing.Any) -> None:
+  db.execute('DELETE FROM labs WHERE id = ?',(lab_id,))
+  db.execute('DELETE FROM log WHERE id = ?',(lab_id,))
+
+'''
+compact_status_db -- remove orphaned log lines and release free database pages
+'''
+def compact_status_db(db: sqlite3.Connection) -> None:
+  db.execute('DELETE FROM log WHERE id NOT IN (SELECT id FROM labs)')
+  db.execute('PRAGMA incremental_vacuum')
+
+'''
+change_lab_status_db -- change the status of the current lab instance in the
+                        status database
+
+The callback gets a status Box containing only the current lab instance; it
+must not change the status of other lab instances.
+'''
+def change_lab_status_db(status_file: str, topology: Box, callback: typing.Callable[[Box,Box], None]) -> None:
+  lab_id = get_lab_id(topology)
+  db = status_db_connect(status_file)
+  try:
+    db.execute('BEGIN IMMEDIATE')                           # Lock the database for writing
+    status = get_empty_box()
+    row = db.execute('SELECT state FROM labs WHERE id = ?',(lab_id,)).fetchone()
+    old_log = []
+    if row is not None:
+      old_log = read_lab_log(db,lab_id)
+      status[lab_id] = decode_lab_state(row[0])
+      status[lab_id].log = list(old_log)
+
+    callback(status,topology)                               # Change the lab status
+    if log.debug_active('status'):
+      print(f'Lab status: {status}')
+
+    if lab_id in status:
+      write_lab_state(db,lab_id,status[lab_id],old_log)
+    elif row is not None:
+      delete_lab_state(db,lab_id)
+    db.execute('COMMIT')
+  except:
+    if db.in_transaction:
+      db.execute('ROLLBACK')
+    log.fatal(f'Cannot change lab status in {status_file}\n... {sys.exc_info()[0]}')
+  finally:
+    db.close()
+
+'''
+read_status_db -- read the status of all lab instances from the status database
+'''
+def read_status_db(status_file: str, include_log: bool = True) -> Box:
+  status = get_empty_box()
+  if not os.path.exists(status_file) and not is_legacy_default(status_file):
+    return status
+
+  db = status_db_connect(status_file)
+  try:
+    for (lab_id,state) in db.execute('SELECT id,state FROM labs'):
+      status[lab_id] = decode_lab_state(state)
+      status[lab_id].log = []
+    if include_log:
+      for (lab_id,line) in db.execute('SELECT id,line FROM log ORDER BY seq'):
+        if lab_id in status:
+          status[lab_id].log.append(line)
+  except Exception as ex:
+    log.fatal(f'Cannot read lab status database {status_file}: {ex}')
+  finally:
+    db.close()
+
+  return status
+
+def is_legacy_default(status_file: str) -> bool:
+  return status_file == os.path.expanduser(DEFAULT_STATUS_FILE) and \
+           os.path.exists(os.path.expanduser(LEGACY_STATUS_FILE))
+
 '''
 change_status -- change the status of a lab
 
+YAML status file:
+
 * Lock the lab status file
 * Read the YAML document in the lab status file
 * Call a callback function to change the status
 * Write the modified YAML document
 * Unlock the lab status file
+
+Status database: see change_lab_status_db
 '''
 def change_status(topology: Box, callback: typing.Callable[[Box,Box], None]) -> None:
   status_file = get_status_filename(topology)               # Get status file name from topology defaults
+  if not is_yaml_status(status_file):
+    change_lab_status_db(status_file,topology,callback)
+    return
+
   lock_file   = f'{status_file}.lock'                       # Associated lock file
+  create_status_directory(status_file)
 
-  try:
-    status_dir = os.path.dirname(status_file)
-    if not os.path.exists(status_dir):
-      os.makedirs(status_dir)
-  except:
-    log.fatal(f'Cannot create lab status directory {status_dir}')
+  from filelock import FileLock                             # Legacy YAML status file needs a file lock
 
   try:                                                      # Try to lock the status file          
     lock = FileLock(lock_file, timeout=3)
@@ -66,8 +302,11 @@ def change_status(topology: Box, callback: typing.Callable[[Box,Box], None]) ->
   finally:
     lock.release()
 
-def read_status(topology: Box) -> Box:
+def read_status(topology: Box, include_log: bool = True) -> Box:
   status_file = get_status_filename(topology)               # Get status file name from topology defaults
+  if not is_yaml_status(status_file):
+    return read_status_db(status_file,include_log)
+
   if not os.path.exists(status_file):
     return get_empty_box()
   
@@ -82,10 +321,33 @@ Remove the lab instance/directory from the status file
 '''
 def remove_lab_status(topology: Box) -> None:
   lab_id = get_lab_id(topology)
+  status_file = get_status_filename(topology)
+
+  if is_yaml_status(status_file):
+    change_status(
+      topology,
+      callback = lambda s,t: s.pop(lab_id,None))
+    return
 
-  change_status(
-    topology,
-    callback = lambda s,t: s.pop(lab_id,None))
+  db = status_db_connect(status_file)
+  try:
+    db.execute('BEGIN IMMEDIATE')
+    delete_lab_state(db,lab_id)
+    db.execute('COMMIT')
+    compact_status_db(db)
+  except Exception as ex:
+    log.fatal(f'Cannot remove lab {lab_id} from lab status database {status_file}: {ex}')
+  finally:
+    db.close()
+
+'''
+remove_status_file -- remove the lab status file (and SQLite auxiliary files)
+'''
+def remove_status_file(topology: Box) -> None:
+  status_file = get_status_filename(topology)
+  for fname in [ status_file, f'{status_file}-wal', f'{status_file}-shm', f'{status_file}.lock' ]:
+    if os.path.exists(fname):
+      os.remove(fname)
 
 '''
 lock_directory -- create netlab.lock file in current directory to prevent 
@@ -7,14 +7,51 @@ import sys
 import re
 
 from box import Box,BoxList
-import rich.console, rich.table, rich.json, rich.syntax
 
-rich_console   = rich.console.Console()
-rich_stderr    = rich.console.Console(stderr=True)
-rich_color     = rich_console.color_system is not None
-rich_err_color = rich_stderr.color_system is not None
-rich_width     = rich_console.size.width if rich_color else 80
-rich_err_width = rich_stderr.size.width if rich_err_color else 80
+if typing.TYPE_CHECKING:
+  import rich.console
+
+rich_console   : 'rich.console.Console'
+rich_stderr    : 'rich.console.Console'
+rich_color     : bool
+rich_err_color : bool
+rich_width     : int
+rich_err_width : int
+
+RICH_ATTRIBUTES: typing.Final[list] = [
+  'rich_console', 'rich_stderr', 'rich_color', 'rich_err_color', 'rich_width', 'rich_err_width' ]
+
+"""
+init_rich_consoles: create rich consoles and figure out terminal capabilities
+
+Called on the first use of rich consoles (importing rich takes a while, and many
+netlab commands never need it) and whenever stdout/stderr change (for example,
+in netlab daemon worker processes that use the client's terminal)
+"""
+def init_rich_consoles() -> None:
+  global rich_console,rich_stderr,rich_color,rich_err_color,rich_width,rich_err_width
+  import rich.console
+
+  rich_console   = rich.console.Console()
+  rich_stderr    = rich.console.Console(stderr=True)
+  rich_color     = rich_console.color_system is not None
+  rich_err_color = rich_stderr.color_system is not None
+  rich_width     = rich_console.size.width if rich_color else 80
+  rich_err_width = rich_stderr.size.width if rich_err_color else 80
+
+def rich_consoles_ready() -> None:
+  if 'rich_console' not in globals():
+    init_rich_consoles()
+
+"""
+Lazy module attributes: create rich consoles when other modules need them
+"""
+def __getattr__(name: str) -> typing.Any:
+  if name in RICH_ATTRIBUTES:
+    init_rich_consoles()
+    return globals()[name]
+
+  raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 ruamel_attrs: typing.Final[dict] = {'version': (1,1)}
 
@@ -30,6 +67,9 @@ def get_yaml_string(x : typing.Any) -> str:
     return str(x)
 
 def pretty_print(txt: str, fmt: str) -> None:
+  import rich.syntax
+
+  rich_consoles_ready()
   if fmt == 'str':
     rich_console.out(txt)
   elif fmt == 'json':
@@ -151,6 +191,9 @@ def print_table(
       inter_row_line: bool = True) -> None:
 
   global rich_console
+  import rich.table
+
+  rich_consoles_ready()
 
   # We're dynamically building table parameters in case we want to
   # add table title sometime in the future
@@ -178,6 +221,7 @@ colored_text: Print colored text using rich library
 """
 def print_colored_text(txt: str, color: str, alt_txt: typing.Optional[str] = '', stderr: bool = False) -> None:
   global rich_console, rich_stderr, rich_color, rich_err_color
+  rich_consoles_ready()
   console   = rich_stderr if stderr else rich_console
   has_color = rich_err_color if stderr else rich_color
 
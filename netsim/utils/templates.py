@@ -6,13 +6,79 @@ import os
 import pathlib
 
 from jinja2 import Environment, PackageLoader, FileSystemLoader, StrictUndefined, make_logging_undefined
+from jinja2 import FileSystemBytecodeCache, Template
 
 from .log import debug_active,fatal
-from .files import get_moddir,create_file_from_text
+from .files import get_moddir,get_cachedir,create_file_from_text
 
 ansible_filter_map: dict = {}
 ANSIBLE_DEBUG = False
 
+"""
+Jinja2 environments are expensive to create and every new environment has to
+parse and compile the templates from scratch. We're therefore keeping:
+
+* A pool of environments, one per template search path (all environments use
+  the same options)
+* A cache of templates compiled from strings (for example, validation tests)
+* A persistent bytecode cache in the netlab cache directory, so the templates
+  are compiled only once, not in every netlab run
+"""
+ENV_POOL: typing.Dict[tuple,Environment] = {}
+TEXT_CACHE: typing.Dict[tuple,Template] = {}
+BYTECODE_CACHE: typing.Optional[FileSystemBytecodeCache] = None
+TEXT_CACHE_SIZE: typing.Final[int] = 1000
+
+def get_bytecode_cache() -> typing.Optional[FileSystemBytecodeCache]:
+  global BYTECODE_CACHE
+  if BYTECODE_CACHE is None:
+    cache_dir = get_cachedir()
+    if cache_dir is None:
+      return None
+    try:
+      j2_dir = cache_dir / 'jinja2'
+      j2_dir.mkdir(exist_ok=True)
+      BYTECODE_CACHE = FileSystemBytecodeCache(directory=str(j2_dir))
+    except Exception:
+      return None
+
+  return BYTECODE_CACHE
+
+def get_environment(template_path: list) -> Environment:
+  global ENV_POOL
+
+  env_key = tuple(template_path)
+  if env_key not in ENV_POOL:
+    ENV_POOL[env_key] = Environment(
+      loader=FileSystemLoader(template_path),
+      trim_blocks=True,lstrip_blocks=True,
+      undefined=make_logging_undefined(base=StrictUndefined),
+      bytecode_cache=get_bytecode_cache(),
+      cache_size=1000)
+
+  ENV = ENV_POOL[env_key]
+  add_ansible_filters(ENV)                                # Filters could be added at any time, refresh them
+  return ENV
+
+def get_text_template(ENV: Environment, j2_text: str) -> Template:
+  global TEXT_CACHE
+
+  t_key = (id(ENV),j2_text)
+  if t_key not in TEXT_CACHE:
+    if len(TEXT_CACHE) >= TEXT_CACHE_SIZE:                # Crude cache size management: start from scratch
+      TEXT_CACHE.clear()
+    TEXT_CACHE[t_key] = ENV.from_string(j2_text)
+
+  return TEXT_CACHE[t_key]
+
+"""
+reset_template_cache: drop the pooled environments and compiled templates
+(used when template directories or filters change)
+"""
+def reset_template_cache() -> None:
+  ENV_POOL.clear()
+  TEXT_CACHE.clear()
+
 def add_ansible_filters(ENV: Environment) -> None:
   for k,v in ansible_filter_map.items():
     ENV.filters[k] = v
@@ -51,14 +117,11 @@ def render_template(
     template_path = extra_path + template_path
   if debug_active('template'):
     print(f"TEMPLATE PATH for {j2_file or 'text'}: {template_path}")
-  ENV = Environment(loader=FileSystemLoader(template_path), \
-          trim_blocks=True,lstrip_blocks=True, \
-          undefined=make_logging_undefined(base=StrictUndefined))
-  add_ansible_filters(ENV)
+  ENV = get_environment(template_path)
   if j2_file is not None:
     template = ENV.get_template(j2_file)
   elif j2_text is not None:
-    template = ENV.from_string(j2_text)
+    template = get_text_template(ENV,j2_text)
   else:
     fatal('Internal error: Call to template function with missing J2 file and J2 text, aborting')
     return ""
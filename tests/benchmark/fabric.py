@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+#
+# Synthetic leaf/spine topology generator used by the transformation benchmarks
+#
+# Creates a leaf-and-spine fabric with an IGP (OSPF or IS-IS) and IBGP
+# (spines are route reflectors), optional VLAN/VXLAN/EVPN overlay with
+# VRFs, hosts attached to VLAN access ports, LAN segments with many hosts,
+# and (optionally) leaves packaged in pod components.
+#
+# Usage: PYTHONPATH=../.. python3 fabric.py [--leaves 8] [--hosts 2] ... > topology.yml
+#
+import argparse
+import typing
+
+import yaml
+
+FABRIC_DEFAULTS: typing.Final[dict] = {
+  'leaves': 4,                    # Number of leaf switches
+  'spines': 2,                    # Number of spine switches
+  'hosts': 2,                     # Number of VLAN-attached hosts per leaf
+  'igp': 'ospf',                  # Fabric IGP (ospf or isis)
+  'overlay': 'evpn',              # Overlay: none, vlan, vxlan or evpn
+  'vlans': 4,                     # Number of VLANs
+  'vrfs': 2,                      # Number of VRFs (VLANs are spread across VRFs)
+  'lans': 0,                      # Number of multi-access LAN segments (one per leaf, round-robin)
+  'lan_hosts': 0,                 # Number of hosts attached to every LAN segment
+  'pods': 0,                      # Number of pod components (leaves are split across pods)
+  'device': 'frr',                # Network device type
+}
+
+"""
+Build the leaf module list and the per-leaf overlay settings
+"""
+def leaf_modules(p: dict) -> list:
+  modules = [ p['igp'], 'bgp' ]
+  if p['overlay'] != 'none':
+    modules.append('vlan')
+    if p['vrfs']:
+      modules.append('vrf')
+  if p['overlay'] in ('vxlan','evpn'):
+    modules.append('vxlan')
+  if p['overlay'] == 'evpn':
+    modules.append('evpn')
+  return modules
+
+def leaf_names(p: dict) -> list:
+  if not p['pods']:
+    return [ f'l{i}' for i in range(1,p['leaves']+1) ]
+
+  per_pod = max(p['leaves'] // p['pods'],1)
+  return [ f'pod{pod}_l{i}' for pod in range(1,p['pods']+1) for i in range(1,per_pod+1) ]
+
+"""
+Create the pod component: leaves with their attached hosts. Node names within the
+component are relative; the component include adds the pod name as a prefix
+"""
+def pod_component(p: dict, per_pod: int) -> dict:
+  c_nodes: dict = {}
+  c_links: list = []
+  for i in range(1,per_pod+1):
+    c_nodes[f'l{i}'] = {}
+    for h in range(1,p['hosts']+1):
+      c_nodes[f'l{i}_h{h}'] = { 'device': 'linux' }
+      c_links.append(host_link(p,f'l{i}',f'l{i}_h{h}',h))
+
+  return { 'nodes': c_nodes, 'links': c_links }
+
+def host_link(p: dict, leaf: str, host: str, h_idx: int) -> typing.Union[str,dict]:
+  if p['overlay'] == 'none' or not p['vlans']:
+    return f'{leaf}-{host}'
+
+  return { 'interfaces': [ leaf, host ], 'vlan.access': f'v{(h_idx-1) % p["vlans"] + 1}' }
+
+"""
+Create the fabric topology as a Python dictionary (ready to be dumped as YAML)
+"""
+def fabric_topology(**kwargs: typing.Any) -> dict:
+  p = dict(FABRIC_DEFAULTS,**kwargs)
+  spines = [ f's{i}' for i in range(1,p['spines']+1) ]
+  leaves = leaf_names(p)
+
+  topo: dict = {
+    'defaults.device': p['device'],
+    'addressing.mgmt.ipv4': '10.192.0.0/16',
+    'bgp.as': 65000,
+    'nodes': {},
+    'links': [],
+    'groups': {
+      'spines': { 'members': spines, 'module': [ p['igp'], 'bgp' ], 'bgp.rr': True },
+      'leaves': { 'members': leaves, 'module': leaf_modules(p) },
+    }
+  }
+  if p['overlay'] == 'evpn':
+    topo['groups']['spines']['module'].append('evpn')
+
+  if p['overlay'] != 'none' and p['vlans']:
+    topo['vlans'] = {
+      f'v{i}': { 'id': 1000+i } for i in range(1,p['vlans']+1) }
+    if p['vrfs']:
+      topo['vrfs'] = { f't{i}': {} for i in range(1,p['vrfs']+1) }
+      for i in range(1,p['vlans']+1):
+        topo['vlans'][f'v{i}']['vrf'] = f't{(i-1) % p["vrfs"] + 1}'
+    topo['groups']['leaves']['vlans'] = {         # All VLANs are present on all leaves (needed for asymmetric IRB)
+      vname: {} for vname in topo['vlans'].keys() }
+
+  for s in spines:
+    topo['nodes'][s] = {}
+
+  hosts: list = []
+  if p['pods']:
+    per_pod = max(p['leaves'] // p['pods'],1)
+    topo['components'] = { 'pod': pod_component(p,per_pod) }
+    for pod in range(1,p['pods']+1):
+      topo['nodes'][f'pod{pod}'] = { 'include': 'pod' }
+  else:
+    for leaf in leaves:
+      topo['nodes'][leaf] = {}
+      for h in range(1,p['hosts']+1):
+        host = f'{leaf}_h{h}'
+        topo['nodes'][host] = { 'device': 'linux' }
+        hosts.append(host)
+        topo['links'].append(host_link(p,leaf,host,h))
+
+  for leaf in leaves:
+    for s in spines:
+      topo['links'].append(f'{leaf}-{s}')
+
+  for lan in range(1,p['lans']+1):
+    leaf = leaves[(lan-1) % len(leaves)]
+    lan_members = [ f'lan{lan}_h{h}' for h in range(1,p['lan_hosts']+1) ]
+    for host in lan_members:
+      topo['nodes'][host] = { 'device': 'linux' }
+    hosts.extend(lan_members)
+    topo['links'].append({ 'interfaces': [ leaf ] + lan_members, 'type': 'lan' })
+
+  if hosts:
+    topo['groups']['hosts'] = { 'members': hosts }
+
+  return topo
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description='Create a synthetic leaf/spine topology')
+  for k,v in FABRIC_DEFAULTS.items():
+    parser.add_argument(f'--{k.replace("_","-")}',dest=k,type=type(v),default=v)
+  args = parser.parse_args()
+  print(yaml.safe_dump(fabric_topology(**vars(args)),sort_keys=False),end='')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+#
+# Compact data record benchmark
+#
+# Compares interface neighbor records stored as Box objects (the way netlab
+# used to store them) with CompactData records: time needed to create the
+# records and insert them into a neighbor list, attribute access time, and
+# memory used by the records (measured with tracemalloc)
+#
+# Usage: PYTHONPATH=../.. python3 records.py [--count 20000]
+#
+import time
+import argparse
+import tracemalloc
+import typing
+
+from netsim import data
+
+def box_record(idx: int) -> typing.Any:
+  return data.get_box({ 'ifname': f'eth{idx % 48}', 'node': f'n{idx}', 'ipv4': f'10.0.{idx // 256 % 256}.{idx % 256}/24' })
+
+def compact_record(idx: int) -> typing.Any:
+  return data.CompactData(ifname=f'eth{idx % 48}',node=f'n{idx}',ipv4=f'10.0.{idx // 256 % 256}.{idx % 256}/24')
+
+"""
+Create 'count' records, insert them into a neighbor list, and read their attributes.
+Returns creation time, access time and memory used by the neighbor list
+"""
+def measure(factory: typing.Callable, count: int) -> typing.Tuple[float,float,float]:
+  tracemalloc.start()
+  start = time.perf_counter()
+  intf = data.get_box({ 'neighbors': [] })
+  for idx in range(count):
+    intf.neighbors.append(factory(idx))
+  create_time = time.perf_counter() - start
+  memory = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+
+  start = time.perf_counter()
+  for n in intf.neighbors:
+    if not n.node or not n.ifname or n.get('ipv6',None):
+      raise ValueError(f'Unexpected record {n}')
+  access_time = time.perf_counter() - start
+
+  return create_time,access_time,memory / (1024 * 1024)
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description='Compare Box and CompactData neighbor records')
+  parser.add_argument('--count',type=int,default=20000,help='Number of neighbor records')
+  args = parser.parse_args()
+
+  print(f'{args.count} neighbor records     create (s)   access (s)  memory (MB)')
+  for name,factory in (('Box',box_record),('CompactData',compact_record)):
+    create_time,access_time,memory = measure(factory,args.count)
+    print(f'  {name:<24} {create_time:>10.3f}   {access_time:>10.3f}   {memory:>10.1f}')
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+#
+# Topology transformation scaling benchmark
+#
+# Creates synthetic leaf/spine topologies (see fabric.py) of several sizes and
+# measures:
+#
+# * Topology reading (including system defaults)
+# * Individual augment.main transformation phases
+# * Output modules (provider, snapshot, Ansible inventory, graphs)
+# * Reading the transformed topology snapshot
+# * Peak memory usage (maximum resident set size)
+# * Optionally (--sizes-breakdown): size of transformed topology data structures
+#   (defaults, nodes, interfaces, neighbor lists...) and of the top-level elements
+#   of the topology snapshot, in MB (see netsim.utils.memory)
+#
+# Every test case runs in a separate process to get meaningful memory usage
+# figures and clean module-level caches. The results can be saved as a baseline
+# and compared against a saved baseline to flag regressions.
+#
+# Usage: PYTHONPATH=../.. python3 transformation.py [--sizes small,medium] [--save baseline.json]
+#                                                   [--baseline baseline.json] [--tolerance 0.25]
+#                                                   [--sizes-breakdown]
+#
+import sys
+import os
+import time
+import json
+import tempfile
+import argparse
+import typing
+import contextlib
+import io
+import multiprocessing
+
+import yaml
+
+BENCHMARK_SIZES: typing.Final[dict] = {
+  'small':  { 'leaves': 4, 'hosts': 2 },
+  'medium': { 'leaves': 16, 'hosts': 4, 'lans': 4, 'lan_hosts': 4 },
+  'large':  { 'leaves': 32, 'spines': 4, 'hosts': 4, 'vlans': 16, 'vrfs': 4, 'lans': 8, 'lan_hosts': 8 },
+  'pods':   { 'leaves': 32, 'spines': 4, 'hosts': 4, 'vlans': 16, 'vrfs': 4, 'pods': 8 },
+}
+
+OUTPUT_MODULES: typing.Final[list] = [
+  'provider', 'yaml=netlab.snapshot.yml', 'ansible:dirs', 'graph', 'd2' ]
+
+MIN_COMPARE_TIME: typing.Final[float] = 0.05    # Ignore timing differences in very fast phases
+
+"""
+Get maximum resident set size of the current process in MB (ru_maxrss is in KB on Linux, bytes on MacOS)
+"""
+def get_peak_memory() -> float:
+  import resource
+
+  maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  return maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+
+"""
+Run a single benchmark case in the current (child) process and return the measurements
+"""
+def run_case(params: dict, outputs: list, breakdown: bool = False) -> dict:
+  import fabric
+
+  results: dict = {}
+
+  def timed(metric: str, func: typing.Callable, *args: typing.Any) -> typing.Any:
+    start = time.perf_counter()
+    value = func(*args)
+    results[metric] = round(time.perf_counter() - start,4)
+    return value
+
+  start_dir = os.getcwd()
+  with tempfile.TemporaryDirectory(prefix='netlab-bench-') as work_dir:
+    os.chdir(work_dir)                                      # Output modules create files in current directory
+    try:
+      with open('topology.yml','w') as topo_file:
+        topo_file.write(yaml.safe_dump(fabric.fabric_topology(**params)))
+      measure_case(results,timed,outputs,breakdown)
+    finally:
+      os.chdir(start_dir)
+
+  results['memory'] = round(get_peak_memory(),1)
+  return results
+
+"""
+Measure the individual phases of a benchmark case (executed in the current directory)
+"""
+def measure_case(results: dict, timed: typing.Callable, outputs: list, breakdown: bool = False) -> None:
+  from netsim.utils import log,read as _read,memory
+  from netsim.augment import main as augment_main
+  from netsim.outputs import _TopologyOutput
+  from netsim.data import global_vars
+
+  log.init_log_system(header=False)
+  topology = timed('read',_read.load,'topology.yml')
+  log.exit_on_error()
+  timed('transform.setup',augment_main.transform_setup,topology)
+  timed('transform.data',augment_main.transform_data,topology)
+  timed('transform.post',augment_main.post_transform,topology)
+  log.exit_on_error()
+  results['nodes'] = len(topology.nodes)
+  results['links'] = len(topology.get('links',[]))
+  if breakdown:
+    for category,size in memory.topology_sizes(topology).items():
+      results[f'size.{category}'] = round(size / (1024 * 1024),2)
+
+  for output_format in outputs:
+    output_name = output_format.split('=')[0].split(':')[0]
+    output_module = _TopologyOutput.load(output_format,topology.defaults.outputs[output_name])
+    if output_module is None:
+      print(f'Cannot load output module {output_format}',file=sys.stderr)
+      continue
+    with contextlib.redirect_stdout(io.StringIO()):         # Output modules report created files, we don't care
+      timed(f'output.{output_name}',output_module.write,topology)
+
+  if os.path.exists('netlab.snapshot.yml'):
+    if breakdown:
+      with open('netlab.snapshot.yml') as snapshot_file:
+        s_sizes = memory.snapshot_breakdown(snapshot_file.read())
+      for key,size in s_sizes.items():
+        if not '.' in key:                                  # Top-level snapshot elements only
+          results[f'size.snapshot.{key}'] = round(size / (1024 * 1024),2)
+    snapshot = timed('snapshot.read',_read.read_yaml,'netlab.snapshot.yml')
+    global_vars.init(snapshot)
+
+  log.exit_on_error()
+
+"""
+Run benchmark cases in separate processes, one at a time
+"""
+def run_benchmark(sizes: typing.List[str], overrides: dict, outputs: list, breakdown: bool = False) -> dict:
+  ctx = multiprocessing.get_context('spawn')
+  results: dict = {}
+  for size in sizes:
+    params = dict(BENCHMARK_SIZES[size],**overrides)
+    with ctx.Pool(processes=1) as pool:
+      results[size] = pool.apply(run_case,(params,outputs,breakdown))
+    print_results(size,results[size])
+  return results
+
+def print_results(size: str, results: dict) -> None:
+  print(f'\n{size}: {results["nodes"]} nodes, {results["links"]} links, peak memory {results["memory"]} MB')
+  for metric,value in results.items():
+    if metric in ('nodes','links','memory'):
+      continue
+    print(f'  {metric:<24} {value:>10.3f}')
+
+"""
+Compare the results with the baseline. Returns a list of regression descriptions
+"""
+def compare_baseline(results: dict, baseline: dict, tolerance: float) -> list:
+  regressions = []
+  for size,s_results in results.items():
+    if not size in baseline:
+      continue
+    for metric,value in s_results.items():
+      b_value = baseline[size].get(metric,None)
+      if metric in ('nodes','links') or not b_value:
+        continue
+      is_size = metric == 'memory' or metric.startswith('size.')
+      if not is_size and max(value,b_value) < MIN_COMPARE_TIME:
+        continue
+      ratio = value / b_value
+      if ratio > 1 + tolerance:
+        regressions.append(f'{size} {metric}: {value} vs {b_value} (+{(ratio-1)*100:.0f}%)')
+
+  return regressions
+
+def parse_overrides(args: argparse.Namespace) -> dict:
+  overrides = {}
+  for kw in ('igp','overlay','device'):
+    if getattr(args,kw):
+      overrides[kw] = getattr(args,kw)
+  return overrides
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description='Topology transformation scaling benchmark')
+  parser.add_argument('--sizes',default='small,medium,large',
+                      help=f'Comma-separated list of benchmark sizes ({",".join(BENCHMARK_SIZES.keys())})')
+  parser.add_argument('--igp',choices=['ospf','isis'],help='Fabric IGP')
+  parser.add_argument('--overlay',choices=['none','vlan','vxlan','evpn'],help='Fabric overlay')
+  parser.add_argument('--device',help='Network device type')
+  parser.add_argument('--outputs',default=','.join(OUTPUT_MODULES),help='Comma-separated list of output modules')
+  parser.add_argument('--sizes-breakdown',dest='breakdown',action='store_true',
+                      help='Measure the size of topology data structures and snapshot elements (MB)')
+  parser.add_argument('--save',help='Save the results into a baseline file')
+  parser.add_argument('--baseline',help='Compare the results with a baseline file')
+  parser.add_argument('--tolerance',type=float,default=0.25,help='Acceptable slowdown (default: 0.25 = 25%%)')
+  args = parser.parse_args()
+
+  sizes = args.sizes.split(',')
+  for size in sizes:
+    if not size in BENCHMARK_SIZES:
+      parser.error(f'Unknown benchmark size {size}')
+
+  sys.path.insert(0,os.path.dirname(os.path.abspath(__file__)))
+  results = run_benchmark(
+              sizes,parse_overrides(args),
+              args.outputs.split(',') if args.outputs else [],
+              args.breakdown)
+
+  if args.save:
+    with open(args.save,'w') as baseline_file:
+      json.dump(results,baseline_file,indent=2,sort_keys=True)
+    print(f'\nResults saved into {args.save}')
+
+  if args.baseline:
+    with open(args.baseline) as baseline_file:
+      regressions = compare_baseline(results,json.load(baseline_file),args.tolerance)
+    if regressions:
+      print(f'\nRegressions compared to {args.baseline}:')
+      for line in regressions:
+        print(f'  {line}')
+      sys.exit(1)
+    print(f'\nNo regressions compared to {args.baseline}')
+
+if __name__ == '__main__':
+  main()
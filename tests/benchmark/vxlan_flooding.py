@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#
+# VXLAN static flooding list scaling benchmark
+#
+# Builds synthetic leaf/spine topologies with static VXLAN flooding (all leaves
+# use all VLANs) and measures the time spent in VXLAN module_post_transform
+# (VNI index and VTEP flood lists) and in the whole transformation
+#
+# Usage: PYTHONPATH=../.. python3 vxlan_flooding.py [--leaves 8,16,32] [--vlans 50,100]
+#
+import sys
+import os
+import time
+import tempfile
+import argparse
+import typing
+
+import yaml
+
+from netsim.utils import log,read as _read
+from netsim import augment
+from netsim.modules import vxlan
+
+def vxlan_topology(leaves: int, vlans: int) -> dict:
+  leaf_names = [ f'l{i}' for i in range(1,leaves+1) ]
+  return {
+    'defaults.device': 'eos',
+    'vlans': { f'v{i}': { 'id': 100+i, 'mode': 'bridge' } for i in range(1,vlans+1) },
+    'groups': {
+      'leaves': {
+        'members': leaf_names,
+        'module': [ 'vlan', 'vxlan', 'ospf' ],
+        'vlans': { f'v{i}': {} for i in range(1,vlans+1) }},
+      'spines': {
+        'members': [ 's1', 's2' ],
+        'module': [ 'ospf' ]}},
+    'nodes': leaf_names + [ 's1', 's2' ],
+    'links': [ f'{leaf}-{spine}' for leaf in leaf_names for spine in ('s1','s2') ]
+  }
+
+def run_case(leaves: int, vlans: int) -> None:
+  timer = { 'vxlan': 0.0 }
+  post_transform = vxlan.VXLAN.module_post_transform
+
+  def timed_post_transform(self: vxlan.VXLAN, topology: typing.Any) -> None:
+    start = time.perf_counter()
+    post_transform(self,topology)
+    timer['vxlan'] += time.perf_counter() - start
+
+  with tempfile.NamedTemporaryFile('w',suffix='.yml',delete=False) as topo_file:
+    topo_file.write(yaml.safe_dump(vxlan_topology(leaves,vlans)))
+
+  try:
+    vxlan.VXLAN.module_post_transform = timed_post_transform    # type: ignore
+    log.init_log_system(header=False)
+    start = time.perf_counter()
+    topology = _read.load(topo_file.name)
+    augment.main.transform(topology)
+    log.exit_on_error()
+    total = time.perf_counter() - start
+  finally:
+    vxlan.VXLAN.module_post_transform = post_transform          # type: ignore
+    os.remove(topo_file.name)
+
+  vtep_count = len(topology.nodes.l1.vxlan.vtep_list)
+  print(f'{leaves:>6} {vlans:>6} {timer["vxlan"]:>12.3f} {total:>12.3f} {vtep_count:>6}')
+
+def int_list(arg: str) -> list:
+  return [ int(x) for x in arg.split(',') ]
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description='VXLAN flooding list scaling benchmark')
+  parser.add_argument('--leaves',type=int_list,default=[8,16,32],help='Comma-separated list of leaf counts')
+  parser.add_argument('--vlans',type=int_list,default=[50,100],help='Comma-separated list of VLAN counts')
+  args = parser.parse_args()
+
+  print(f'{"leaves":>6} {"vlans":>6} {"vxlan (s)":>12} {"total (s)":>12} {"VTEPs":>6}')
+  for leaves in args.leaves:
+    for vlans in args.vlans:
+      run_case(leaves,vlans)
+
+if __name__ == '__main__':
+  main()
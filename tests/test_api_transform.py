@@ -0,0 +1,39 @@
+#
+# In-memory topology transformation API: transformation results and isolation of
+# per-transformation global state
+#
+import pytest
+
+from netsim.api import transform as api
+
+TOPOLOGY = {
+  'defaults.device': 'frr',
+  'module': [ 'ospf' ],
+  'nodes': [ 'r1', 'r2', 'r3' ],
+  'links': [ 'r1-r2', 'r2-r3' ] }
+
+def test_transform_topology() -> None:
+  result = api.transform_topology(TOPOLOGY,outputs=['provider'])
+  assert not result['errors']
+  assert result['topology'].nodes.r2.interfaces[0].neighbors[0].node == 'r1'
+  assert 'Vagrantfile' in result['outputs']
+  assert 'ospf:' in result['snapshot']
+  assert 'r1-r2' in TOPOLOGY['links']                       # The topology dictionary is not modified
+
+def test_state_isolation() -> None:
+  failed = api.transform_topology({ 'nodes': [ 'r1' ], 'links': [ 'r1-x' ] })
+  assert failed['errors'] and failed['topology'] is None
+
+  first = api.transform_topology(TOPOLOGY,snapshot=False)
+  second = api.transform_topology(TOPOLOGY,snapshot=False)
+  assert not first['errors'] and not second['errors']       # Errors from the previous transformation are gone
+  assert first['topology'].nodes.r3.id == second['topology'].nodes.r3.id == 3
+
+@pytest.mark.parametrize('workers',[ 1, 2 ])
+def test_transform_batch(workers: int) -> None:
+  variants = [ { 'nodes': [ 'r1' ], 'links': [ 'r1-x' ] } ]
+  variants.extend([ dict(TOPOLOGY,**{ 'defaults.device': device }) for device in ('frr','eos','frr') ])
+  results = api.transform_batch(variants,snapshot=False,workers=workers)
+  assert results[0]['errors'] and results[0]['topology'] is None
+  assert [ r['topology']['nodes']['r1']['device'] for r in results[1:] ] == [ 'frr', 'eos', 'frr' ]
+  assert not any(r['errors'] for r in results[1:])          # Errors don't leak into the subsequent jobs
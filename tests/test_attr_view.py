@@ -0,0 +1,52 @@
+#
+# Attribute views (used by the data validation code) must return the same results
+# as Box addition without modifying the underlying dictionaries
+#
+from netsim import data
+from netsim.data.attr_view import AttributeView
+
+def get_layers() -> tuple:
+  low = data.get_box({ 'a': { 'x': 1, 'y': { 'z': 1 }}, 'b': 'low', 'c': { 'd': 1 }})
+  high = data.get_box({ 'a': { 'y': { 'w': 2 }}, 'c': None, 'e': 'high' })
+  return low,high
+
+def test_same_as_box_addition() -> None:
+  low,high = get_layers()
+  view = AttributeView(high,low)
+  merged = low + high
+  assert dict(view) == merged.to_dict()
+  assert list(view) == list(merged)
+  assert view.a.y.w == 2 and view.b == 'low' and view.c is None
+  assert not view.missing
+
+def test_copy_on_write() -> None:
+  low,high = get_layers()
+  view = AttributeView(high,low)
+  assert view['b'] is low.b                                 # Single-layer values are not copied
+  view.a.y.z = 42                                           # Changes to merged values do not propagate to layers
+  view.b = 'changed'
+  del view.e
+  assert low.a.y.z == 1 and low.b == 'low' and high.e == 'high'
+  assert view.a.y.z == 42 and view.b == 'changed' and not 'e' in view
+
+def test_nested_changes() -> None:
+  low,high = get_layers()
+  view = AttributeView(high,low)
+  view.a.x = 2                                              # Merged values are copies, nested changes stay in the view
+  del view.a.y.z
+  view.a.y.v = 3
+  assert low.a == { 'x': 1, 'y': { 'z': 1 }} and high.a == { 'y': { 'w': 2 }}
+  assert view.a == { 'x': 2, 'y': { 'w': 2, 'v': 3 }}
+
+  low.f = { 'g': 1 }
+  assert view.f is low.f                                    # Single-layer values are returned by reference
+  view.f = data.get_box(view.f) + { 'g': 2 }                # ... so replace the top-level value to change them
+  assert view.f.g == 2 and low.f.g == 1
+
+def test_layer_order() -> None:
+  low,high = get_layers()
+  top = data.get_box({ 'a': { 'y': { 'z': 3 }}, 'b': { 'x': 1 }})
+  view = AttributeView(top,high,low)
+  assert view.a.y == { 'z': 3, 'w': 2 } and view.a.x == 1
+  assert view.b == { 'x': 1 }                               # Dictionary overrides a lower-layer scalar
+  assert dict(view) == (low + high + top).to_dict()
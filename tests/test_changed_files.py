@@ -0,0 +1,31 @@
+#
+# Changed-only output files (used by 'netlab create --watch'): files are rewritten only
+# when their content changes, and the names of the rewritten files are collected
+#
+import os
+
+from netsim.utils import files as _files
+
+def test_write_changed_only(tmp_path) -> None:
+  fname = str(tmp_path / 'output.txt')
+  _files.create_file_from_text(fname,'first\n')
+  mtime = os.stat(fname).st_mtime_ns
+
+  _files.CHANGED_FILES.clear()
+  _files.WRITE_CHANGED_ONLY = True
+  try:
+    _files.create_file_from_text(fname,'first\n')           # Same content, the file is not rewritten
+    f = _files.open_output_file(fname)
+    f.write('first\n')
+    _files.close_output_file(f)
+    assert os.stat(fname).st_mtime_ns == mtime
+    assert _files.CHANGED_FILES == []
+
+    with _files.open_output_file(fname) as f:               # Output modules also use output files as context managers
+      f.write('second\n')
+    assert _files.CHANGED_FILES == [ fname ]
+  finally:
+    _files.WRITE_CHANGED_ONLY = False
+
+  with open(fname) as f:
+    assert f.read() == 'second\n'
@@ -0,0 +1,87 @@
+#
+# Compact data records (interface neighbors) must behave like the Box objects
+# they replace: attribute access, dotted keys, copy-on-insert, and YAML/JSON output
+#
+import json
+
+from box import Box
+
+from netsim import data
+from netsim.utils import strings
+
+def test_box_api() -> None:
+  n = data.CompactData(node='r1',ifname='eth1',dhcp={ 'client': { 'ipv4': True }})
+  assert n.node == 'r1' and n['ifname'] == 'eth1'
+  assert not n.ipv4                                         # Missing attributes are falsy, like default_box
+  assert n.get('dhcp.client.ipv4') is True
+  assert 'dhcp.client.ipv4' in n and not 'dhcp.client.ipv6' in n
+  assert n.get('dhcp.client.ipv6','x') == 'x'               # Dotted lookup must not create missing entries
+  n.ipv4 = '10.0.0.1/24'
+  assert n['ipv4'] == '10.0.0.1/24'
+
+def test_nested_write() -> None:
+  n = data.CompactData(node='r1',ifname='eth1')
+  assert not n.ospf.area and n == { 'node': 'r1', 'ifname': 'eth1' }   # Reads don't change the record
+  n.ospf.cost = 10
+  n.bgp.community.standard = True
+  n.vrf.update({ 'name': 'red' })
+  assert n.ospf == { 'cost': 10 } and n['bgp']['community'] == { 'standard': True }
+  assert n.get('vrf.name') == 'red'
+  n.ospf.passive = True                                     # Subsequent writes go into the same Box
+  assert n.to_dict()['ospf'] == { 'cost': 10, 'passive': True }
+
+def test_copy_on_insert() -> None:
+  intf = data.get_box({ 'neighbors': [] })
+  n = data.CompactData(node='r1',ifname='eth1',ospf={ 'cost': 10 })
+  intf.neighbors.append(n)
+  ngb = intf.neighbors[0]
+  assert isinstance(ngb,data.CompactData) and ngb is not n
+  assert isinstance(ngb.ospf,Box)                           # Nested dictionaries become Box objects
+  ngb.ifname = 'eth2'
+  assert n.ifname == 'eth1'
+
+  intf.copy_of = [ x for x in intf.neighbors ]
+  assert intf.copy_of[0] is not ngb and intf.copy_of[0] == ngb
+
+def test_output() -> None:
+  n = data.CompactData(node='r1',ifname='eth1')
+  topo = data.get_box({ 'a': { 'neighbors': [ n ] }, 'b': { 'neighbors': [ n ] }})
+  topo.c = [ topo.a.neighbors[0], topo.a.neighbors[0] ]     # The same record in two places must not produce YAML aliases
+  yaml_output = strings.get_yaml_string(topo)
+  assert '&' not in yaml_output and 'python/object' not in yaml_output
+  assert json.loads(topo.to_json())['a']['neighbors'][0] == { 'node': 'r1', 'ifname': 'eth1' }
+
+def transformed_neighbor() -> data.CompactData:
+  from netsim.api import transform as api
+
+  result = api.transform_topology({ 'defaults.device': 'frr', 'nodes': [ 'r1', 'r2' ], 'links': [ 'r1-r2' ] })
+  ngb = result['topology'].nodes.r1.interfaces[0].neighbors[0]
+  assert isinstance(ngb,data.CompactData) and ngb.node == 'r2'
+  return ngb
+
+def test_neighbor_missing_key() -> None:
+  ngb = transformed_neighbor()
+  assert not ngb['bgp'] and not ngb['bgp.local_as']        # Missing keys return an empty Box (like default_box)
+  assert 'bgp' not in ngb                                   # ... without changing the record
+  ngb['bgp'].local_as = 65000
+  ngb['ospf.cost'] = 10                                     # Dotted keys create the missing parents
+  assert ngb.bgp.local_as == 65000 and ngb.ospf == { 'cost': 10 }
+
+def test_neighbor_add() -> None:
+  ngb = transformed_neighbor()
+  ngb.ospf.cost = 10
+  merged = ngb + { 'ospf': { 'area': '0.0.0.1' }, 'vrf': 'red' }
+  assert isinstance(merged,Box) and merged.ospf == { 'cost': 10, 'area': '0.0.0.1' } and merged.vrf == 'red'
+  assert ngb.ospf == { 'cost': 10 } and 'vrf' not in ngb    # Addition does not change the record
+
+  merged = { 'node': 'x', 'vrf': 'red' } + ngb
+  assert isinstance(merged,Box) and merged.node == 'r2' and merged.vrf == 'red'
+
+def test_nested_dicts() -> None:
+  ngb = transformed_neighbor()
+  n = data.CompactData(ngb,dhcp={ 'client': { 'ipv4': True }},vlans=[{ 'id': 100 }])
+  assert isinstance(n.dhcp,Box) and n.dhcp.client.ipv4 is True
+  assert n.vlans[0].id == 100
+  n.evpn = { 'vni': 1000 }                                  # Assigned dictionaries become Box objects
+  assert n.evpn.vni == 1000 and n['evpn']['vni'] == 1000
+  assert not isinstance(n,Box)                              # Known incompatibility (see data/compact.py)
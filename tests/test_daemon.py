@@ -0,0 +1,140 @@
+#
+# netlab daemon: the daemon is started on a temporary socket (HOME is set to a
+# temporary directory), and the tests check command forwarding, exit status
+# propagation, in-process fallback and the daemon control requests
+#
+import os
+import subprocess
+import sys
+import time
+import typing
+
+import pytest
+
+from netsim.cli import daemon
+
+PKG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NETLAB_SCRIPT = os.path.join(PKG_DIR,'netlab')
+
+#
+# Run a netlab command with the daemon client in a separate process. The exit status
+# of the client process is the command exit status, or 99 if the command was not
+# forwarded to the daemon
+#
+CLIENT_SCRIPT = f"""
+import sys
+from netsim.cli import daemon
+status = daemon.forward_command({NETLAB_SCRIPT!r})
+sys.exit(99 if status is None else status)
+"""
+
+def netlab_env(home: str) -> dict:
+  return dict(os.environ,HOME=home,PYTHONPATH=PKG_DIR)
+
+def run_client(home: str, cwd: str, *args: str) -> subprocess.CompletedProcess:
+  return subprocess.run(
+    [ sys.executable, '-c', CLIENT_SCRIPT, *args ],
+    capture_output=True, text=True, cwd=cwd, env=netlab_env(home), timeout=60)
+
+def wait_for(condition: typing.Callable, timeout: float = 30) -> bool:
+  end = time.time() + timeout
+  while time.time() < end:
+    if condition():
+      return True
+    time.sleep(0.1)
+  return False
+
+@pytest.fixture
+def netlab_home(tmp_path,monkeypatch) -> str:
+  monkeypatch.setattr(daemon,'SOCKET_PATH',str(tmp_path / '.netlab' / 'daemon.sock'))
+  return str(tmp_path)
+
+@pytest.fixture
+def running_daemon(netlab_home) -> typing.Iterator[subprocess.Popen]:
+  proc = subprocess.Popen(
+    [ sys.executable, NETLAB_SCRIPT, 'daemon', 'start', '--foreground' ],
+    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=netlab_env(netlab_home))
+  try:
+    assert wait_for(lambda: daemon.control_request('status') is not None), 'netlab daemon did not start'
+    yield proc
+  finally:
+    proc.terminate()
+    proc.wait(timeout=10)
+
+def test_forwarded_commands() -> None:
+  assert daemon.is_forwarded([ 'netlab', 'inspect', '--node', 'r1' ])
+  assert not daemon.is_forwarded([ 'netlab', 'connect', 'r1' ])         # Might need a tty for ssh/sudo prompts
+  assert not daemon.is_forwarded([ 'netlab', 'status', '--cleanup' ])
+  assert not daemon.is_forwarded([ 'netlab' ])
+
+def test_fallback(netlab_home,tmp_path) -> None:
+  assert daemon.control_request('status') is None
+  result = run_client(netlab_home,str(tmp_path),'version')
+  assert result.returncode == 99                                        # Not forwarded, executed in-process
+
+def test_forwarding(running_daemon,netlab_home,tmp_path) -> None:
+  result = run_client(netlab_home,str(tmp_path),'version')
+  assert result.returncode == 0, result.stderr
+  assert 'netlab version' in result.stdout                              # Worker writes to client stdout
+
+def test_exit_status(running_daemon,netlab_home,tmp_path) -> None:
+  result = run_client(netlab_home,str(tmp_path),'inspect')             # No snapshot in the current directory
+  assert result.returncode == 1
+  assert 'does not exist' in result.stdout
+
+def test_control(running_daemon,netlab_home,tmp_path) -> None:
+  status = daemon.control_request('status')
+  assert status['pid'] == running_daemon.pid
+  assert status['package'] == daemon.get_package_id()
+
+  result = subprocess.run(
+    [ sys.executable, NETLAB_SCRIPT, 'daemon', 'status' ],
+    capture_output=True, text=True, env=netlab_env(netlab_home), timeout=60)
+  assert result.returncode == 0
+  assert f'pid {running_daemon.pid}' in result.stdout
+
+  assert daemon.control_request('stop') == { 'stopped': running_daemon.pid }
+  assert running_daemon.wait(timeout=10) == 0
+  assert not os.path.exists(daemon.get_socket_path())
+  assert run_client(netlab_home,str(tmp_path),'version').returncode == 99
+
+def test_snapshot_cache(running_daemon,netlab_home,tmp_path) -> None:
+  from netsim.api import transform as api
+
+  result = api.transform_topology({ 'defaults.device': 'frr', 'nodes': [ 'r1', 'r2' ], 'links': [ 'r1-r2' ] })
+  snapshot = tmp_path / daemon.SNAPSHOT_FILE
+  snapshot.write_text(result['snapshot'])
+
+  for _ in range(2):                                                    # The first worker reads the snapshot file,
+    result = run_client(netlab_home,str(tmp_path),'inspect','--node','r1')  # ... the second one gets the cached copy
+    assert result.returncode == 0, result.stderr
+    assert wait_for(lambda: str(snapshot) in daemon.control_request('status')['snapshots'])
+
+def test_snapshot_loading(running_daemon,netlab_home,tmp_path) -> None:
+  from concurrent.futures import ThreadPoolExecutor
+  from netsim.api import transform as api
+
+  result = api.transform_topology({ 'defaults.device': 'frr', 'nodes': [ 'r1', 'r2' ], 'links': [ 'r1-r2' ] })
+  snapshot = tmp_path / daemon.SNAPSHOT_FILE
+  padding = ''.join(f'  p_{idx}: {{ name: padding, value: {idx} }}\n' for idx in range(3000))
+  snapshot.write_text(result['snapshot'] + 'padding:\n' + padding)    # Large snapshot takes a few seconds to parse
+
+  def inspect(_: typing.Any) -> subprocess.CompletedProcess:
+    return run_client(netlab_home,str(tmp_path),'inspect','--node','r1')
+
+  with ThreadPoolExecutor(max_workers=4) as pool:
+    first = pool.submit(inspect,None)                                 # The first request starts the snapshot loader
+    assert wait_for(lambda: str(snapshot) in daemon.control_request('status')['loading'])
+    task_dir = f'/proc/{running_daemon.pid}/task'
+    if os.path.isdir(task_dir):                                       # Forking a multi-threaded daemon could deadlock
+      assert len(os.listdir(task_dir)) == 1
+    others = [ pool.submit(inspect,None) for _ in range(3) ]          # ... and the daemon keeps serving requests
+    results = [ f.result() for f in [ first, *others ] ]
+  for result in results:
+    assert result.returncode == 0, result.stderr
+    assert 'r1' in result.stdout
+
+  assert wait_for(lambda: str(snapshot) in daemon.control_request('status')['snapshots'],timeout=60)
+  assert not daemon.control_request('status')['loading']
+  result = run_client(netlab_home,str(tmp_path),'inspect','--node','r1')
+  assert result.returncode == 0, result.stderr
@@ -0,0 +1,38 @@
+#
+# IdSet (bitmap-based set of identifiers used by the dataplane ID routines) must
+# behave like a Python set of the same values
+#
+import copy
+import pickle
+
+from netsim.modules._dataplane import IdSet
+
+def test_add() -> None:
+  ids = IdSet([ 1, 9, 9, 'rd:1' ])
+  ids.add(1)                                                # Duplicates are not counted twice
+  ids.add(IdSet.MAX_BITMAP + 1)                             # Large values are stored in the extra set
+  ids.add(-1)
+  assert len(ids) == 5
+  assert set(ids) == { 1, 9, 'rd:1', IdSet.MAX_BITMAP + 1, -1 }
+  assert 9 in ids and 'rd:1' in ids and -1 in ids
+  assert 8 not in ids and 10_000 not in ids and 'rd:2' not in ids
+
+def test_next_free() -> None:
+  ids = IdSet(range(1,20))
+  assert ids.next_free(1,100) == 20                         # Skips fully-used bitmap bytes
+  assert ids.next_free(25,100) == 25
+  assert ids.next_free(1,19) is None
+  ids.add(20)
+  assert ids.next_free(15,100) == 21
+  assert ids.next_free(1000,2000) == 1000                   # Beyond the end of the bitmap
+
+  big = IdSet([ IdSet.MAX_BITMAP, IdSet.MAX_BITMAP + 1 ])   # Outside of the bitmap range
+  assert big.next_free(IdSet.MAX_BITMAP,IdSet.MAX_BITMAP + 5) == IdSet.MAX_BITMAP + 2
+
+def test_copy() -> None:
+  ids = IdSet([ 1, 2, 100, 'rd:1' ])
+  for ids_copy in (copy.deepcopy(ids),pickle.loads(pickle.dumps(ids))):
+    assert set(ids_copy) == set(ids) and len(ids_copy) == len(ids)
+    ids_copy.add(3)
+    ids_copy.add('rd:2')
+    assert 3 not in ids and 'rd:2' not in ids              # The copy does not share data with the original
@@ -0,0 +1,75 @@
+#
+# CLI startup regression tests
+#
+# Every netlab CLI command should import only the modules it needs. The tests
+# import the CLI dispatcher and the command module in a separate Python process
+# with '-X importtime', and check the list of imported modules against the
+# per-command list of allowed heavy modules.
+#
+# The import time budgets are checked only when NETLAB_IMPORT_BUDGET environment
+# variable is set -- the timing is meaningless on a loaded (or parallel) test run
+#
+import os
+import re
+import subprocess
+import sys
+import typing
+
+import pytest
+
+#
+# Modules that take a long time to import and should not be imported
+# by commands that don't need them
+#
+HEAVY_MODULES: typing.Final[list] = [
+  'rich', 'jinja2', 'netaddr', 'netsim.augment.main', 'netsim.augment.links',
+  'netsim.modules', 'netsim.providers', 'netsim.outputs', 'netsim.utils.templates' ]
+
+#
+# Import time budget (in milliseconds) and heavy modules that the command may import
+#
+IMPORT_BUDGET: typing.Final[dict] = {
+  'version':  (250, []),
+  'usage':    (250, []),
+  'daemon':   (250, []),
+  'status':   (400, [ 'netsim.providers', 'netsim.outputs' ]),
+  'connect':  (400, [ 'netsim.outputs' ]),
+  'exec':     (400, [ 'netsim.outputs' ]),
+  'inspect':  (400, [ 'netsim.outputs' ]),
+  'report':   (400, [ 'netsim.outputs' ]),
+  'graph':    (400, [ 'netsim.outputs' ]),
+  'capture':  (400, [ 'netsim.providers' ]),
+  'validate': (400, [ 'netsim.outputs', 'jinja2', 'netsim.utils.templates' ]),
+}
+
+IMPORT_LINE: typing.Final[re.Pattern] = re.compile(r'import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)')
+
+def import_profile(command: str) -> typing.Tuple[float,list]:
+  script = f'import netsim.cli, netsim.cli.{command}'
+  result = subprocess.run(
+    [ sys.executable, '-X', 'importtime', '-c', script ],
+    capture_output=True, text=True,
+    cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+  assert result.returncode == 0, result.stderr
+
+  total = 0
+  modules = []
+  for line in result.stderr.splitlines():
+    match = IMPORT_LINE.match(line)
+    if not match:
+      continue
+    modules.append(match.group(3))
+    if len(match.group(2)) == 1:                  # Top-level import, cumulative time includes nested imports
+      total += int(match.group(1))
+
+  return total / 1000,modules
+
+@pytest.mark.parametrize('command',IMPORT_BUDGET.keys())
+def test_import_budget(command: str) -> None:
+  budget,allowed = IMPORT_BUDGET[command]
+  import_time,modules = import_profile(command)
+
+  unexpected = [ m for m in HEAVY_MODULES if m in modules and m not in allowed ]
+  assert not unexpected, f'netlab {command} imports {",".join(unexpected)}'
+  if os.environ.get('NETLAB_IMPORT_BUDGET'):
+    assert import_time <= budget, f'netlab {command} import time {import_time:.1f}ms exceeds {budget}ms budget'
@@ -0,0 +1,49 @@
+#
+# Provider workload status collection (netlab status): providers are queried in
+# parallel, and their status is cached unless the provider opts out of caching
+#
+import threading
+
+import pytest
+
+from netsim import data, providers
+from netsim.utils import files as _files
+
+class FakeProvider(providers._Provider):
+  def __init__(self, provider: str, barrier: threading.Barrier, cacheable: bool = True) -> None:
+    super().__init__(provider,data.get_empty_box())
+    self.barrier = barrier
+    self.status_cacheable = cacheable
+    self.calls = 0
+
+  def get_lab_status(self) -> data.Box:
+    self.calls += 1
+    self.barrier.wait()                                     # Times out unless the providers are queried in parallel
+    return data.get_box({ f'{self.provider}_node': { 'status': 'running' }})
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path,monkeypatch):
+  monkeypatch.setattr(_files,'get_cachedir',lambda: tmp_path)
+  return tmp_path
+
+def lab_topology(ttl: int, workers: int, p_list: list) -> data.Box:
+  topology = data.get_box({ 'defaults.netlab.status': { 'cache_ttl': ttl, 'workers': workers }})
+  barrier = threading.Barrier(workers,timeout=5)
+  for pname in p_list:
+    topology._Providers[pname] = FakeProvider(pname,barrier,cacheable=pname != 'local')
+  return topology
+
+def test_parallel_status() -> None:
+  topology = lab_topology(ttl=0,workers=2,p_list=[ 'clab', 'libvirt' ])
+  status = providers.get_lab_status(topology,[ 'clab', 'libvirt' ])
+  assert status.clab.clab_node.status == 'running' and 'libvirt_node' in status.libvirt
+  assert not list(_files.get_cachedir().iterdir())          # Caching is disabled with zero TTL
+
+def test_cached_status(cache_dir) -> None:
+  topology = lab_topology(ttl=60,workers=1,p_list=[ 'clab', 'local' ])
+  first = providers.get_lab_status(topology,[ 'clab', 'local' ])
+  second = providers.get_lab_status(topology,[ 'clab', 'local' ])
+  assert first == second
+  assert topology._Providers.clab.calls == 1                # Second status comes from the cache
+  assert topology._Providers.local.calls == 2               # ... unless the provider opts out of caching
+  assert [ f.name for f in cache_dir.iterdir() ] == [ 'status-clab.json' ]
@@ -0,0 +1,27 @@
+#
+# Memory accounting (--debug memory): attribution of topology data to categories and
+# the YAML snapshot size breakdown
+#
+from netsim.api import transform as api
+from netsim.utils import log, memory
+
+def test_topology_sizes() -> None:
+  result = api.transform_topology({ 'defaults.device': 'frr', 'nodes': [ 'r1', 'r2' ], 'links': [ 'r1-r2' ] })
+  sizes = memory.topology_sizes(result['topology'])
+  assert sizes['neighbor lists'] and sizes['interfaces'] and sizes['nodes'] and sizes['defaults']
+
+  snapshot_sizes = memory.snapshot_breakdown(result['snapshot'])
+  assert snapshot_sizes['nodes'] > snapshot_sizes['nodes.*.interfaces'] > snapshot_sizes['nodes.*.interfaces.neighbors']
+  assert sum(v for k,v in snapshot_sizes.items() if not '.' in k) == len(result['snapshot'])
+
+def test_snapshot_breakdown() -> None:
+  text = "a:\n  b: |\n    x\n\n    y\n  c:\n  - d: 1\n    e: 2\nlinks:\n- interfaces: []\n  prefix: {}\n"
+  sizes = memory.snapshot_breakdown(text)
+  assert sizes['a'] == len('a:\n  b: |\n    x\n\n    y\n  c:\n  - d: 1\n    e: 2\n')   # Empty line belongs to 'a.b'
+  assert sizes['links.prefix'] == len('  prefix: {}\n')
+
+def test_memory_flag(monkeypatch) -> None:
+  monkeypatch.setattr(log,'DEBUG',[ 'all' ])
+  assert log.debug_active('memory') and not log.debug_flag_set('memory')  # Memory tracing is not included in 'all'
+  monkeypatch.setattr(log,'DEBUG',[ 'memory' ])
+  assert log.debug_flag_set('memory')
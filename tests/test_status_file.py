@@ -0,0 +1,73 @@
+#
+# Lab status file: SQLite status database, legacy YAML status files, and the
+# one-time import of the legacy status file into the default status database
+#
+import os
+
+import pytest
+
+from netsim import data
+from netsim.utils import status
+
+def lab_topology(status_file: str, lab_id: str = 'default') -> data.Box:
+  return data.get_box({ 'defaults': { 'lab_status_file': status_file, 'multilab.id': lab_id }})
+
+def set_lab_status(topology: data.Box, state: str, line: str) -> None:
+  def callback(s: data.Box, t: data.Box) -> None:
+    lab_id = status.get_lab_id(t)
+    s[lab_id].status = state
+    s[lab_id].log = list(s[lab_id].get('log',[])) + [ line ]
+
+  status.change_status(topology,callback)
+
+def test_status_db(tmp_path) -> None:
+  status_file = str(tmp_path / 'status.db')
+  lab_a = lab_topology(status_file)
+  lab_b = lab_topology(status_file,lab_id='2')
+  set_lab_status(lab_a,'created','create')
+  set_lab_status(lab_b,'started','start')
+  set_lab_status(lab_a,'started','start')
+  assert not status.is_yaml_status(status_file)
+
+  lab_status = status.read_status(lab_a)
+  assert lab_status.default.status == 'started' and lab_status.default.log == [ 'create', 'start' ]
+  assert lab_status['2'].log == [ 'start' ]
+  assert status.read_status(lab_a,include_log=False).default.log == []
+
+  status.remove_lab_status(lab_a)
+  assert list(status.read_status(lab_b).keys()) == [ '2' ]
+
+def test_yaml_status_content(tmp_path) -> None:
+  status_file = tmp_path / 'status.txt'                     # Existing YAML status file without .yml suffix
+  status_file.write_text('default:\n  status: created\n  log: [ create ]\n')
+  topology = lab_topology(str(status_file))
+  assert status.is_yaml_status(str(status_file))
+
+  set_lab_status(topology,'started','start')
+  assert status.read_status(topology).default.log == [ 'create', 'start' ]
+  assert 'status: started' in status_file.read_text()      # The file is still a YAML file
+
+@pytest.fixture
+def legacy_status(tmp_path,monkeypatch) -> str:
+  monkeypatch.setattr(status,'DEFAULT_STATUS_FILE',str(tmp_path / 'status.db'))
+  monkeypatch.setattr(status,'LEGACY_STATUS_FILE',str(tmp_path / 'status.yaml'))
+  (tmp_path / 'status.yaml').write_text('default:\n  status: started\n  log: [ create, start ]\n')
+  return str(tmp_path / 'status.yaml')
+
+def test_legacy_import(legacy_status) -> None:
+  topology = lab_topology(status.DEFAULT_STATUS_FILE)
+  assert status.read_status(topology).default.log == [ 'create', 'start' ]
+  assert not os.path.exists(legacy_status) and os.path.exists(f'{legacy_status}.migrated')
+
+  set_lab_status(topology,'stopped','down')
+  assert status.read_status(topology).default.log == [ 'create', 'start', 'down' ]
+
+def test_legacy_import_once(legacy_status) -> None:
+  first = status.status_db_connect(status.DEFAULT_STATUS_FILE)    # Concurrent processes both open a new database
+  second = status.status_db_connect(status.DEFAULT_STATUS_FILE)
+  status.import_legacy_status(second,f'{legacy_status}.migrated') # ... and try to import the legacy status
+  first.close()
+  second.close()
+
+  lab_status = status.read_status(lab_topology(status.DEFAULT_STATUS_FILE))
+  assert lab_status.default.log == [ 'create', 'start' ]          # Log lines are not duplicated
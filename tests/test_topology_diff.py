@@ -0,0 +1,73 @@
+#
+# Structural diff of transformed topologies (netlab.diff.yml): the diff between a
+# snapshot and the same transformed topology must be empty, and the changes must be
+# attributed to nodes, modules, interfaces and links
+#
+import argparse
+
+from netsim.api import transform as api
+from netsim.cli import create
+from netsim.providers import _Provider
+from netsim.utils import diff as _diff, read as _read, strings
+
+TOPOLOGY = {
+  'defaults.device': 'frr',
+  'module': [ 'ospf' ],
+  'nodes': [ 'r1', 'r2', 'r3' ],
+  'links': [ 'r1-r2', 'r2-r3' ] }
+
+def transform(topology: dict) -> tuple:
+  result = api.transform_topology(topology)
+  assert not result['errors']
+  return result['topology'],_read.load_yaml_box(result['snapshot'])
+
+def test_no_changes() -> None:
+  topology,snapshot = transform(TOPOLOGY)
+  assert _diff.topology_diff(snapshot,topology) == {}
+
+def test_module_changes() -> None:
+  _,snapshot = transform(TOPOLOGY)
+  topology,_ = transform(dict(TOPOLOGY,links=[ 'r1-r2', { 'r2': {}, 'r3': {}, 'ospf.cost': 20 }]))
+  diff = _diff.topology_diff(snapshot,topology)
+  assert list(diff.links.changed.values()) == [[ 'ospf' ]]
+  assert _diff.affected_nodes(diff) == [ 'r2', 'r3' ]
+  assert _diff.changed_modules(diff) == [ 'ospf' ]          # Redeploy just the OSPF configuration
+
+def test_node_changes() -> None:
+  _,snapshot = transform(TOPOLOGY)
+  topology,_ = transform(dict(TOPOLOGY,nodes=[ 'r1', 'r2', 'r3', 'r4' ],links=[ 'r1-r2', 'r2-r3', 'r4-r1' ]))
+  diff = _diff.topology_diff(snapshot,topology)
+  assert diff.nodes.added == { 'r4': 'libvirt' }
+  assert diff.nodes.changed.r1.interfaces.added == [ 'eth2' ]
+  assert diff.links.added == [ 'r1:eth2-r4:eth1' ]
+  assert _diff.changed_modules(diff) is None                # New nodes need the initial configuration
+
+  changes = _Provider.load('libvirt',topology.defaults.providers.libvirt).get_lab_changes(diff)
+  assert changes.start == [ 'r4' ] and changes.restart == [ 'r1' ] and not changes.stop
+
+def test_create_output_files(tmp_path,monkeypatch) -> None:
+  monkeypatch.chdir(tmp_path)
+  args = argparse.Namespace(output=[ 'provider', 'yaml=netlab.snapshot.yml', 'tools', 'ansible:dirs' ])
+
+  for _ in range(2):                                        # Output modules executed after the snapshot has
+    create.create_output_files(transform(TOPOLOGY)[0],args) # ... been written must not change the diff
+  assert _diff.read_diff() == {}
+
+  cost_change = dict(TOPOLOGY,links=[ 'r1-r2', { 'r2': {}, 'r3': {}, 'ospf.cost': 20 }])
+  create.create_output_files(transform(cost_change)[0],args)
+  assert _diff.changed_modules(_diff.read_diff()) == [ 'ospf' ]
+
+def test_watch_diff(tmp_path,monkeypatch) -> None:
+  monkeypatch.chdir(tmp_path)
+  topo_file = tmp_path / 'topology.yml'
+  topo_file.write_text(strings.get_yaml_string(TOPOLOGY))
+  create.run([ '-o', 'yaml=netlab.snapshot.yml', str(topo_file) ])
+
+  args = create.create_topology_parse([ '-o', 'yaml=netlab.snapshot.yml', str(topo_file) ],'create','',None)
+  base_snapshot = create.read_previous_snapshot(args)
+  for nodes in ([ 'r1', 'r2', 'r3', 'r4' ],[ 'r1', 'r2', 'r3', 'r4', 'r5' ]):  # Two saves of the topology file
+    topo_file.write_text(strings.get_yaml_string(dict(TOPOLOGY,nodes=nodes)))
+    assert create.recreate_topology(args,base_snapshot) is not None
+
+  diff = _diff.read_diff()                                  # The diff is relative to the snapshot that existed
+  assert list(diff.nodes.added) == [ 'r4', 'r5' ]           # ... when we started watching
@@ -20,7 +20,18 @@ from netsim import augment
 from netsim.outputs import _TopologyOutput,ansible
 from netsim.data import types as _types
 
+# Test cases are collected in a stable order (required by pytest-xdist) and executed
+# as individual tests that can be distributed across worker processes. Every test
+# case resets the module-level caches; the parsed system defaults are reused.
+#
+TRANSFORMATION_CASES = sorted(glob.glob('topology/input/*yml'))
+ERROR_CASES = sorted(glob.glob('errors/*yml'))
+
+def case_id(test_case):
+  return os.path.basename(test_case).replace('.yml','')
+
 def run_test(fname):
+  augment.main.reset_state()
   log.init_log_system(header = False)
   topology = _read.load(fname,relative_topo_name=True)
   log.exit_on_error()
@@ -28,41 +39,43 @@ def run_test(fname):
   log.exit_on_error()
   return topology
 
+def check_transformation_case(test_case,tmpdir):
+  print("Test case: %s" % test_case)
+  topology = run_test(test_case)
+
+  if topology.defaults.get("inventory"):
+    print("Writing inventory... %s" % topology.defaults.inventory)
+    ansible.ansible_inventory(topology,tmpdir+"/extra/hosts.yml",topology.defaults.get("inventory").replace("dump",""))
+    ansible.ansible_config(tmpdir+"/ansible.cfg",tmpdir+"/hosts.yml")
+    if topology.defaults.inventory == "dump":
+      ansible.dump(topology)
+
+  if topology.defaults.get("Output"):
+    for output_format in topology.defaults.get("Output"):
+      output_module = _TopologyOutput.load(output_format,topology.defaults.outputs[output_format])
+      if output_module:
+        output_module.write(Box(topology))
+      else:
+        log.error('Unknown output format %s' % output_format,log.IncorrectValue,'create')
+
+  result = utils.transformation_results_yaml(topology)
+  exp_test_case = "topology/expected/"+os.path.basename(test_case)
+  expected = pathlib.Path(exp_test_case).read_text()
+  if result != expected:
+    print("Test case: %s FAILED" % test_case)
+    sys.stdout.writelines(
+      difflib.unified_diff(
+        expected.splitlines(keepends=True),
+        result.splitlines(keepends=True),
+        fromfile='expected',tofile='result'))
+
+  assert result == expected
+  print("... succeeded, string length = %d" % len(result))
+
 @pytest.mark.filterwarnings("ignore::PendingDeprecationWarning")
-def test_transformation_cases(tmpdir):
-  print("Starting transformation test cases")
-  for test_case in list(glob.glob('topology/input/*yml')):
-    print("Test case: %s" % test_case)
-    topology = run_test(test_case)
-
-    if topology.defaults.get("inventory"):
-      print("Writing inventory... %s" % topology.defaults.inventory)
-      ansible.ansible_inventory(topology,tmpdir+"/extra/hosts.yml",topology.defaults.get("inventory").replace("dump",""))
-      ansible.ansible_config(tmpdir+"/ansible.cfg",tmpdir+"/hosts.yml")
-      if topology.defaults.inventory == "dump":
-        ansible.dump(topology)
-
-    if topology.defaults.get("Output"):
-      for output_format in topology.defaults.get("Output"):
-        output_module = _TopologyOutput.load(output_format,topology.defaults.outputs[output_format])
-        if output_module:
-          output_module.write(Box(topology))
-        else:
-          log.error('Unknown output format %s' % output_format,log.IncorrectValue,'create')
-
-    result = utils.transformation_results_yaml(topology)
-    exp_test_case = "topology/expected/"+os.path.basename(test_case)
-    expected = pathlib.Path(exp_test_case).read_text()
-    if result != expected:
-      print("Test case: %s FAILED" % test_case)
-      sys.stdout.writelines(
-        difflib.unified_diff(
-          expected.splitlines(keepends=True),
-          result.splitlines(keepends=True),
-          fromfile='expected',tofile='result'))
-
-    assert result == expected
-    print("... succeeded, string length = %d" % len(result))
+@pytest.mark.parametrize("test_case",TRANSFORMATION_CASES,ids=case_id)
+def test_transformation_cases(test_case,tmpdir):
+  check_transformation_case(test_case,tmpdir)
 
 # Verbose test cases are executed only when we're doing a coverage report
 #
@@ -70,31 +83,42 @@ def test_verbose_cases(tmpdir):
   if not sys.gettrace():
     return
   log.set_verbose()
-  test_transformation_cases(tmpdir)
+  try:
+    for test_case in TRANSFORMATION_CASES:
+      check_transformation_case(test_case,tmpdir)
+  finally:
+    log.set_verbose(0)
 
-@pytest.mark.filterwarnings("ignore::PendingDeprecationWarning")
-def test_error_cases():
-  print("Starting error test cases")
+# Error test cases have to raise an exception on the first fatal error. The flag is
+# reset after every test case as the same worker might run transformation test cases
+#
+@pytest.fixture
+def raise_on_error():
   log.set_flag(raise_error = True)
-  for test_case in list(glob.glob('errors/*yml')):
-    print("Test case: %s" % test_case)
-    log.err_count = 0
-    with pytest.raises(log.ErrorAbort):
-      topo = run_test(test_case)
-
-    error_log = log.get_error_log()
-    log_file = pathlib.Path(test_case.replace('.yml','.log'))
-    if log_file.exists():
-      with log_file.open() as f:
-        log_lines = [line.rstrip('\n') for line in f]
-
-      if error_log != log_lines:
-        error_log_text = "\n".join(error_log)
-        expected_text  = "\n".join(log_lines)
-        print(f'Accumulated error log\n{"=" * 70}\n{error_log_text}\n\nExpected log\n{"=" * 70}\n{expected_text}')
-      assert error_log == log_lines
+  yield
+  log.set_flag(raise_error = False)
+
+@pytest.mark.filterwarnings("ignore::PendingDeprecationWarning")
+@pytest.mark.parametrize("test_case",ERROR_CASES,ids=case_id)
+def test_error_cases(test_case,raise_on_error):
+  print("Test case: %s" % test_case)
+  with pytest.raises(log.ErrorAbort):
+    topo = run_test(test_case)
+
+  error_log = log.get_error_log()
+  log_file = pathlib.Path(test_case.replace('.yml','.log'))
+  if log_file.exists():
+    with log_file.open() as f:
+      log_lines = [line.rstrip('\n') for line in f]
+
+    if error_log != log_lines:
+      error_log_text = "\n".join(error_log)
+      expected_text  = "\n".join(log_lines)
+      print(f'Accumulated error log\n{"=" * 70}\n{error_log_text}\n\nExpected log\n{"=" * 70}\n{expected_text}')
+    assert error_log == log_lines
 
 if __name__ == "__main__":
-  test_transformation_cases("/tmp")
+  for test_case in TRANSFORMATION_CASES:
+    check_transformation_case(test_case,"/tmp")
 #  test_error_cases()
 #  test_minimal_cases()